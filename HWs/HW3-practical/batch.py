@@ -0,0 +1,128 @@
+# Standard imports
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+# Third-party imports
+from src.utils import ResourceManagementAlgorithm
+from src.loader import loadTaskSet
+from src.metrics import MetricsCollector, writeCsv, writeJson
+from src.overhead import Overheads
+from src.scheduler import Scheduler
+
+
+ALGORITHMS = [
+    ResourceManagementAlgorithm.NPP,
+    ResourceManagementAlgorithm.HLP,
+    ResourceManagementAlgorithm.PIP,
+    ResourceManagementAlgorithm.PCP,
+    ResourceManagementAlgorithm.SRP,
+]
+COLUMNS = ["taskset", "algorithm", "met", "missed", "busy", "idle", "overhead"]
+METRIC_COLUMNS = ["missRatio", "response_p50", "response_p99", "response_max", "lateness_max"]
+
+
+def simulate(config: tuple) -> dict:
+    """
+        Runs a single configuration and returns its summary row
+
+        Parameters:
+            config (tuple): (task set JSON path, resource management algorithm, end time or None for the one of the task set,
+                             overheads or None, whether to collect job metrics)
+        Returns:
+            (dict) Row of the results table, with the metric columns and the per-task metric summary ('metrics') if collected
+    """
+    file_path, algorithm, endTime, overheads, measured = config
+    metrics = MetricsCollector() if measured else None
+    scheduler = Scheduler(taskSet=loadTaskSet(file_path), algorithm=algorithm, quiet=True, overheads=overheads, metrics=metrics)
+    if endTime is None:
+        scheduler.run()
+        met, missed, busy, idle, overhead = scheduler.statistics()
+    else:
+        # Long horizons are extrapolated once the schedule repeats
+        result = scheduler.run_steady_state(endTime)
+        met, missed, busy, idle, overhead = result["met"], result["missed"], result["busy"], result["idle"], result["overhead"]
+
+    row = {
+        "taskset": file_path,
+        "algorithm": algorithm,
+        "met": met,
+        "missed": missed,
+        "busy": busy,
+        "idle": idle,
+        "overhead": overhead,
+    }
+    if metrics is not None:
+        response, lateness = metrics.overall("response"), metrics.overall("lateness")
+        row.update({
+            "missRatio": round(metrics.missRatio(), 4),
+            "response_p50": response.percentile(50),
+            "response_p99": response.percentile(99),
+            "response_max": response.maximum,
+            "lateness_max": lateness.maximum,
+            "metrics": metrics.summary(),
+        })
+    return row
+
+
+def run_batch(file_paths: list, algorithms: list, workers: int = None, endTime: int = None, overheads: Overheads = None, measured: bool = False) -> list:
+    """
+        Runs every (task set, algorithm) combination on a process pool
+
+        Parameters:
+            file_paths (list): Task set JSON paths
+            algorithms (list): Resource management algorithms
+            workers (int): Number of processes, all cores if None
+            endTime (int): End time of every run, the one of each task set if None
+            overheads (Overheads): Scheduler overheads charged in every run, none if None
+            measured (bool): If True, job metrics are collected in every run, only over the end time of the task sets
+        Returns:
+            (list) Result rows, in the order of the combinations
+    """
+    # Extrapolated runs only simulate part of the horizon, so their metrics would not match the deadline counts
+    if measured and endTime is not None:
+        raise ValueError("job metrics cannot be collected over an extrapolated end time")
+    configs = [(file_path, algorithm, endTime, overheads, measured) for file_path, algorithm in product(file_paths, algorithms)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(simulate, configs, chunksize=max(1, len(configs) // 64)))
+
+
+def print_table(rows: list, columns: list = COLUMNS) -> None:
+    """ Prints the given columns of the results as a table """
+    widths = [max([len(column)] + [len(str(row[column])) for row in rows]) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def write_metrics(path: str, rows: list) -> None:
+    """ Writes the per-task metrics of every run, as JSON or as CSV (one line per run, task and metric) if the path ends with '.csv' """
+    if path.endswith(".csv"):
+        writeCsv(path, [
+            {"taskset": row["taskset"], "algorithm": row["algorithm"], "task": taskId, "metric": metric, "missRatio": summary["missRatio"], **summary[metric]}
+            for row in rows for taskId, summary in row["metrics"].items() for metric in MetricsCollector.METRICS
+        ])
+    else:
+        writeJson(path, [{"taskset": row["taskset"], "algorithm": row["algorithm"], "tasks": row["metrics"]} for row in rows])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Runs task sets against resource management algorithms in parallel")
+    parser.add_argument("tasksets", nargs="+", help="task set JSON files")
+    parser.add_argument("-a", "--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes (all cores by default)")
+    parser.add_argument("-e", "--end-time", type=int, default=None, help="end time of every run, extrapolated past the first repeat of the schedule (task set end times by default)")
+    parser.add_argument("-m", "--metrics", nargs="?", const="", default=None, metavar="PATH", help="collect job metrics, print their summary columns and write them to PATH (JSON, or CSV if it ends with '.csv')")
+    parser.add_argument("-o", "--overheads", type=int, nargs=3, default=None, metavar=("DISPATCH", "PREEMPTION", "SEMAPHORE"), help="overheads charged to the timeline, in ticks")
+    args = parser.parse_args()
+    if args.metrics is not None and args.end_time is not None:
+        parser.error("--metrics does not work with --end-time, the metrics would only cover the simulated part of the horizon")
+
+    overheads = Overheads(*args.overheads) if args.overheads is not None else None
+    rows = run_batch(args.tasksets, args.algorithms, args.workers, args.end_time, overheads, args.metrics is not None)
+    if args.metrics is not None:
+        print_table(rows, COLUMNS + METRIC_COLUMNS)
+        if args.metrics:
+            write_metrics(args.metrics, rows)
+    else:
+        print_table(rows)
@@ -0,0 +1,188 @@
+# Standard imports
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from itertools import product
+
+# Third-party imports
+from src.generator import generateTaskSet
+from src.utils import ResourceManagementAlgorithm
+from src.scheduler import Scheduler
+from src.taskset import TaskSet
+
+
+ALGORITHMS = [
+    ResourceManagementAlgorithm.NPP,
+    ResourceManagementAlgorithm.HLP,
+    ResourceManagementAlgorithm.PIP,
+    ResourceManagementAlgorithm.PCP,
+    ResourceManagementAlgorithm.SRP,
+]
+KEYS = ["algorithm", "tasks", "utilization", "ticks"]    # Identify a suite case across result files
+
+
+def random_taskset(tasks: int, endTime: int, seed: int = 0) -> dict:
+    """
+        Builds a random task set dictionary (same layout as the JSON files)
+
+        Parameters:
+            tasks (int): Number of tasks
+            endTime (int): End time of the schedule
+            seed (int): Random seed
+        Returns:
+            (dict) Task set dictionary
+    """
+    rng = random.Random(seed)
+    taskset = []
+    for taskId in range(1, tasks + 1):
+        period = rng.randint(10 * tasks, 100 * tasks)
+        wcet = rng.randint(1, max(1, period // (2 * tasks)))
+        taskset.append({
+            "taskId": taskId,
+            "period": period,
+            "wcet": wcet,
+            "deadline": rng.randint(wcet, period),
+            "offset": rng.randint(0, period),
+            "sections": [[rng.randint(0, 3), wcet]],
+        })
+    return {"startTime": 0, "endTime": endTime, "taskset": taskset}
+
+
+def memory_per_job(jobs: int) -> float:
+    """ Returns the memory in bytes taken by a released job """
+    taskSet = TaskSet(random_taskset(1, jobs))
+    task = next(iter(taskSet))
+    task.period = 1
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    released = list(task.releaseJobs(0, jobs))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(released)
+
+
+def ticks_per_second(tasks: int, ticks: int, algorithm: ResourceManagementAlgorithm) -> float:
+    """ Returns the number of scheduler ticks per second """
+    scheduler = Scheduler(TaskSet(random_taskset(tasks, ticks)), algorithm, quiet=True)
+    start = time.perf_counter()
+    scheduler.run()
+    return (scheduler.time - scheduler.taskSet.startTime) / (time.perf_counter() - start)
+
+
+def runCase(algorithm: ResourceManagementAlgorithm, tasks: int, utilization: float, ticks: int, repeat: int = 3, seed: int = 0) -> dict:
+    """
+        Runs a single suite case on a generated task set
+
+        Parameters:
+            algorithm (ResourceManagementAlgorithm): Resource management algorithm
+            tasks (int): Number of tasks
+            utilization (float): Total utilization
+            ticks (int): End time of the schedule
+            repeat (int): Number of timed runs, the best one counts
+            seed (int): Seed of the task set
+        Returns:
+            (dict) Result row: ticks and events (history segments and completions) per second, peak memory of a separate traced run
+    """
+    data = generateTaskSet(tasks, utilization, seed=seed, endTime=ticks)
+
+    best = float("inf")
+    for _ in range(repeat):
+        scheduler = Scheduler(TaskSet(data), algorithm, quiet=True)
+        start = time.perf_counter()
+        scheduler.run()
+        best = min(best, time.perf_counter() - start)
+    events = len(scheduler.history.starts) + scheduler.deadlines_met + scheduler.deadlines_missed
+
+    # Tracing slows everything down, so memory is measured on a run of its own
+    tracemalloc.start()
+    Scheduler(TaskSet(data), algorithm, quiet=True).run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "tasks": tasks,
+        "utilization": utilization,
+        "ticks": ticks,
+        "seconds": best,
+        "ticks_per_second": ticks / best,
+        "events_per_second": events / best,
+        "peak_memory": peak,
+    }
+
+
+def runSuite(algorithms: list, counts: list, utilizations: list, horizons: list, repeat: int = 3) -> dict:
+    """
+        Runs every combination of the suite parameters
+
+        Returns:
+            (dict) Result rows along with the version and platform they were measured on
+    """
+    results = []
+    for algorithm, tasks, utilization, ticks in product(algorithms, counts, utilizations, horizons):
+        results.append(runCase(algorithm, tasks, utilization, ticks, repeat))
+        print(" ".join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}" for key, value in results[-1].items()), flush=True)
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    return {
+        "project": "HW3",
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """ Returns the cases whose throughput dropped (or peak memory grew) by more than 'tolerance' from the baseline """
+    previous = {tuple(row[key] for key in KEYS): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(tuple(row[key] for key in KEYS))
+        if old is None:
+            continue
+        throughput = row["ticks_per_second"] / old["ticks_per_second"]
+        memory = row["peak_memory"] / max(old["peak_memory"], 1)
+        if throughput < 1 - tolerance or memory > 1 + tolerance:
+            regressions.append({**{key: row[key] for key in KEYS}, "throughput": throughput, "memory": memory})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures memory per job and scheduler dispatch throughput, or runs the benchmark suite")
+    parser.add_argument("-j", "--jobs", type=int, default=100000)
+    parser.add_argument("-t", "--tasks", type=int, default=100)
+    parser.add_argument("-n", "--ticks", type=int, default=100000)
+    parser.add_argument("--suite", default=None, metavar="RESULTS", help="run the suite and write its results to this JSON file")
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000], help="task counts of the suite")
+    parser.add_argument("--utilizations", type=float, nargs="+", default=[0.5, 0.9], help="total utilizations of the suite")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[10000, 100000], help="end times of the suite")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per suite case, the best one counts")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="report regressions of the suite against an earlier results file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative change tolerated before a case counts as a regression")
+    args = parser.parse_args()
+
+    if args.suite is not None:
+        report = runSuite(args.algorithms, args.counts, args.utilizations, args.horizons, args.repeat)
+        with open(args.suite, "w") as file:
+            json.dump(report, file, indent=4)
+
+        if args.compare is not None:
+            with open(args.compare) as file:
+                regressions = compare(json.load(file), report, args.tolerance)
+            for regression in regressions:
+                print("REGRESSION " + " ".join(f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}" for key, value in regression.items()))
+            sys.exit(1 if regressions else 0)
+        sys.exit(0)
+
+    print(f"memory per job: {memory_per_job(args.jobs):.1f} bytes")
+    for algorithm in ALGORITHMS:
+        print(f"{algorithm} ticks per second: {ticks_per_second(args.tasks, args.ticks, algorithm):.0f}")
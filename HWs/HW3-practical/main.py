@@ -1,11 +1,12 @@
 # Standard imports
-import json
 import sys
 
 # Third-party imports
 from src.utils import ResourceManagementAlgorithm
+from src.loader import loadTaskSet
+from src.metrics import MetricsCollector
 from src.scheduler import Scheduler
-from src.taskset import TaskSet
+from src.trace import TraceWriter
 
 
 if __name__ == "__main__":
@@ -15,11 +16,15 @@ if __name__ == "__main__":
     else:
         file_path = "taskset_3.json"
 
-    with open(file_path) as json_data:
-        data = json.load(json_data)
+    # Optional binary trace of the scheduling events (read it back with 'src.trace.TraceReader')
+    trace = TraceWriter(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2] != "-" else None
+
+    # Optional export of the job metrics, JSON or CSV depending on the extension (the summary is always printed)
+    metrics_path = sys.argv[3] if len(sys.argv) > 3 else None
+    metrics = MetricsCollector()
 
     # Initialize taskset
-    taskSet = TaskSet(data)
+    taskSet = loadTaskSet(file_path)
     taskSet.printTasks()
     taskSet.printJobs()
     
@@ -28,10 +33,20 @@ if __name__ == "__main__":
     scheduler = Scheduler(
         taskSet=taskSet,
         algorithm=ResourceManagementAlgorithm.HLP,
-        verbose=False
+        verbose=False,
+        trace=trace,
+        metrics=metrics
     )
     scheduler.run()
+    if trace is not None:
+        trace.close()
 
     # Timeline
     print("\nTimeline:")
     scheduler.build_timeline()
+
+    # Metrics
+    print("\nMetrics:")
+    metrics.printSummary()
+    if metrics_path is not None:
+        metrics.write(metrics_path)
@@ -0,0 +1,267 @@
+# Standard imports
+import sys
+from argparse import ArgumentParser
+from itertools import groupby, product
+from math import ceil, inf
+
+# Third-party imports
+from src.task import Task
+from src.taskset import TaskSet
+from src.utils import ResourceManagementAlgorithm, TaskSetJsonKeys
+
+
+class ResponseTimeAnalysis(object):
+
+    def __init__(self, taskSet: TaskSet, algorithm: ResourceManagementAlgorithm) -> 'ResponseTimeAnalysis':
+        """
+            Constructor, analyses the whole task set once. Priorities are Deadline Monotonic, the same as the scheduler's initial priorities.
+
+            Parameters:
+                taskSet (TaskSet): Task set instance
+                algorithm (ResourceManagementAlgorithm): Resource management algorithm that bounds the blocking times
+        """
+        self.taskSet = taskSet
+        self.algorithm = algorithm
+
+        self.order = []             # Tasks from the highest to the lowest priority
+        self.ceilings = {}          # Semaphore ID -> priority ceiling (smallest relative deadline of its users)
+        self.blocking = {}          # Task ID -> worst-case blocking time
+        self.responseTimes = {}     # Task ID -> worst-case response time (inf if it exceeds the deadline)
+
+        self.analyse()
+
+
+    def analyse(self) -> None:
+        """ Analyses every task from scratch """
+        self.order = sorted(self.taskSet, key=lambda task: task.relativeDeadline)
+        self.ceilings = self.buildCeilings()
+        self.blocking = self.computeBlocking()
+
+        for task in self.order:
+            self.responseTimes[task.id] = self.computeResponseTime(task)
+
+
+    def updateTask(self, taskId: int, wcet: float = None, period: float = None, sections: list = None) -> list:
+        """
+            Edits a task and only redoes the fixed points that the edit can affect
+
+            Parameters:
+                taskId (int): ID of the task to edit
+                wcet (float): New WCET, sum of the new sections if None and sections are given
+                period (float): New period
+                sections (list): New [semaphore ID, duration] sections
+            Returns:
+                (list) IDs of the tasks whose response times were recomputed
+        """
+        task = self.taskSet.getTaskById(taskId)
+        oldWcet, oldPeriod, oldSections = task.wcet, task.period, task.sections
+
+        if sections is not None:
+            task.sections = sections
+            if wcet is None:
+                wcet = float(sum(section[1] for section in sections))
+        if wcet is not None:
+            task.wcet = wcet
+        if period is not None:
+            task.period = period
+
+        # Blocking terms are cheap to rebuild, the fixed points are what is worth saving
+        oldBlocking = self.blocking
+        self.ceilings = self.buildCeilings()
+        self.blocking = self.computeBlocking()
+
+        # Longer sections or more interference can only grow the response times, so the old ones are safe starting points
+        grew = task.wcet >= oldWcet and task.period <= oldPeriod and self.sectionsGrew(oldSections, task.sections)
+        grew = grew and all(self.blocking[other.id] >= oldBlocking[other.id] for other in self.order)
+
+        recomputed = []
+        timingChanged = task.wcet != oldWcet or task.period != oldPeriod
+        for other in self.order:
+            old = self.responseTimes[other.id]
+            interfered = other is not task and task.relativeDeadline <= other.relativeDeadline
+
+            # Skip tasks whose response time equation did not change at all
+            changed = self.blocking[other.id] != oldBlocking[other.id]
+            changed = changed or (other is task and task.wcet != oldWcet) or (interfered and timingChanged)
+            if not changed:
+                continue
+
+            if grew:
+                # Missed deadlines stay missed when everything grew
+                if old == inf:
+                    continue
+
+                # The old response time is still the least fixed point if the edit adds no demand within its window
+                extra = self.blocking[other.id] - oldBlocking[other.id]
+                if other is task:
+                    extra += task.wcet - oldWcet
+                elif interfered:
+                    extra += ceil(old / task.period) * task.wcet - ceil(old / oldPeriod) * oldWcet
+                if extra == 0:
+                    continue
+
+            self.responseTimes[other.id] = self.computeResponseTime(other, old if grew else None)
+            recomputed.append(other.id)
+        return recomputed
+
+
+    def buildCeilings(self) -> dict:
+        """ Returns the priority ceiling of every semaphore """
+        ceilings = {}
+        for task in self.taskSet:
+            for semaphoreId, _ in self.criticalSections(task):
+                ceilings[semaphoreId] = min(ceilings.get(semaphoreId, inf), task.relativeDeadline)
+        return ceilings
+
+
+    def criticalSections(self, task: Task) -> list:
+        """ Returns the (semaphore ID, duration) pairs of the critical sections of a task (semaphore 0 is not critical) """
+        return [(section[0], section[1]) for section in task.sections if section[0] != 0]
+
+
+    def computeBlocking(self) -> dict:
+        """
+            Computes the worst-case blocking time of every task by lower priority tasks in a single pass from the lowest priority up
+
+            Returns:
+                (dict) Task ID -> blocking time
+        """
+        blocking = {}
+        longest = {}    # Semaphore ID -> longest critical section of the tasks seen so far (lower priority ones)
+        lower = []      # Critical sections of the tasks seen so far
+
+        # Tasks of equal deadline have the same priority, so a whole group is blocked before its own sections are counted
+        for _, group in groupby(reversed(self.order), key=lambda task: task.relativeDeadline):
+            group = list(group)
+            for task in group:
+                blocking[task.id] = self.blockingTime(task, longest, lower)
+
+            for task in group:
+                sections = self.criticalSections(task)
+                for semaphoreId, duration in sections:
+                    longest[semaphoreId] = max(longest.get(semaphoreId, 0), duration)
+                if sections:
+                    lower.append(sections)
+
+        return blocking
+
+
+    def blockingTime(self, task: Task, longest: dict, lower: list) -> float:
+        """
+            Returns the worst-case blocking time of a task
+
+            Parameters:
+                task (Task): Task instance
+                longest (dict): Semaphore ID -> longest critical section of the lower priority tasks
+                lower (list): Critical sections of every lower priority task
+            Returns:
+                (float) Blocking time
+        """
+        # Non-preemptive sections block every higher priority task
+        if self.algorithm == ResourceManagementAlgorithm.NPP:
+            return max(longest.values(), default=0)
+
+        # PIP blocks at most once per lower priority task and once per semaphore
+        if self.algorithm == ResourceManagementAlgorithm.PIP:
+            byTasks = sum(
+                max((duration for semaphoreId, duration in sections if self.ceilings[semaphoreId] <= task.relativeDeadline), default=0)
+                for sections in lower
+            )
+            bySemaphores = sum(duration for semaphoreId, duration in longest.items() if self.ceilings[semaphoreId] <= task.relativeDeadline)
+            return min(byTasks, bySemaphores)
+
+        # HLP, PCP and SRP block at most once, for one section of a semaphore with a ceiling at least as high as the task
+        return max((duration for semaphoreId, duration in longest.items() if self.ceilings[semaphoreId] <= task.relativeDeadline), default=0)
+
+
+    def computeResponseTime(self, task: Task, start: float = None) -> float:
+        """
+            Returns the worst-case response time of a task through fixed-point iteration
+
+            Parameters:
+                task (Task): Task instance
+                start (float): Value to start iterating from, must not exceed the response time (WCET plus blocking if None)
+            Returns:
+                (float) Response time, inf if it exceeds the relative deadline
+        """
+        # Jobs of other tasks with an equal deadline may be picked first, so they interfere as well
+        higher = [other for other in self.order if other is not task and other.relativeDeadline <= task.relativeDeadline]
+        base = task.wcet + self.blocking[task.id]
+
+        response = base if start is None else start
+        while True:
+            updated = base + sum(ceil(response / other.period) * other.wcet for other in higher)
+            if updated > task.relativeDeadline:
+                return inf
+            if updated == response:
+                return response
+            response = updated
+
+
+    def sectionsGrew(self, old: list, new: list) -> bool:
+        """ Returns True if the new sections use the same semaphores in the same order and none of them got shorter """
+        return len(old) == len(new) and all(o[0] == n[0] and o[1] <= n[1] for o, n in zip(old, new))
+
+
+    def isSchedulable(self) -> bool:
+        """ Returns True if every task meets its deadline """
+        return all(response != inf for response in self.responseTimes.values())
+
+
+    def printAnalysis(self) -> None:
+        """ Prints blocking and response times of all the tasks """
+        print("\nResponse Time Analysis:")
+        for task in self.order:
+            print(f"task {task.id}: B = {self.blocking[task.id]}, R = {self.responseTimes[task.id]}, D = {task.relativeDeadline}")
+
+
+def simulatedViolations(data: dict, algorithm: ResourceManagementAlgorithm, horizon: int = 3000) -> list:
+    """
+        Simulates a task set from its critical instant and compares the longest response time of every task with the analysis
+
+        Parameters:
+            data (dict): Task set dictionary, the offsets are ignored
+            algorithm (ResourceManagementAlgorithm): Resource management algorithm
+            horizon (int): Longest schedule simulated, two hyperperiods if shorter
+        Returns:
+            (list) (task ID, analysed, simulated) for every task whose simulated response time exceeds a finite analysed one
+    """
+    from src.metrics import MetricsCollector
+    from src.scheduler import Scheduler
+
+    # All tasks released together give the worst case the analysis bounds
+    data = {**data, TaskSetJsonKeys.KEY_TASKSET: [{**task, TaskSetJsonKeys.KEY_TASK_OFFSET: 0} for task in data[TaskSetJsonKeys.KEY_TASKSET]]}
+    analysis = ResponseTimeAnalysis(TaskSet(data), algorithm)
+    data[TaskSetJsonKeys.KEY_SCHEDULE_END] = min(2 * analysis.taskSet.hyperperiod(), horizon)
+
+    metrics = MetricsCollector()
+    Scheduler(TaskSet(data), algorithm, quiet=True, metrics=metrics).run()
+    return [
+        (taskId, analysis.responseTimes[taskId], summary["response"]["max"])
+        for taskId, summary in metrics.summary().items()
+        if summary["response"]["max"] > analysis.responseTimes[taskId]
+    ]
+
+
+if __name__ == "__main__":
+    from src.generator import generateTaskSet
+
+    parser = ArgumentParser(description="Checks the response time analysis against the simulated response times of random task sets (run as 'python -m src.analysis')")
+    parser.add_argument("-s", "--sets", type=int, default=50, help="number of task sets per algorithm")
+    parser.add_argument("-n", "--tasks", type=int, default=6, help="number of tasks per set")
+    parser.add_argument("-u", "--utilization", type=float, default=0.8, help="total utilization of every set")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Short uniform periods and deadlines of many tasks coinciding make the ties between equal priorities likely
+    violations = 0
+    algorithms = [ResourceManagementAlgorithm.NPP, ResourceManagementAlgorithm.HLP, ResourceManagementAlgorithm.PIP, ResourceManagementAlgorithm.PCP, ResourceManagementAlgorithm.SRP]
+    for algorithm, index in product(algorithms, range(args.sets)):
+        seed = f"{args.seed}-{index}"
+        data = generateTaskSet(args.tasks, args.utilization, seed=seed, periodRange=(10, 40), distribution="uniform", deadlineRange=(0.4, 1.0), criticalRatio=0.5)
+        for taskId, analysed, simulated in simulatedViolations(data, algorithm):
+            print(f"VIOLATION {algorithm} seed {seed}: task {taskId} simulated response {simulated} > analysed {analysed}")
+            violations += 1
+
+    print(f"{violations} violations in {args.sets} task sets per algorithm")
+    sys.exit(1 if violations else 0)
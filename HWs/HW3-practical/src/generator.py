@@ -0,0 +1,233 @@
+# Standard imports
+import json
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from math import exp, log
+
+# Third-party imports
+from src.utils import TaskSetJsonKeys
+
+
+MAX_DISCARDS = 1000     # Attempts of UUniFast-discard per task set
+
+
+def uunifast(count: int, utilization: float, rng: random.Random) -> list:
+    """
+        Draws task utilizations uniformly among those adding up to the given total (UUniFast, discarding draws with a task over 1)
+
+        Parameters:
+            count (int): Number of tasks
+            utilization (float): Total utilization
+            rng (random.Random): Random number generator
+        Returns:
+            (list) Utilization of every task
+    """
+    for _ in range(MAX_DISCARDS):
+        utilizations = []
+        remaining = utilization
+        for left in range(count - 1, 0, -1):
+            following = remaining * rng.random() ** (1 / left)
+            utilizations.append(remaining - following)
+            remaining = following
+        utilizations.append(remaining)
+
+        if max(utilizations) <= 1:
+            return utilizations
+    raise ValueError(f"UUniFast-discard found no {count} tasks of total utilization {utilization} with every task at most 1, use randfixedsum")
+
+
+def randfixedsum(count: int, utilization: float, rng: random.Random) -> list:
+    """
+        Draws task utilizations in [0, 1] uniformly among those adding up to the given total (Stafford's Randfixedsum)
+
+        Parameters:
+            count (int): Number of tasks
+            utilization (float): Total utilization, at most the number of tasks
+            rng (random.Random): Random number generator
+        Returns:
+            (list) Utilization of every task
+    """
+    if not 0 <= utilization <= count:
+        raise ValueError(f"no {count} tasks of utilization at most 1 can add up to {utilization}")
+    if count == 1:
+        return [float(utilization)]
+
+    # Probabilities of moving between the simplices that tile the hypercube
+    k = min(int(utilization), count - 1)
+    s1 = [utilization - (k - i) for i in range(count)]
+    s2 = [(k + count - i) - utilization for i in range(count)]
+    w = [[0.0] * (count + 1) for _ in range(count)]
+    w[0][1] = sys.float_info.max
+    t = [[0.0] * count for _ in range(count - 1)]
+    for i in range(2, count + 1):
+        for column in range(i):
+            tmp1 = w[i - 2][column + 1] * s1[column] / i
+            tmp2 = w[i - 2][column] * s2[count - i + column] / i
+            w[i - 1][column + 1] = tmp1 + tmp2
+            tmp3 = w[i - 1][column + 1] + sys.float_info.min
+            t[i - 2][column] = tmp2 / tmp3 if s2[count - i + column] > s1[column] else 1 - tmp1 / tmp3
+
+    # Walk down the dimensions
+    utilizations = [0.0] * count
+    s, j, sm, pr = float(utilization), k + 1, 0.0, 1.0
+    for i in range(count - 1, 0, -1):
+        e = rng.random() <= t[i - 1][j - 1]
+        sx = rng.random() ** (1 / i)
+        sm += (1 - sx) * pr * s / (i + 1)
+        pr *= sx
+        utilizations[count - i - 1] = sm + pr * e
+        s -= e
+        j -= e
+    utilizations[count - 1] = sm + pr * s
+
+    # The dimensions were filled in a fixed order
+    rng.shuffle(utilizations)
+    return utilizations
+
+
+def buildSections(wcet: int, resources: int, criticalRatio: float, maxSections: int, rng: random.Random) -> list:
+    """
+        Lays out the execution of a job as non-critical (semaphore 0) and critical sections
+
+        Parameters:
+            wcet (int): WCET of the task, the sum of the section durations
+            resources (int): Number of semaphores (IDs 1 to 'resources'), no critical sections if 0
+            criticalRatio (float): Fraction of the WCET spent in critical sections
+            maxSections (int): Largest number of critical sections of a job
+            rng (random.Random): Random number generator
+        Returns:
+            (list) [semaphore ID, duration] sections
+    """
+    critical = min(wcet, round(wcet * criticalRatio)) if resources > 0 else 0
+    if critical == 0:
+        return [[0, wcet]]
+
+    # Critical time split into 1 to 'maxSections' positive parts, the rest into the gaps around them (possibly empty)
+    count = rng.randint(1, min(maxSections, critical))
+    cuts = sorted(rng.sample(range(1, critical), count - 1))
+    durations = [end - start for start, end in zip([0] + cuts, cuts + [critical])]
+    cuts = sorted(rng.randint(0, wcet - critical) for _ in range(count))
+    gaps = [end - start for start, end in zip([0] + cuts, cuts + [wcet - critical])]
+
+    sections = []
+    for gap, duration in zip(gaps, durations + [0]):
+        if gap > 0:
+            sections.append([0, gap])
+        if duration > 0:
+            sections.append([rng.randint(1, resources), duration])
+    return sections
+
+
+def generateTaskSet(
+    count: int,
+    utilization: float,
+    seed=0,
+    method: str = "uunifast",
+    periodRange: tuple = (10, 1000),
+    distribution: str = "loguniform",
+    deadlineRange: tuple = (1.0, 1.0),
+    offsets: bool = False,
+    resources: int = 2,
+    criticalRatio: float = 0.3,
+    maxSections: int = 2,
+    endTime: int = None,
+) -> dict:
+    """
+        Generates a random task set in the layout of the JSON files. WCETs are utilization * period rounded to whole ticks
+        (at least one), deadlines a fraction of the period within 'deadlineRange' but never below the WCET.
+
+        Parameters:
+            count (int): Number of tasks
+            utilization (float): Total utilization
+            seed: Anything 'random.Random' accepts as a seed, the same seed gives the same task set
+            method (str): 'uunifast' or 'randfixedsum'
+            periodRange (tuple): Smallest and largest period
+            distribution (str): 'uniform' or 'loguniform' periods
+            deadlineRange (tuple): Smallest and largest deadline as a fraction of the period
+            offsets (bool): If True, offsets are drawn within the first period, otherwise all are 0
+            resources (int): Number of semaphores shared by the tasks
+            criticalRatio (float): Fraction of the WCETs spent in critical sections
+            maxSections (int): Largest number of critical sections of a job
+            endTime (int): End time of the schedule, the largest period if None
+        Returns:
+            (dict) Task set dictionary
+    """
+    rng = random.Random(seed)
+    draw = {"uunifast": uunifast, "randfixedsum": randfixedsum}[method]
+    utilizations = draw(count, utilization, rng)
+
+    low, high = periodRange
+    taskset = []
+    for taskId, taskUtilization in enumerate(utilizations, start=1):
+        if distribution == "uniform":
+            period = rng.randint(low, high)
+        elif distribution == "loguniform":
+            period = min(high, int(exp(rng.uniform(log(low), log(high + 1)))))
+        else:
+            raise ValueError(f"unknown period distribution '{distribution}'")
+
+        wcet = min(period, max(1, round(taskUtilization * period)))
+        taskset.append({
+            TaskSetJsonKeys.KEY_TASK_ID: taskId,
+            TaskSetJsonKeys.KEY_TASK_PERIOD: period,
+            TaskSetJsonKeys.KEY_TASK_WCET: wcet,
+            TaskSetJsonKeys.KEY_TASK_DEADLINE: min(period, max(wcet, round(period * rng.uniform(*deadlineRange)))),
+            TaskSetJsonKeys.KEY_TASK_OFFSET: rng.randrange(period) if offsets else 0,
+            TaskSetJsonKeys.KEY_TASK_SECTIONS: buildSections(wcet, resources, criticalRatio, maxSections, rng),
+        })
+
+    return {
+        TaskSetJsonKeys.KEY_SCHEDULE_START: 0,
+        TaskSetJsonKeys.KEY_SCHEDULE_END: max(task[TaskSetJsonKeys.KEY_TASK_PERIOD] for task in taskset) if endTime is None else endTime,
+        TaskSetJsonKeys.KEY_TASKSET: taskset,
+    }
+
+
+def writeCorpus(directory: str, sets: int, count: int, utilization: float, seed: int = 0, **options):
+    """
+        Writes one JSON file per task set, yielding the paths as they are written, so a corpus of any size is never in memory
+
+        Parameters:
+            directory (str): Output directory
+            sets (int): Number of task sets
+            count (int): Number of tasks per set
+            utilization (float): Total utilization of every set
+            seed (int): Seed of the corpus, task set i is generated from the seed '{seed}-{i}' so it can be regenerated alone
+            options: Passed on to 'generateTaskSet'
+        Returns:
+            (Iterator[str]) Paths of the written files
+    """
+    os.makedirs(directory, exist_ok=True)
+    for index in range(sets):
+        path = os.path.join(directory, f"taskset_{index:06d}.json")
+        with open(path, "w") as file:
+            json.dump(generateTaskSet(count, utilization, seed=f"{seed}-{index}", **options), file)
+        yield path
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Writes a corpus of random task sets with critical sections as JSON files (run as 'python -m src.generator')")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("-s", "--sets", type=int, default=100, help="number of task sets")
+    parser.add_argument("-n", "--tasks", type=int, default=10, help="number of tasks per set")
+    parser.add_argument("-u", "--utilization", type=float, default=0.7, help="total utilization of every set")
+    parser.add_argument("-m", "--method", default="uunifast", choices=["uunifast", "randfixedsum"])
+    parser.add_argument("-p", "--periods", type=int, nargs=2, default=[10, 1000], metavar=("MIN", "MAX"))
+    parser.add_argument("--distribution", default="loguniform", choices=["uniform", "loguniform"])
+    parser.add_argument("--deadlines", type=float, nargs=2, default=[1.0, 1.0], metavar=("MIN", "MAX"), help="deadlines as fractions of the periods")
+    parser.add_argument("--offsets", action="store_true", help="draw random offsets within the first period")
+    parser.add_argument("-r", "--resources", type=int, default=2, help="number of semaphores")
+    parser.add_argument("-c", "--critical-ratio", type=float, default=0.3, help="fraction of the WCETs in critical sections")
+    parser.add_argument("--max-sections", type=int, default=2, help="largest number of critical sections per job")
+    parser.add_argument("-e", "--end-time", type=int, default=None, help="end time of every schedule (largest period by default)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = writeCorpus(
+        args.directory, args.sets, args.tasks, args.utilization, seed=args.seed, method=args.method, periodRange=tuple(args.periods),
+        distribution=args.distribution, deadlineRange=tuple(args.deadlines), offsets=args.offsets, resources=args.resources,
+        criticalRatio=args.critical_ratio, maxSections=args.max_sections, endTime=args.end_time,
+    )
+    print(f"wrote {sum(1 for _ in paths)} task sets to {args.directory}")
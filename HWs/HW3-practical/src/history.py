@@ -0,0 +1,100 @@
+# Standard imports
+from array import array
+from bisect import bisect_right
+
+
+class History(object):
+    """ Run-length encoded history of the scheduler, stored as array-backed segments of equal ticks """
+
+    NONE = -1       # Stored in place of None for IDs and priorities (both are never negative)
+    OVERHEAD = -2   # Section of the ticks a job spends on scheduler overhead instead of executing
+
+    def __init__(self) -> 'History':
+        """ Constructor """
+        self.starts = array('q')        # Start time of every segment
+        self.ends = array('q')          # End time (exclusive) of every segment
+        self.tasks = array('q')         # Task ID of every segment
+        self.jobs = array('q')          # Job ID of every segment
+        self.sections = array('q')      # Semaphore ID of the section of every segment
+        self.priorities = array('d')    # Priority of the job of every segment
+
+
+    def append(self, time: int, task: int|None, job: int|None, section: int|None, priority: float|None) -> None:
+        """
+            Records what happened within the scheduler at the given tick
+
+            Parameters:
+                time (int): Time of the tick
+                task (int|None): ID of the running task, None if idle
+                job (int|None): ID of the running job, None if idle
+                section (int|None): Semaphore ID of the running section, None if idle
+                priority (float|None): Priority of the running job, None if idle
+            Returns:
+                None
+        """
+        record = (
+            self.NONE if task is None else task,
+            self.NONE if job is None else job,
+            self.NONE if section is None else section,
+            self.NONE if priority is None else priority,
+        )
+
+        # Extend the latest segment if nothing changed since
+        if self.ends and self.ends[-1] == time and self.record(-1) == record:
+            self.ends[-1] = time + 1
+            return
+
+        self.starts.append(time)
+        self.ends.append(time + 1)
+        self.tasks.append(record[0])
+        self.jobs.append(record[1])
+        self.sections.append(record[2])
+        self.priorities.append(record[3])
+
+
+    def record(self, index: int) -> tuple:
+        """ Returns the raw (task, job, section, priority) record of a segment """
+        return (self.tasks[index], self.jobs[index], self.sections[index], self.priorities[index])
+
+
+    def info(self, index: int) -> dict:
+        """ Returns the information of a segment in the same form the scheduler logs it """
+        task, job, section, priority = self.record(index)
+        return {
+            "task": None if task == self.NONE else task,
+            "job": None if job == self.NONE else job,
+            "section": None if section == self.NONE else section,
+            "priority": None if priority == self.NONE else priority,
+        }
+
+
+    def segments(self, start: int = None, end: int = None):
+        """
+            Yields (start, end, info) segments clipped to the given time range
+
+            Parameters:
+                start (int): Start of the time range, beginning of the history if None
+                end (int): End of the time range (exclusive), end of the history if None
+        """
+        if not self.starts:
+            return
+        start = self.starts[0] if start is None else start
+        end = self.ends[-1] if end is None else end
+
+        for index in range(bisect_right(self.ends, start), len(self.starts)):
+            if self.starts[index] >= end:
+                break
+            yield max(self.starts[index], start), min(self.ends[index], end), self.info(index)
+
+
+    def at(self, time: int) -> dict:
+        """ Returns what happened within the scheduler at the given tick """
+        index = bisect_right(self.ends, time)
+        if index == len(self.starts) or time < self.starts[0]:
+            raise IndexError(f"no history at time {time}")
+        return self.info(index)
+
+
+    def __len__(self) -> int:
+        """ Returns the number of recorded ticks """
+        return self.ends[-1] - self.starts[0] if self.starts else 0
@@ -1,9 +1,15 @@
+# Standard imports
+from bisect import bisect_left, bisect_right
+
 # Third-party imports
 # from src.task import Task
 
 
 class Job(object):
 
+    # Fixed attribute layout (no per-instance dict) keeps the many released jobs small and attribute lookups fast
+    __slots__ = ("task", "id", "releaseTime", "relativeDeadline", "remainingTime", "executedTime", "ip", "priority", "overhead", "chargedAt", "waitingOn")
+
     def __init__(self, task, jobId: int, releaseTime: float) -> 'Job':
         """
             Constructor
@@ -20,6 +26,9 @@ class Job(object):
         self.remainingTime = task.wcet                  # Same as WCET on initialization
 
         self.executedTime = 0
+        self.overhead = 0       # Scheduler overhead (ticks) the job has to pay before it executes further
+        self.chargedAt = -1     # Executed time at which the semaphore overhead of the current section was charged
+        self.waitingOn = 0      # ID of the semaphore the job is blocked on, 0 if it is not blocked
         self.ip = None          # IP stands for Initial Priority, initialized based on relative Deadlines
         self.priority = None    # Priority is more dynamic and can change based on the current state of tasks and the scheduler
         self.init_priority_DM() # ip = priority
@@ -31,43 +40,29 @@ class Job(object):
 
 
     def nextSectionJustStarted(self) -> bool:
-        executedTime = self.executedTime
-
-        for _, section in enumerate(self.task.sections):
-            section_duration = section[1]
-            if executedTime < section_duration:
-                # Section is being held and have not fully been executed
-                break
+        """ Returns True if the executed time is right at the start of a section (or at the end of the last one) """
+        if self.executedTime == 0:
+            return True
 
-            executedTime -= section_duration   # Resouce can be fully consumed
-        return executedTime == 0
+        sectionEnds = self.task.sectionEnds
+        index = bisect_left(sectionEnds, self.executedTime)
+        return index < len(sectionEnds) and sectionEnds[index] == self.executedTime
 
 
     def getResourceHeld(self) -> int:
         """ Returns the ID of the resource that it's currently holding """
-        executedTime = self.executedTime
-        last_semaphore = self.task.sections[0][0]
-
-        for _, section in enumerate(self.task.sections):
-            section_duration = section[1]
-            if executedTime < section_duration:
-                # Section is being held and have not fully been executed
-                break
-
-            executedTime -= section_duration   # Resouce can be fully consumed
-            last_semaphore = self.task.sections[_ + 1][0]
-        return last_semaphore
+        # Sections that ended at or before the executed time are fully consumed
+        return self.task.sections[bisect_right(self.task.sectionEnds, self.executedTime)][0]
 
 
-    def getRecourseWaiting(self):
-        '''a resource that is being waited on, but not currently executing'''
-        "@TODO"
-        pass
+    def getRecourseWaiting(self) -> int:
+        """ Returns the ID of the resource that it's waiting on (blocked, not executing), 0 if it is not waiting """
+        return self.waitingOn
 
 
-    def getRemainingSectionTime(self):
-        "@TODO"
-        pass
+    def getRemainingSectionTime(self) -> float:
+        """ Returns the time left in the section that is currently being executed """
+        return self.task.sectionEnds[bisect_right(self.task.sectionEnds, self.executedTime)] - self.executedTime
 
 
     def execute(self, time: int) -> None:
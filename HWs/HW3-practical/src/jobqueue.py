@@ -0,0 +1,80 @@
+# Standard imports
+from heapq import heappush, heappop
+
+# Third-party imports
+from src.job import Job
+
+
+class JobQueue(object):
+
+    def __init__(self) -> 'JobQueue':
+        """
+            Constructor, an index of active jobs ordered the way the scheduler picks them: lowest priority value first,
+            then earliest release, then latest admitted. Entries are replaced rather than removed, stale ones are dropped lazily.
+        """
+        self.heap = []          # Heap of (priority, release time, -admission, version, job)
+        self.versions = {}      # Job -> version of its only valid heap entry
+        self.admissions = {}    # Job -> admission order
+        self.suspended = {}     # Blocked job -> version of its latest heap entry (stale while it is suspended)
+        self.admitted = 0       # Number of jobs admitted so far
+
+
+    def push(self, job: Job) -> None:
+        """ Admits a newly released job """
+        self.admitted += 1
+        self.admissions[job] = self.admitted
+        self.versions[job] = 0
+        heappush(self.heap, (job.priority, job.releaseTime, -self.admitted, 0, job))
+
+
+    def update(self, job: Job) -> None:
+        """ Re-indexes a job after its priority changed """
+        if job not in self.versions:
+            return
+        self.versions[job] += 1
+        heappush(self.heap, (job.priority, job.releaseTime, -self.admissions[job], self.versions[job], job))
+
+
+    def remove(self, job: Job) -> None:
+        """ Removes a job (e.g. once completed) """
+        if job in self.versions:
+            del self.versions[job]
+            del self.admissions[job]
+
+
+    def suspend(self, job: Job) -> None:
+        """ Takes a blocked job out of the index, keeping its admission order for when it resumes """
+        self.suspended[job] = self.versions.pop(job)
+
+
+    def resume(self, job: Job) -> None:
+        """ Puts a suspended job back into the index, with its current priority """
+        self.versions[job] = self.suspended.pop(job)
+        self.update(job)
+
+
+    def peek(self) -> Job|None:
+        """ Returns the job to run next, None if there is no active job """
+        while self.heap:
+            version, job = self.heap[0][3], self.heap[0][4]
+            if self.versions.get(job) == version:
+                return job
+            heappop(self.heap)
+        return None
+
+
+    def ordered(self) -> list:
+        """ Returns the active jobs in the order they would be picked """
+        return sorted(self.versions, key=lambda job: (job.priority, job.releaseTime, -self.admissions[job]))
+
+
+    def __contains__(self, job: Job) -> bool:
+        return job in self.versions
+
+
+    def __iter__(self):
+        return iter(self.versions)
+
+
+    def __len__(self) -> int:
+        return len(self.versions)
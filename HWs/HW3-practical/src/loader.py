@@ -0,0 +1,109 @@
+# Standard imports
+import json
+
+# Third-party imports
+from src.taskset import TaskSet
+from src.utils import TaskSetJsonKeys
+
+
+def readTaskSet(path: str) -> dict:
+    """
+        Reads a task set JSON file in one go
+
+        Parameters:
+            path (str): Path of the JSON file
+        Returns:
+            (dict) Task set dictionary
+    """
+    with open(path, "rb") as file:
+        return json.loads(file.read())
+
+
+def taskColumns(data: dict) -> dict:
+    """
+        Gathers the fields of all the tasks of a task set into one list per field
+
+        Parameters:
+            data (dict): Task set dictionary
+        Returns:
+            (dict) Field -> list of the values of every task (None where a task leaves out an optional field)
+    """
+    tasks = data[TaskSetJsonKeys.KEY_TASKSET]
+    return {
+        "id": [task.get(TaskSetJsonKeys.KEY_TASK_ID) for task in tasks],
+        "period": [task.get(TaskSetJsonKeys.KEY_TASK_PERIOD) for task in tasks],
+        "wcet": [task.get(TaskSetJsonKeys.KEY_TASK_WCET) for task in tasks],
+        "deadline": [task.get(TaskSetJsonKeys.KEY_TASK_DEADLINE, task.get(TaskSetJsonKeys.KEY_TASK_PERIOD)) for task in tasks],
+        "offset": [task.get(TaskSetJsonKeys.KEY_TASK_OFFSET, 0) for task in tasks],
+        "sections": [task.get(TaskSetJsonKeys.KEY_TASK_SECTIONS) for task in tasks],
+    }
+
+
+def validateTaskSet(data: dict, path: str = "task set") -> dict:
+    """
+        Checks a task set one field at a time before any task is built
+
+        Parameters:
+            data (dict): Task set dictionary
+            path (str): Name of the task set in error messages
+        Returns:
+            (dict) The same task set dictionary
+        Raises:
+            ValueError: Naming the problem and the IDs (or positions) of the offending tasks
+    """
+    if int(data[TaskSetJsonKeys.KEY_SCHEDULE_START]) > int(data[TaskSetJsonKeys.KEY_SCHEDULE_END]):
+        raise ValueError(f"{path}: start time is after the end time")
+
+    columns = taskColumns(data)
+    names = [f"#{index}" if taskId is None else str(taskId) for index, taskId in enumerate(columns["id"])]
+    isNumber = lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    checks = [
+        ("missing or non-numeric IDs", [not isinstance(taskId, int) for taskId in columns["id"]]),
+        ("missing or non-positive periods", [not isNumber(period) or period <= 0 for period in columns["period"]]),
+        ("missing or non-positive WCETs", [not isNumber(wcet) or wcet <= 0 for wcet in columns["wcet"]]),
+        ("non-positive deadlines", [not isNumber(deadline) or deadline <= 0 for deadline in columns["deadline"]]),
+        ("negative offsets", [not isNumber(offset) or offset < 0 for offset in columns["offset"]]),
+        ("malformed sections", [
+            not isinstance(sections, list) or not sections or any(len(section) != 2 or section[1] <= 0 for section in sections)
+            for sections in columns["sections"]
+        ]),
+    ]
+    for problem, invalid in checks:
+        offending = [name for name, bad in zip(names, invalid) if bad]
+        if offending:
+            raise ValueError(f"{path}: {problem} for tasks {', '.join(offending)}")
+
+    # Only checked once the sections are known to be well formed
+    mismatched = [name for name, wcet, sections in zip(names, columns["wcet"], columns["sections"]) if sum(section[1] for section in sections) != wcet]
+    if mismatched:
+        raise ValueError(f"{path}: sections do not add up to the WCET for tasks {', '.join(mismatched)}")
+    if len(set(columns["id"])) != len(columns["id"]):
+        raise ValueError(f"{path}: duplicate task IDs")
+
+    return data
+
+
+def loadTaskSet(path: str) -> TaskSet:
+    """
+        Reads, validates and builds a task set
+
+        Parameters:
+            path (str): Path of the JSON file
+        Returns:
+            (TaskSet) Task set instance
+    """
+    return TaskSet(validateTaskSet(readTaskSet(path), path))
+
+
+def iterTaskSets(paths):
+    """
+        Lazily loads task sets one at a time, so a whole corpus is never in memory at once
+
+        Parameters:
+            paths (Iterable[str]): Paths of the JSON files
+        Returns:
+            (Iterator[tuple]) (path, TaskSet) pairs
+    """
+    for path in paths:
+        yield path, loadTaskSet(path)
@@ -0,0 +1,259 @@
+# Standard imports
+import csv
+import json
+from math import ceil
+
+
+class Histogram(object):
+
+    SUB_BUCKETS = 16    # Buckets per power of two, values are kept within 1 / 16 of their size
+
+    def __init__(self) -> 'Histogram':
+        """
+            Constructor, a streaming histogram of values in ticks in log-linear buckets: values below 32 are counted
+            exactly, larger ones in buckets of 1 / 16 of their power of two. The memory depends on the range of the
+            values, not on how many are recorded. Every value it reports is a float, whole ticks or not.
+        """
+        self.buckets = {}       # Bucket index (negative for negative values) -> count
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+
+    def record(self, value: float) -> None:
+        """
+            Parameters:
+                value (float): Value to count (a fractional value is counted in the bucket of its magnitude rounded up)
+        """
+        value = float(value)
+        index = self.bucket(ceil(abs(value)))
+        index = -index - 1 if value < 0 else index
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+    def bucket(self, value: int) -> int:
+        """ Returns the index of the bucket of a non-negative value """
+        if value < 2 * self.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 5
+        return (shift + 1) * self.SUB_BUCKETS + (value >> shift) - self.SUB_BUCKETS
+
+
+    def bounds(self, index: int) -> tuple:
+        """ Returns the (lowest, highest) non-negative values of a bucket """
+        if index < 2 * self.SUB_BUCKETS:
+            return index, index
+        shift = index // self.SUB_BUCKETS - 1
+        lowest = (index % self.SUB_BUCKETS + self.SUB_BUCKETS) << shift
+        return lowest, lowest + (1 << shift) - 1
+
+
+    def value(self, index: int) -> int:
+        """ Returns the value reported for a bucket: its highest value, or the one closest to zero for negative values """
+        if index < 0:
+            return -self.bounds(-index - 1)[0]
+        return self.bounds(index)[1]
+
+
+    def percentile(self, percent: float) -> float|None:
+        """
+            Parameters:
+                percent (float): Percentile, between 0 and 100
+            Returns:
+                (float|None) Nearest-rank percentile, rounded up to its bucket (clipped to the recorded range), None if empty
+        """
+        if self.count == 0:
+            return None
+        rank = max(ceil(percent * self.count / 100), 1)
+        seen = 0
+        for index in sorted(self.buckets, key=self.value):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(float(self.value(index)), self.minimum), self.maximum)
+        return self.maximum
+
+
+    def merge(self, other: 'Histogram') -> None:
+        """ Adds the counts of another histogram """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+    @property
+    def mean(self) -> float|None:
+        """ Mean of the recorded values, None if empty """
+        return self.total / self.count if self.count else None
+
+
+    def summary(self) -> dict:
+        """
+            Returns:
+                (dict) Count, mean, minimum, median, 90th and 99th percentiles and maximum
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.maximum,
+        }
+
+
+class MetricsCollector(object):
+
+    METRICS = ["response", "lateness", "jitter", "preemptions", "blocking"]
+
+    def __init__(self) -> 'MetricsCollector':
+        """
+            Constructor, per-task statistics of the completed jobs of a run, in streaming histograms:
+                - response: completion time minus release time
+                - lateness: completion time minus absolute deadline (negative if early)
+                - jitter: difference between the response times of consecutive jobs of the task
+                - preemptions: times a job was switched out before it completed
+                - blocking: ticks a job waited (active or blocked on a semaphore) while a job of lower initial priority ran
+            Only the jobs that are not complete yet are tracked individually.
+        """
+        self.histograms = {}    # Task ID -> metric name -> Histogram
+        self.met = {}           # Task ID -> number of jobs that met their deadline
+        self.missed = {}        # Task ID -> number of jobs that missed their deadline
+        self.responses = {}     # Task ID -> response time of its latest completed job
+        self.jobs = {}          # Incomplete job -> [preemptions, blocking ticks]
+
+
+    def preempted(self, job) -> None:
+        """ Counts a preemption of an incomplete job """
+        self.jobs.setdefault(job, [0, 0])[0] += 1
+
+
+    def blocked(self, job) -> None:
+        """ Counts a tick during which a job was kept waiting by a job of lower initial priority """
+        self.jobs.setdefault(job, [0, 0])[1] += 1
+
+
+    def completed(self, job, time: int, missed: bool) -> None:
+        """
+            Records the statistics of a completed job
+
+            Parameters:
+                job (Job): Completed job
+                time (int): Completion time
+                missed (bool): Whether the job missed its deadline (as decided by the scheduler)
+        """
+        taskId = job.task.id
+        if taskId not in self.histograms:
+            self.histograms[taskId] = {metric: Histogram() for metric in self.METRICS}
+            self.met[taskId] = self.missed[taskId] = 0
+        histograms = self.histograms[taskId]
+
+        response = time - job.releaseTime
+        histograms["response"].record(response)
+        histograms["lateness"].record(time - job.deadline)
+        if taskId in self.responses:
+            histograms["jitter"].record(abs(response - self.responses[taskId]))
+        self.responses[taskId] = response
+
+        preemptions, blocking = self.jobs.pop(job, (0, 0))
+        histograms["preemptions"].record(preemptions)
+        histograms["blocking"].record(blocking)
+
+        if missed:
+            self.missed[taskId] += 1
+        else:
+            self.met[taskId] += 1
+
+
+    def overall(self, metric: str) -> Histogram:
+        """
+            Parameters:
+                metric (str): Name of a metric
+            Returns:
+                (Histogram) Metric over the jobs of all tasks
+        """
+        merged = Histogram()
+        for histograms in self.histograms.values():
+            merged.merge(histograms[metric])
+        return merged
+
+
+    def missRatio(self) -> float:
+        """ Returns the fraction of the completed jobs of all tasks that missed their deadline """
+        missed = sum(self.missed.values())
+        return missed / max(missed + sum(self.met.values()), 1)
+
+
+    def summary(self) -> dict:
+        """
+            Returns:
+                (dict) Task ID -> jobs met and missed, miss ratio and the summary of every metric histogram
+        """
+        return {
+            taskId: {
+                "met": self.met[taskId],
+                "missed": self.missed[taskId],
+                "missRatio": self.missed[taskId] / (self.met[taskId] + self.missed[taskId]),
+                **{metric: histogram.summary() for metric, histogram in histograms.items()},
+            }
+            for taskId, histograms in sorted(self.histograms.items())
+        }
+
+
+    def rows(self) -> list:
+        """
+            Returns:
+                (list) One flat row per (task, metric) with the miss ratio of the task, for tables and CSV files
+        """
+        rows = []
+        for taskId, summary in self.summary().items():
+            for metric in self.METRICS:
+                rows.append({"task": taskId, "metric": metric, "missRatio": summary["missRatio"], **summary[metric]})
+        return rows
+
+
+    def write(self, path: str) -> None:
+        """ Writes the summary as JSON, or the rows as CSV if the path ends with '.csv' """
+        if path.endswith(".csv"):
+            writeCsv(path, self.rows())
+        else:
+            writeJson(path, self.summary())
+
+
+    def printSummary(self) -> None:
+        """ Prints the miss ratio and the response time, lateness and blocking percentiles of every task """
+        for taskId, summary in self.summary().items():
+            response, lateness, blocking = summary["response"], summary["lateness"], summary["blocking"]
+            print(
+                f"TASK {taskId}: {summary['missed']}/{summary['met'] + summary['missed']} missed, "
+                f"response p50 {response['p50']} p99 {response['p99']} max {response['max']}, "
+                f"lateness p99 {lateness['p99']} max {lateness['max']}, "
+                f"blocking p99 {blocking['p99']} max {blocking['max']}, "
+                f"preemptions max {summary['preemptions']['max']}"
+            )
+
+
+def writeJson(path: str, summary) -> None:
+    """ Writes a summary (or a list of them) as JSON """
+    with open(path, "w") as file:
+        json.dump(summary, file, indent=4)
+
+
+def writeCsv(path: str, rows: list) -> None:
+    """ Writes rows of 'MetricsCollector.rows' (possibly with extra leading columns) as CSV """
+    fields = ["task", "metric", "missRatio", "count", "mean", "min", "p50", "p90", "p99", "max"]
+    extra = [key for key in (rows[0] if rows else {}) if key not in fields]
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=extra + fields)
+        writer.writeheader()
+        writer.writerows(rows)
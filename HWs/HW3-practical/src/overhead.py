@@ -0,0 +1,22 @@
+class Overheads(object):
+
+    def __init__(self, dispatch: int = 0, preemption: int = 0, semaphore: int = 0) -> 'Overheads':
+        """
+            Scheduler overheads charged to the timeline, in ticks. A job pays its overhead before it executes further,
+            so the time shows up as busy processor time and pushes back its completion (and any deadline it misses).
+
+            Parameters:
+                dispatch (int): Context switch, paid by a job every time it starts running after another job or idle time
+                preemption (int): Paid by a preempted job once it resumes (cache and pipeline reload)
+                semaphore (int): Cost of one semaphore operation, a job entering a critical section pays for the lock and
+                                 the unlock at once, so that it never completes with an unlock still due
+        """
+        if min(dispatch, preemption, semaphore) < 0:
+            raise ValueError("overheads cannot be negative")
+        self.dispatch = dispatch
+        self.preemption = preemption
+        self.semaphore = semaphore
+
+
+    def __repr__(self):
+        return f"Overheads(dispatch={self.dispatch}, preemption={self.preemption}, semaphore={self.semaphore})"
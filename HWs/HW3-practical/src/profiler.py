@@ -0,0 +1,82 @@
+# Standard imports
+from collections import namedtuple
+
+
+# What the scheduler did at one tick, passed to the hooks (phase times in seconds of wall time)
+Decision = namedtuple("Decision", ["time", "previous", "job", "admission", "selection", "bookkeeping", "inversion", "ceilingRaise"])
+
+
+class Profiler(object):
+
+    def __init__(self, hooks: list = None) -> 'Profiler':
+        """
+            Overhead timers and counters of the scheduling decisions of a scheduler
+
+            Parameters:
+                hooks (list): Callables called with the 'Decision' of every tick, after it is accounted for
+        """
+        self.hooks = list(hooks or [])
+
+        self.decisions = 0
+        self.contextSwitches = 0        # Ticks that run a different job than the tick before
+        self.preemptions = 0            # Context switches away from a job that had not completed
+        self.priorityInversions = 0     # Times a job started running ahead of an active job of higher initial priority
+        self.ceilingRaises = 0          # Priority raises of jobs entering critical sections
+
+        self.admissionTime = 0.0        # Moving released jobs into the active job index
+        self.selectionTime = 0.0        # Priority resets and picking the job to run
+        self.bookkeepingTime = 0.0      # Execution, priority raises, history, completions and tracing
+
+        self.inverting = None           # Job currently running ahead of a job of higher initial priority
+
+
+    def record(self, decision: Decision) -> None:
+        """
+            Accounts for the decision of a tick and passes it on to the hooks
+
+            Parameters:
+                decision (Decision): What the scheduler did
+        """
+        self.decisions += 1
+        self.admissionTime += decision.admission
+        self.selectionTime += decision.selection
+        self.bookkeepingTime += decision.bookkeeping
+        self.ceilingRaises += decision.ceilingRaise
+
+        if decision.job is not None and decision.job is not decision.previous:
+            self.contextSwitches += 1
+            if decision.previous is not None and not decision.previous.isCompleted():
+                self.preemptions += 1
+
+        # An inversion lasts as long as the same job keeps a job of higher priority waiting
+        if decision.inversion and self.inverting is not decision.job:
+            self.priorityInversions += 1
+        self.inverting = decision.job if decision.inversion else None
+
+        for hook in self.hooks:
+            hook(decision)
+
+
+    def summary(self) -> dict:
+        """
+            Returns:
+                (dict) Counters, total time of every phase and the mean time per decision (seconds)
+        """
+        total = self.admissionTime + self.selectionTime + self.bookkeepingTime
+        return {
+            "decisions": self.decisions,
+            "contextSwitches": self.contextSwitches,
+            "preemptions": self.preemptions,
+            "priorityInversions": self.priorityInversions,
+            "ceilingRaises": self.ceilingRaises,
+            "admissionTime": self.admissionTime,
+            "selectionTime": self.selectionTime,
+            "bookkeepingTime": self.bookkeepingTime,
+            "timePerDecision": total / max(self.decisions, 1),
+        }
+
+
+    def printSummary(self) -> None:
+        """ Prints the counters and the overhead per decision """
+        for key, value in self.summary().items():
+            print(f"{key}: {value * 1e6:.2f} us" if isinstance(value, float) else f"{key}: {value}")
@@ -0,0 +1,211 @@
+# Standard imports
+from heapq import heappush, heappop
+
+# Third-party imports
+from src.job import Job
+from src.taskset import TaskSet
+from src.utils import ResourceManagementAlgorithm
+
+
+class ResourceManager(object):
+    """
+        Semaphores shared by the jobs: the owner and wait queue of every semaphore and the system ceiling. A job locks the
+        semaphore of a critical section as it executes its first tick, and unlocks it once the section is done.
+        Sections are never nested, so a job holds at most one semaphore and never waits while holding one.
+
+        Protocols differ in three decisions, overridden by the subclasses:
+            - 'startBlocker': whether a job that has not started yet may start (SRP)
+            - 'lockBlocker': whether a job may lock the semaphore of the section it enters (PIP, PCP)
+            - 'lockedPriority': the priority a job runs at while holding a semaphore (NPP, HLP)
+        and in whether a job that holds a semaphore inherits the priority of the jobs it blocks ('inherits').
+    """
+
+    inherits = False
+
+    def __init__(self, taskSet: TaskSet) -> 'ResourceManager':
+        """
+            Constructor
+
+            Parameters:
+                taskSet (TaskSet): Task set instance, for the ceilings of the semaphores
+        """
+        self.ceilings = taskSet.lowest_priority_semaphores     # Semaphore ID -> highest initial priority of its users
+        self.owners = {}        # Semaphore ID -> job holding it
+        self.waiters = {}       # Semaphore ID -> jobs waiting for it to be unlocked, in the order they blocked
+        self.locks = {}         # Semaphore ID -> number of times it was locked, tells current ceiling entries from stale ones
+        self.ceilingHeap = []   # Heap of (ceiling, semaphore ID, lock number) of the locked semaphores, stale entries dropped lazily
+
+
+    def systemCeiling(self) -> tuple:
+        """
+            Returns:
+                (tuple) (ceiling, semaphore ID) of the locked semaphore with the highest ceiling, (inf, None) if none is locked
+        """
+        while self.ceilingHeap:
+            ceiling, semaphore, lock = self.ceilingHeap[0]
+            if semaphore in self.owners and self.locks[semaphore] == lock:
+                return ceiling, semaphore
+            heappop(self.ceilingHeap)
+        return float("inf"), None
+
+
+    def blocker(self, job: Job) -> int|None:
+        """
+            Decides whether a job picked by the scheduler may run for a tick
+
+            Parameters:
+                job (Job): Job with the highest priority among the active jobs
+            Returns:
+                (int|None) None if the job may run, otherwise the ID of the semaphore it has to wait on
+        """
+        if job.executedTime == 0:
+            semaphore = self.startBlocker(job)
+            if semaphore is not None:
+                return semaphore
+
+        semaphore = job.getResourceHeld()
+        if semaphore == 0 or self.owners.get(semaphore) is job:
+            return None
+        return self.lockBlocker(job, semaphore)
+
+
+    def lock(self, job: Job, semaphore: int) -> None:
+        """
+            Locks a semaphore for a job that executes the first tick of its section ('blocker' allowed it)
+
+            Parameters:
+                job (Job): Job entering the section
+                semaphore (int): ID of the semaphore of the section
+        """
+        self.locks[semaphore] = self.locks.get(semaphore, 0) + 1
+        self.owners[semaphore] = job
+        heappush(self.ceilingHeap, (self.ceilings[semaphore], semaphore, self.locks[semaphore]))
+
+
+    def wait(self, job: Job, semaphore: int) -> Job|None:
+        """
+            Queues a blocked job on a semaphore
+
+            Parameters:
+                job (Job): Blocked job, no longer active until the semaphore is unlocked
+                semaphore (int): ID of the semaphore returned by 'blocker'
+            Returns:
+                (Job|None) Owner of the semaphore if its priority was raised by inheritance, None otherwise
+        """
+        job.waitingOn = semaphore
+        self.waiters.setdefault(semaphore, []).append(job)
+
+        owner = self.owners[semaphore]
+        if self.inherits and job.priority < owner.priority:
+            owner.priority = job.priority
+            return owner
+        return None
+
+
+    def release(self, job: Job, semaphore: int) -> list:
+        """
+            Unlocks the semaphore of a finished section, restores the initial priority of the job and wakes up the waiting jobs
+
+            Parameters:
+                job (Job): Job that finished the section
+                semaphore (int): ID of the semaphore of the section
+            Returns:
+                (list) Woken up jobs, active again (they try to lock again when picked)
+        """
+        del self.owners[semaphore]
+        job.priority = job.ip
+        woken = self.waiters.pop(semaphore, [])
+        for waiter in woken:
+            waiter.waitingOn = 0
+        return woken
+
+
+    def waitingJobs(self) -> list:
+        """
+            Returns:
+                (list) Jobs blocked on any semaphore
+        """
+        return [job for jobs in self.waiters.values() for job in jobs]
+
+
+    def startBlocker(self, job: Job) -> int|None:
+        """ Returns the semaphore a job that has not started yet waits on before it may start, None if it may start """
+        return None
+
+
+    def lockBlocker(self, job: Job, semaphore: int) -> int|None:
+        """ Returns the semaphore a job waits on before it may lock the given (free or locked) semaphore, None if it may lock it """
+        return semaphore if semaphore in self.owners else None
+
+
+    def lockedPriority(self, job: Job, semaphore: int) -> float:
+        """ Returns the priority of a job while it holds the given semaphore """
+        return job.priority
+
+
+class NonPreemptiveProtocol(ResourceManager):
+    """ NPP: a job holding a semaphore runs at the highest priority, so it is never preempted within a critical section """
+
+    def lockedPriority(self, job: Job, semaphore: int) -> float:
+        return 0
+
+
+class HighestLockerProtocol(ResourceManager):
+    """ HLP: a job holding a semaphore runs at its ceiling, the highest initial priority among the tasks that use it """
+
+    def lockedPriority(self, job: Job, semaphore: int) -> float:
+        return self.ceilings[semaphore]
+
+
+class PriorityInheritanceProtocol(ResourceManager):
+    """ PIP: a job waits for a locked semaphore, and its owner inherits the priority of the jobs it blocks """
+
+    inherits = True
+
+
+class PriorityCeilingProtocol(ResourceManager):
+    """
+        PCP: a job may only lock a semaphore if its priority is higher than the system ceiling (ceilings of the semaphores
+        locked by other jobs), otherwise it waits on the semaphore that sets the ceiling, whose owner inherits its priority
+    """
+
+    inherits = True
+
+    def lockBlocker(self, job: Job, semaphore: int) -> int|None:
+        if semaphore in self.owners:
+            return semaphore
+        ceiling, blocker = self.systemCeiling()
+        return blocker if job.priority >= ceiling else None
+
+
+class StackResourcePolicy(ResourceManager):
+    """
+        SRP: a job may only start once its preemption level (its initial priority, as deadlines are fixed) is higher than
+        the system ceiling, after which it never blocks. Semaphores are always free when requested.
+    """
+
+    def startBlocker(self, job: Job) -> int|None:
+        ceiling, blocker = self.systemCeiling()
+        return blocker if job.ip >= ceiling else None
+
+
+PROTOCOLS = {
+    ResourceManagementAlgorithm.NPP: NonPreemptiveProtocol,
+    ResourceManagementAlgorithm.HLP: HighestLockerProtocol,
+    ResourceManagementAlgorithm.PIP: PriorityInheritanceProtocol,
+    ResourceManagementAlgorithm.PCP: PriorityCeilingProtocol,
+    ResourceManagementAlgorithm.SRP: StackResourcePolicy,
+}
+
+
+def createResourceManager(algorithm: ResourceManagementAlgorithm, taskSet: TaskSet) -> ResourceManager:
+    """
+        Parameters:
+            algorithm (ResourceManagementAlgorithm): Resource management algorithm
+            taskSet (TaskSet): Task set instance
+        Returns:
+            (ResourceManager) Semaphores of the task set managed with the given protocol
+    """
+    if algorithm not in PROTOCOLS:
+        raise ValueError(f"unknown resource management algorithm '{algorithm}'")
+    return PROTOCOLS[algorithm](taskSet)
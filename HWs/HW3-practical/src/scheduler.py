@@ -1,15 +1,22 @@
 # Standard imports
-from typing import List
+from itertools import chain, takewhile
+from time import perf_counter
 
 # Third-party imports
-from src.job import Job
+from src.history import History
+from src.jobqueue import JobQueue
+from src.metrics import MetricsCollector
+from src.overhead import Overheads
+from src.profiler import Decision, Profiler
+from src.resources import createResourceManager
 from src.taskset import TaskSet
+from src.trace import TraceEventType, TraceWriter
 from src.utils import ResourceManagementAlgorithm
 
 
 class Scheduler(object):
 
-    def __init__(self, taskSet: TaskSet, algorithm: ResourceManagementAlgorithm, verbose: bool = False):
+    def __init__(self, taskSet: TaskSet, algorithm: ResourceManagementAlgorithm, verbose: bool = False, quiet: bool = False, trace: TraceWriter|None = None, profiler: Profiler|None = None, overheads: Overheads|None = None, metrics: MetricsCollector|None = None):
         """
             Constructor
 
@@ -17,15 +24,38 @@ class Scheduler(object):
                 taskSet (TaskSet): Task set instance
                 algorithm (ResourceManagementAlgorithm): Resource management algorithm
                 verbose (bool): If True, scheduler logs will be printed out as it runs
+                quiet (bool): If True, job completions will not be printed out
+                trace (TraceWriter|None): If given, scheduling events are streamed to it as the scheduler runs
+                profiler (Profiler|None): If given, the overhead and the decisions of every tick are reported to it
+                overheads (Overheads|None): If given, context switch, preemption and semaphore overheads are charged to the timeline
+                metrics (MetricsCollector|None): If given, the response time, lateness, jitter, preemptions and blocking of every completed job are collected (over the simulated ticks only with 'run_steady_state')
         """
         self.algorithm = algorithm
         self.taskSet = taskSet
+        self.resources = createResourceManager(algorithm, taskSet)     # Semaphores, locked and unlocked by the protocol
         self.time = taskSet.startTime   # Universal time of the scheduler
         self.verbose = verbose
+        self.quiet = quiet
+        self.trace = trace
+        self.overheads = overheads
+        self.metrics = metrics
+
+        self.deadlines_met = 0
+        self.deadlines_missed = 0
+        self.busy_time = 0              # Ticks spent executing jobs
+        self.idle_time = 0              # Ticks without any active job
+        self.overhead_time = 0          # Ticks spent on scheduler overhead
 
         self.latest_job = None
-        self.active_jobs = []
-        self.history = []               # To keep what happened within the scheduler
+        self.active_jobs = JobQueue()   # Released jobs that are not complete yet, indexed by priority
+        self.releases = taskSet.jobReleases()
+        self.next_release = next(self.releases, None)
+        self.history = History()        # To keep what happened within the scheduler
+
+        # Profiling swaps in a timed copy of 'tick', so an unprofiled run does not pay for a single check
+        self.profiler = profiler
+        if profiler is not None:
+            self.tick = self.profiled_tick
 
 
     def run(self):
@@ -34,89 +64,296 @@ class Scheduler(object):
             self.tick()
 
 
-    def get_active_jobs(self) -> List[Job]:
-        """ Returns a list of Jobs that are neither complete, nor passed """
-        return [job for job in self.taskSet.jobs if job.isActive(self.time) and not job.isCompleted()]
+    def run_steady_state(self, endTime: int = None) -> dict:
+        """
+            Runs until the given end time, but only simulates until the state at a hyperperiod boundary repeats.
+            From then on the schedule is periodic, so whole cycles are extrapolated and only the remainder is simulated.
+            The history only covers the simulated ticks. Must be called on a fresh scheduler.
+
+            Parameters:
+                endTime (int): Time of the last tick, end time of the task set if None
+            Returns:
+                (dict) Deadlines met and missed, busy, idle and overhead ticks and utilization over the whole run,
+                       the number of simulated ticks and the length of the cycle (None if the schedule never repeated)
+        """
+        endTime = self.taskSet.endTime if endTime is None else endTime
+        self.releases = self.taskSet.jobReleases(endTime)
+        self.next_release = next(self.releases, None)
+
+        hyperperiod = self.taskSet.hyperperiod()
+        checkpoint = self.taskSet.steadyStateStart()
+        seen = {}       # State signature -> (time, statistics) at the hyperperiod boundaries passed so far
+        cycle, repeats, increments = None, 0, (0, 0, 0, 0, 0)
 
+        while self.time <= endTime:
+            if cycle is None and self.time == checkpoint:
+                signature = self.signature()
+                if signature in seen:
+                    # Same state as a previous boundary: skip the whole cycles left and simulate the last part shifted back,
+                    # releases included, so the end of the horizon is handled as in a full run
+                    start, statistics = seen[signature]
+                    cycle = self.time - start
+                    repeats = (endTime - self.time) // cycle     # Leaves at least the last tick, the only one the release cut-off affects
+                    increments = tuple(now - then for now, then in zip(self.statistics(), statistics))
+                    endTime -= repeats * cycle
+                    pending = [] if self.next_release is None else [self.next_release]
+                    self.releases = takewhile(lambda job: job.releaseTime < endTime, chain(pending, self.releases))
+                    self.next_release = next(self.releases, None)
+                    continue
+                else:
+                    seen[signature] = (self.time, self.statistics())
+                    checkpoint += hyperperiod
+            self.tick()
 
-    def get_semaphore_priority(self, semaphore_id: int) -> int:
-        """ Returns priority for the given semaphore ID based on the algorithm """
+        met, missed, busy, idle, overhead = (value + repeats * increment for value, increment in zip(self.statistics(), increments))
         return {
-            ResourceManagementAlgorithm.NPP: 0,
-            ResourceManagementAlgorithm.HLP: self.taskSet.lowest_priority_semaphores[semaphore_id],
-        }[self.algorithm]
+            "met": met,
+            "missed": missed,
+            "busy": busy,
+            "idle": idle,
+            "overhead": overhead,
+            "utilization": busy / max(busy + idle + overhead, 1),
+            "simulated": self.time - self.taskSet.startTime,
+            "cycle": cycle,
+        }
+
+
+    def statistics(self) -> tuple:
+        """ Returns the (deadlines met, deadlines missed, busy time, idle time, overhead time) counters so far """
+        return self.deadlines_met, self.deadlines_missed, self.busy_time, self.idle_time, self.overhead_time
+
+
+    def signature(self) -> tuple:
+        """
+            Returns the state of the scheduler relative to the current time. Two hyperperiod boundaries (past the offsets) with
+            the same signature are followed by the same schedule, shifted in time.
+
+            Returns:
+                (tuple) Active jobs in the order they would be picked followed by the blocked jobs, and the position of the latest job among them
+        """
+        jobs = self.active_jobs.ordered()
+        latest = jobs.index(self.latest_job) if self.latest_job in self.active_jobs else None
+        waiting = sorted(self.resources.waitingJobs(), key=lambda job: (job.task.id, job.releaseTime))
+        return latest, tuple(
+            (job.task.id, job.releaseTime - self.time, job.executedTime, job.remainingTime, job.priority, job.overhead, job.chargedAt, job.waitingOn)
+            for job in jobs + waiting
+        )
+
+
+    def admit_released_jobs(self) -> None:
+        """ Moves the jobs released by now from the release stream into the active job index """
+        while self.next_release is not None and self.next_release.isActive(self.time):
+            if not self.next_release.isCompleted():
+                self.active_jobs.push(self.next_release)
+            self.next_release = next(self.releases, None)
 
 
     def tick(self):
 
-        # Get list of active jobs to run
-        self.active_jobs = self.get_active_jobs()
+        # Index the jobs that can run
+        self.admit_released_jobs()
 
         # Increment clock
         self.time += 1
 
-        if len(self.active_jobs) == 0:
+        self.run_job(self.select_job())
+
+
+    def profiled_tick(self):
+        """ Same as 'tick', timing the admission, selection and bookkeeping phases and reporting the decision to the profiler """
+        previous = self.latest_job
+
+        start = perf_counter()
+        self.admit_released_jobs()
+        self.time += 1
+        admitted = perf_counter()
+        active_job = self.select_job()
+        selected = perf_counter()
+
+        # Inversions are read before the job runs, as it may complete and leave the active jobs (blocked jobs count too)
+        priority = None if active_job is None else active_job.priority
+        inversion = active_job is not None and any(job.ip < active_job.ip for job in chain(self.active_jobs, self.resources.waitingJobs()))
+
+        resumed = perf_counter()
+        self.run_job(active_job)
+        end = perf_counter()
+
+        ceiling_raise = active_job is not None and active_job.priority < priority
+        self.profiler.record(Decision(self.time - 1, previous, active_job, admitted - start, selected - admitted, end - resumed, inversion, ceiling_raise))
+
+
+    def select_job(self):
+        """
+            Returns:
+                (Job|None) Active job to run for the current tick, None if there is no active job
+        """
+        # Get the job to run by priotity and release time, skipping the ones the protocol blocks
+        while len(self.active_jobs) > 0:
+            job = self.active_jobs.peek()
+            semaphore = self.resources.blocker(job)
+            if semaphore is None:
+                return job
+            self.block(job, semaphore)
+        return None
+
+
+    def block(self, job, semaphore: int) -> None:
+        """ Suspends a job until a semaphore is unlocked, the owner of the semaphore may inherit its priority """
+        if self.trace is not None:
+            self.trace.write(self.time - 1, TraceEventType.BLOCK, job.task.id, job.id, semaphore, job.priority)
+        self.active_jobs.suspend(job)
+        owner = self.resources.wait(job, semaphore)
+        if owner is not None:
+            self.active_jobs.update(owner)
+
+
+    def run_job(self, active_job) -> None:
+        """
+            Runs a job for the current tick and records it
+
+            Parameters:
+                active_job (Job|None): Job picked by 'select_job', None to idle
+        """
+        if active_job is None:
             # Nore more work! We happy
+            if self.trace is not None and self.latest_job is not None:
+                self.trace.write(self.time - 1, TraceEventType.IDLE)
             self.latest_job = None
-            self.history.append({
-                "task": None,
-                "job": None,
-                "section": None,
-                "priority": None,
-            })
+            self.idle_time += 1
+            self.history.append(self.time - 1, None, None, None, None)
             return
 
-        # Set priority to initial pririty if job is about to start
-        if self.latest_job and not self.latest_job.isCompleted():
-            if self.latest_job.nextSectionJustStarted():
-                self.latest_job.priority = self.latest_job.ip
+        if self.metrics is not None:
+            self.measure(active_job)
 
-        # Get the job to run sorted by priotity and release time
-        self.active_jobs.sort(key=lambda job: (job.priority, job.releaseTime), reverse=True)
-        active_job = self.active_jobs[-1]
         held_section = active_job.getResourceHeld()
+        if self.overheads is not None:
+            self.charge_overheads(active_job, held_section)
+            if active_job.overhead > 0:
+                self.pay_overhead(active_job, held_section)
+                return
+
+        if held_section != 0 and self.resources.owners.get(held_section) is not active_job:
+            self.resources.lock(active_job, held_section)
+        if self.trace is not None:
+            self.trace_dispatch(active_job, held_section)
         active_job.execute(1)   # Execute job by 1 tick
+        self.busy_time += 1
 
         # Aquire the task
         if held_section != 0:
             # new task is asking for semaphore, bump priority
-            active_job.priority = self.get_semaphore_priority(held_section)
-
-        self.history.append({
-                "task": active_job.task.id,
-                "job": active_job.id,
-                "section": held_section,
-                "priority": active_job.priority
-        })
+            active_job.priority = self.resources.lockedPriority(active_job, held_section)
+            self.active_jobs.update(active_job)
+
+        self.history.append(self.time - 1, active_job.task.id, active_job.id, held_section, active_job.priority)
         self.latest_job = active_job
 
         # Job is done!
         if active_job.isCompleted():
+            self.active_jobs.remove(active_job)
             is_missed = self.time >= active_job.deadline
-            deadline_status = f"{'MISSED' if is_missed else 'MET'} DEADLINE"
-            print(f"JOB {active_job.id} of TASK {active_job.task.id} COMPLETED AT {self.time} ({deadline_status})")
+            if is_missed:
+                self.deadlines_missed += 1
+            else:
+                self.deadlines_met += 1
+            if self.metrics is not None:
+                self.metrics.completed(active_job, self.time, is_missed)
+
+            if not self.quiet:
+                deadline_status = f"{'MISSED' if is_missed else 'MET'} DEADLINE"
+                print(f"JOB {active_job.id} of TASK {active_job.task.id} COMPLETED AT {self.time} ({deadline_status})")
 
+        if self.trace is not None:
+            self.trace_progress(active_job, held_section)
+
+        # Section done: unlock the semaphore, back to the initial priority, and the jobs waiting on it can run again
+        if held_section != 0 and active_job.nextSectionJustStarted():
+            for job in self.resources.release(active_job, held_section):
+                self.active_jobs.resume(job)
+            self.active_jobs.update(active_job)
 
         if self.verbose:
-            print(f"TIME {self.time - 1}) {self.history[-1]}")
+            print(f"TIME {self.time - 1}) {self.history.at(self.time - 1)}")
+
+
+    def measure(self, job) -> None:
+        """ Reports to the metrics the preemption of the job a picked job replaces, and the jobs it keeps waiting with its lower initial priority """
+        previous = self.latest_job
+        if previous is not job and previous is not None and not previous.isCompleted():
+            self.metrics.preempted(previous)
+        for waiting in chain(self.active_jobs, self.resources.waitingJobs()):
+            if waiting.ip < job.ip:
+                self.metrics.blocked(waiting)
+
+
+    def charge_overheads(self, job, section: int) -> None:
+        """ Charges the overheads due as a job is picked: its dispatch, the preemption of the job it replaces and its semaphore operations """
+        previous = self.latest_job
+        if previous is not job:
+            job.overhead += self.overheads.dispatch
+            if previous is not None and not previous.isCompleted():
+                previous.overhead += self.overheads.preemption
+
+        if section != 0 and job.chargedAt != job.executedTime and job.nextSectionJustStarted():
+            job.overhead += 2 * self.overheads.semaphore     # Lock and unlock
+            job.chargedAt = job.executedTime
+
+
+    def pay_overhead(self, job, section: int) -> None:
+        """ Spends the current tick on overhead of a job instead of executing it """
+        if self.trace is not None:
+            self.trace_switch(job, section)
+        job.overhead -= 1
+        self.overhead_time += 1
+        self.history.append(self.time - 1, job.task.id, job.id, History.OVERHEAD, job.priority)
+        self.latest_job = job
+
+        if self.verbose:
+            print(f"TIME {self.time - 1}) {self.history.at(self.time - 1)}")
+
+
+    def trace_switch(self, job, section: int) -> None:
+        """ Streams the preemption and dispatch events if a job is about to replace another one (or idle time) """
+        previous = self.latest_job
+        if previous is not job:
+            if previous is not None and not previous.isCompleted():
+                self.trace.write(self.time - 1, TraceEventType.PREEMPT, previous.task.id, previous.id, previous.getResourceHeld(), previous.priority)
+            self.trace.write(self.time - 1, TraceEventType.DISPATCH, job.task.id, job.id, section, job.priority)
+
+
+    def trace_dispatch(self, job, section: int) -> None:
+        """ Streams the events that happen as a job is about to run for a tick (preemption, dispatch, section entry) """
+        self.trace_switch(job, section)
+        if section != 0 and job.nextSectionJustStarted():
+            self.trace.write(self.time - 1, TraceEventType.SECTION_ENTER, job.task.id, job.id, section, job.priority)
+
+
+    def trace_progress(self, job, section: int) -> None:
+        """ Streams the events that happen as a job has run for a tick (section exit, completion) """
+        if section != 0 and job.nextSectionJustStarted():
+            self.trace.write(self.time, TraceEventType.SECTION_EXIT, job.task.id, job.id, section, job.priority)
+        if job.isCompleted():
+            event = TraceEventType.MISS if self.time >= job.deadline else TraceEventType.COMPLETE
+            self.trace.write(self.time, event, job.task.id, job.id, None, job.priority)
 
 
     def build_timeline(self):
-        time = self.taskSet.startTime
-        # First item in history is initially active
-        active_job_signature = f"{self.history[0]['task']}-{self.history[0]['job']}-{self.history[0]['section']}"
-        active_job_is_idle = (self.history[0]['task'] is None)
-
-        for _time, info in enumerate(self.history):
-            # Get history signature and idle status
-            signature = f"{info['task']}-{info['job']}-{info['section']}"
+        # Merge segments of the same task/job/section (priority changes split the history segments)
+        time = None
+        for start, _, info in self.history.segments():
+            section = 'OVERHEAD' if info['section'] == History.OVERHEAD else info['section']
+            signature = f"{info['task']}-{info['job']}-{section}"
             is_idle = (info['task'] is None)
 
-            # New task/job/section
-            if signature != active_job_signature:
-                print(f"{time} - {_time}:\t{f'{active_job_signature}' if not active_job_is_idle else 'IDLE'}")
+            if time is None:
+                # First item in history is initially active
+                time, active_job_signature, active_job_is_idle = start, signature, is_idle
+            elif signature != active_job_signature:
+                # New task/job/section
+                print(f"{time} - {start}:\t{f'{active_job_signature}' if not active_job_is_idle else 'IDLE'}")
                 # Set it as active
-                time = _time
+                time = start
                 active_job_signature = signature
                 active_job_is_idle = is_idle
 
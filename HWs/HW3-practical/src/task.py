@@ -1,3 +1,6 @@
+# Standard imports
+from itertools import accumulate
+
 # Third-party imports
 from src.job import Job
 from src.utils import TaskSetJsonKeys
@@ -17,70 +20,41 @@ class Task(object):
         self.wcet = float(taskDict[TaskSetJsonKeys.KEY_TASK_WCET])
         self.relativeDeadline = float(taskDict.get(TaskSetJsonKeys.KEY_TASK_DEADLINE, taskDict[TaskSetJsonKeys.KEY_TASK_PERIOD]))
         self.offset = float(taskDict.get(TaskSetJsonKeys.KEY_TASK_OFFSET, 0.0))
-        self.sections = taskDict[TaskSetJsonKeys.KEY_TASK_SECTIONS]
-
-        self.lastJobId = 0
-        self.lastReleasedTime = 0.0
-        self.jobs = []
-
-
-    def getAllResources(self):
-        pass
-
-
-    def spawnJob(self, releaseTime: float) -> Job|None:
-        """
-            Spawns a job if release time is reached for the task
+        self.sections = taskDict[TaskSetJsonKeys.KEY_TASK_SECTIONS]     # Also builds 'sectionEnds'
 
-            Parameters:
-                releaseTime (float): Time of the release
-            Returns:
-                (Job|None) Job instance if conditions are met, None otherwise
-        """
-        if self.lastReleasedTime > 0 and releaseTime < self.lastReleasedTime:
-            print("INVALID: release time of job is not monotonic")
-            return None
 
-        if self.lastReleasedTime > 0 and releaseTime < self.lastReleasedTime + self.period:
-            print("INVDALID: release times are not separated by period")
-            return None
+    @property
+    def sections(self) -> list:
+        """ List of [semaphore ID, duration] sections the task executes in order """
+        return self._sections
 
-        self.lastJobId += 1
-        self.lastReleasedTime = releaseTime
 
-        job = Job(self, self.lastJobId, releaseTime)
-        self.jobs.append(job)
-        return job
+    @sections.setter
+    def sections(self, sections: list) -> None:
+        self._sections = sections
+        self.sectionEnds = list(accumulate(section[1] for section in sections))  # Executed time at which every section ends
 
 
-    def getJobs(self) -> list:
-        """ Return list of job instances """
-        return self.jobs
+    def getAllResources(self):
+        pass
 
 
-    def getJobById(self, jobId: int) -> Job|None:
+    def releaseJobs(self, startTime: float, endTime: float):
         """
-            Returns a job intance givemn its ID
+            Lazily yields the jobs of the task, one per period
 
             Parameters:
-                jobId (int): ID of the job to retreive
+                startTime (float): Time from which jobs are released (or the offset of the task if later)
+                endTime (float): Time before which the last job is released
             Returns:
-                (Job|None) Job instance if found, None otherwise
+                (Iterator[Job]) Jobs in order of release
         """
-
-        # Return Null if ID is not valid
-        if jobId > self.lastJobId:
-            return None
-
-        job = self.jobs[jobId - 1]
-        if job.id == jobId:
-            return job
-
-        for job in self.jobs:
-            if job.id == jobId:
-                return job
-
-        return None
+        releaseTime = max(self.offset, startTime)
+        jobId = 0
+        while releaseTime < endTime:
+            jobId += 1
+            yield Job(self, jobId, releaseTime)
+            releaseTime += self.period
 
 
     def getUtilization(self) -> float:
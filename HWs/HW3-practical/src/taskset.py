@@ -1,3 +1,8 @@
+# Standard imports
+from fractions import Fraction
+from heapq import merge
+from math import ceil, gcd, lcm
+
 # Third-party imports
 from src.task import Task
 from src.utils import TaskSetJsonKeys, TaskSetIterator
@@ -9,14 +14,12 @@ class TaskSet(object):
     def __init__(self, data: dict) -> 'TaskSet':
 
         self.tasks = {}
-        self.jobs = []
 
         # Retreive start and end times for the taskset
         self.startTime = int(data[TaskSetJsonKeys.KEY_SCHEDULE_START])
         self.endTime = int(data[TaskSetJsonKeys.KEY_SCHEDULE_END])
 
         self.parseDataToTasks(data)
-        self.buildJobReleases()
 
         self.lowest_priority_semaphores = self.build_lowest_priority_semaphores()
 
@@ -35,12 +38,13 @@ class TaskSet(object):
                 if semaphore_id == 0:
                     continue
 
+                # Initial priority of the jobs of the task (see 'Job.init_priority_DM')
                 if semaphore_id not in semaphore_priorities:
                     # Unseen sections
-                    semaphore_priorities[semaphore_id] = task.jobs[0].ip
-                elif task.jobs[0].ip < semaphore_priorities[semaphore_id]:
+                    semaphore_priorities[semaphore_id] = task.relativeDeadline
+                elif task.relativeDeadline < semaphore_priorities[semaphore_id]:
                     # Sections with lower priority
-                    semaphore_priorities[semaphore_id] = task.jobs[0].priority
+                    semaphore_priorities[semaphore_id] = task.relativeDeadline
         return semaphore_priorities
 
 
@@ -58,18 +62,34 @@ class TaskSet(object):
             self.tasks[task.id] = task
 
 
-    def buildJobReleases(self):
-        """ Builds jobs """
-        for task in self:
-            # Find the real time at which the task starts
-            t = max(task.offset, self.startTime)
+    def jobReleases(self, endTime: float = None):
+        """
+            Lazily yields the jobs of all tasks merged in order of release (ties in task order), so only released jobs ever exist
+
+            Parameters:
+                endTime (float): Time before which the last jobs are released, end time of the task set if None
+            Returns:
+                (Iterator[Job]) Jobs in order of release
+        """
+        endTime = self.endTime if endTime is None else endTime
+        return merge(*(task.releaseJobs(self.startTime, endTime) for task in self), key=lambda job: job.releaseTime)
+
+
+    def hyperperiod(self) -> int:
+        """
+            Returns the length after which the release pattern repeats: the LCM of the periods, rounded up to whole ticks
+
+            Returns:
+                (int) Hyperperiod in ticks
+        """
+        periods = [Fraction(task.period).limit_denominator() for task in self]
+        hyperperiod = Fraction(lcm(*(period.numerator for period in periods)), gcd(*(period.denominator for period in periods)))
+        return hyperperiod.numerator    # LCM with the tick length of 1
+
 
-            # Build jobs according to tasks
-            while t < self.endTime:
-                job = task.spawnJob(t)
-                if job:
-                    self.jobs.append(job)
-                t += task.period
+    def steadyStateStart(self) -> int:
+        """ Returns the first tick from which every task releases periodically (the largest offset) """
+        return max(self.startTime, ceil(max((task.offset for task in self), default=0)))
 
 
     def __contains__(self, elt):
@@ -100,5 +120,5 @@ class TaskSet(object):
         """ Prints all the jobs """
         print("\nJobs:")
         for task in self:
-            for job in task.getJobs():
+            for job in task.releaseJobs(self.startTime, self.endTime):
                 print(job)
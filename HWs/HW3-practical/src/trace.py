@@ -0,0 +1,179 @@
+# Standard imports
+import mmap
+import struct
+from bisect import bisect_left
+from collections import namedtuple
+
+
+# One fixed-size record per event: time, event type, task ID, job ID, semaphore ID, priority (-1 when not applicable)
+RECORD = struct.Struct("<qB3xiiid")
+HEADER = struct.Struct("<8sII")     # Magic, format version, record size
+MAGIC = b"RTESTRCE"
+VERSION = 1
+
+TraceEvent = namedtuple("TraceEvent", ["time", "event", "task", "job", "section", "priority"])
+
+
+class TraceEventType(object):
+    DISPATCH = 0    # A job starts running (after another job or idle time)
+    PREEMPT = 1     # A job that is not complete stops running
+    SECTION_ENTER = 2
+    SECTION_EXIT = 3
+    COMPLETE = 4    # A job completes before its deadline
+    MISS = 5        # A job completes at or after its deadline
+    IDLE = 6        # The processor runs out of active jobs
+    BLOCK = 7       # A job has to wait on a semaphore (section is the semaphore ID)
+
+    NAMES = ["DISPATCH", "PREEMPT", "SECTION_ENTER", "SECTION_EXIT", "COMPLETE", "MISS", "IDLE", "BLOCK"]
+
+
+class TraceWriter(object):
+
+    NONE = -1   # Stored in place of None for IDs and priorities
+
+    def __init__(self, path: str, bufferSize: int = 1 << 16) -> 'TraceWriter':
+        """
+            Constructor, opens the trace file. Events are packed into a buffer that is written out whenever it fills up.
+
+            Parameters:
+                path (str): Path of the trace file
+                bufferSize (int): Number of events buffered between writes
+        """
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.buffer = bytearray(bufferSize * RECORD.size)
+        self.offset = 0     # Bytes of the buffer in use
+        self.count = 0      # Events written so far
+
+
+    def write(self, time: int, event: int, task: int = None, job: int = None, section: int = None, priority: float = None) -> None:
+        """
+            Appends an event to the trace
+
+            Parameters:
+                time (int): Time of the event
+                event (int): Event type (see 'TraceEventType')
+                task (int): ID of the task, None if not applicable
+                job (int): ID of the job, None if not applicable
+                section (int): Semaphore ID of the section, None if not applicable
+                priority (float): Priority of the job, None if not applicable
+            Returns:
+                None
+        """
+        RECORD.pack_into(
+            self.buffer, self.offset, time, event,
+            self.NONE if task is None else task,
+            self.NONE if job is None else job,
+            self.NONE if section is None else section,
+            self.NONE if priority is None else priority,
+        )
+        self.offset += RECORD.size
+        self.count += 1
+        if self.offset == len(self.buffer):
+            self.flush()
+
+
+    def flush(self) -> None:
+        """ Writes the buffered events to the file """
+        self.file.write(memoryview(self.buffer)[:self.offset])
+        self.offset = 0
+
+
+    def close(self) -> None:
+        """ Flushes the remaining events and closes the file """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader(object):
+
+    CHUNK = 1 << 12     # Number of records unpacked at once when iterating
+
+    def __init__(self, path: str) -> 'TraceReader':
+        """
+            Constructor, memory-maps a trace file so events are only read when accessed
+
+            Parameters:
+                path (str): Path of the trace file
+        """
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, recordSize = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or recordSize != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} trace file")
+
+
+    def __len__(self) -> int:
+        return (len(self.map) - HEADER.size) // RECORD.size
+
+
+    def __getitem__(self, index: int) -> TraceEvent:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace index out of range")
+        return self.decode(RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size))
+
+
+    def __iter__(self):
+        return self.events()
+
+
+    def decode(self, record: tuple) -> TraceEvent:
+        """ Returns the event of a raw record, with None in place of the missing values """
+        time, event, *values = record
+        return TraceEvent(time, event, *(None if value == TraceWriter.NONE else value for value in values))
+
+
+    def events(self, start: int = None, end: int = None):
+        """
+            Yields the events within the given time range, found by binary search (events are in time order)
+
+            Parameters:
+                start (int): Start of the time range, beginning of the trace if None
+                end (int): End of the time range (exclusive), end of the trace if None
+        """
+        first = 0 if start is None else bisect_left(self, start, key=lambda event: event.time)
+
+        # Unpack a chunk of records at a time, so only that much of the file is ever copied
+        stop = HEADER.size + len(self) * RECORD.size
+        step = self.CHUNK * RECORD.size
+        for offset in range(HEADER.size + first * RECORD.size, stop, step):
+            for record in RECORD.iter_unpack(self.map[offset:min(offset + step, stop)]):
+                if end is not None and record[0] >= end:
+                    return
+                yield self.decode(record)
+
+
+    def replay(self, start: int = None, end: int = None) -> None:
+        """ Prints the events within the given time range """
+        for event in self.events(start, end):
+            details = "" if event.task is None else f" [{event.task}:{event.job}]"
+            if event.section is not None:
+                details += f" section {event.section}"
+            print(f"{event.time}:\t{TraceEventType.NAMES[event.event]}{details}")
+
+
+    def close(self) -> None:
+        """ Unmaps and closes the trace file """
+        self.map.close()
+        self.file.close()
+
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
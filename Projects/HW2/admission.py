@@ -0,0 +1,238 @@
+"""
+    Online admission control.
+
+    Tasks and one-shot (sporadic or aperiodic) jobs submitted while a simulation runs are admitted only if the
+    admitted work stays schedulable. The tests are incremental: they update cached state of the admitted work
+    instead of analysing the whole set again.
+
+    - EDF: the densities C / min(D, T) of the periodic tasks are summed, which bounds their demand over any
+      window. Pending one-shot jobs are kept in deadline order, and a submission is checked against the demand
+      up to every deadline it affects. Non-preemptive EDF adds the longest WCET as blocking, which must also
+      fit within the shortest relative deadline.
+    - RM/DM: the response times of the periodic tasks are cached in priority order. A new task only needs its
+      own response time and those of the tasks below it, each iterated from its cached value.
+    - One-shot jobs under RM run at the priority of their period (zero, the highest, for a job without one). The
+      periodic tasks ranked above a job (one job of each carried in from before its arrival) and the pending jobs
+      must let it finish by its deadline, and every periodic task ranked below it must still meet its deadline
+      with the pending jobs as extra work, iterated from its cached response time. A job is pending until its
+      deadline plus the longest periodic deadline, as it may still share a response window with a job admitted
+      up to then.
+    - One-shot jobs under DM: the scheduler ranks every job by its absolute deadline, the periodic ones by the
+      end of their period, which is EDF with implicit deadlines, so jobs take the EDF test with the utilization.
+
+    All tests are sufficient, not exact. Jobs count against the admitted load until their deadline has passed.
+"""
+
+# Standard imports
+from bisect import bisect_right, insort
+from heapq import merge
+from math import ceil
+from typing import List, Optional, Tuple
+
+# Third-party imports
+from task import Task
+
+
+def response_time(wcet: float, deadline: float, higher: List[Tuple[float, float]], start: float = None) -> Optional[float]:
+    """ Iterates R = C + sum(ceil(R / T) * C) over the (wcet, period) of the higher priority tasks from 'start', None once over the deadline """
+    response = wcet + sum(c for c, _ in higher) if start is None else start
+    while response <= deadline:
+        updated = wcet + sum(ceil(response / t) * c for c, t in higher)
+        if updated == response:
+            return response
+        response = updated
+    return None
+
+
+class AdmissionController(object):
+    """ Incremental admission tests for tasks and one-shot jobs submitted to a running scheduler """
+
+    def __init__(self, algorithm: str) -> 'AdmissionController':
+        self.algorithm = algorithm
+        self.fixed_priority = algorithm in ("rm", "dm")
+        self.preemptive = algorithm != "edf_non_preemptive"
+
+        self.utilization = 0.0      # Sum of C / T of the periodic tasks
+        self.density = 0.0          # Sum of C / min(D, T) of the periodic tasks (EDF)
+        self.longest = 0            # Largest WCET, blocking under non-preemptive EDF
+        self.shortest = float("inf")    # Smallest relative deadline of the periodic tasks (EDF)
+
+        self.keys = []              # Priority of every periodic task in priority order, smaller first (RM/DM)
+        self.entries = []           # [wcet, period, deadline, response time] of every periodic task, same order
+
+        self.jobs = []              # (absolute deadline, wcet) of the admitted one-shot jobs, in deadline order
+        self.outstanding = 0        # Sum of the WCETs of 'jobs'
+        self.horizon = 0            # Time a job stays in 'jobs' after its deadline (RM)
+        self.pending = []           # [absolute deadline, period, wcet, admission time, work ranked ahead] of the RM jobs not past their deadline
+
+        self.admitted = 0
+        self.rejected = 0
+
+
+    def register(self, task: Task, time: int = 0) -> None:
+        """ Adds a task or job to the admitted work without testing it (the task set the simulation starts with) """
+        self.admit(task, time, force=True)
+
+
+    def admit(self, task: Task, time: int, force: bool = False) -> bool:
+        """ Tests a periodic task or a one-shot job submitted at the given time, and adds it to the admitted work if it passes """
+        self.expire(time)
+        admitted = self.admit_task(task, time, force) if task.is_periodic else self.admit_job(task, time, force)
+        if admitted:
+            self.admitted += 1
+        else:
+            self.rejected += 1
+        return admitted
+
+
+    def expire(self, time: int) -> None:
+        """ Drops the one-shot jobs whose deadlines have passed """
+        index = bisect_right(self.jobs, (time - self.horizon, float("inf")))
+        if index:
+            self.outstanding -= sum(wcet for _, wcet in self.jobs[:index])
+            del self.jobs[:index]
+        index = bisect_right(self.pending, [time, float("inf")])
+        del self.pending[:index]
+
+
+    def admit_task(self, task: Task, time: int, force: bool = False) -> bool:
+        """ Tests a periodic task against the admitted work and adds it if it passes """
+        deadline = min(task.daedline, task.period)
+        if not force and self.utilization + task.wcet / task.period > 1:
+            return False
+
+        if self.fixed_priority:
+            return self.admit_fixed_priority(task, deadline, force)
+
+        density = self.density + task.wcet / deadline
+        blocking = 0 if self.preemptive else max(self.longest, task.wcet)
+        shortest = min(self.shortest, deadline)
+        if not force and (density + blocking / shortest > 1 or not self.fits_demand(time, density, blocking, [])):
+            return False
+        self.density = density
+        self.shortest = shortest
+        self.longest = max(self.longest, task.wcet)
+        self.utilization += task.wcet / task.period
+        return True
+
+
+    def admit_fixed_priority(self, task: Task, deadline: float, force: bool) -> bool:
+        """ Response time test of a periodic task and of the tasks it would delay (RM/DM), each iterated from its cached value """
+        key = task.period if self.algorithm == "rm" else deadline
+        position = bisect_right(self.keys, key)     # After the tasks of equal priority, as it is submitted last
+        higher = [(wcet, period) for wcet, period, _, _ in self.entries[:position]]
+
+        # A forced task that cannot meet its deadline gets an infinite response time (and leaves no room for jobs)
+        response = response_time(task.wcet, deadline, higher)
+        if response is None:
+            if not force:
+                return False
+            response = float("inf")
+
+        updated = []
+        interfering = higher + [(task.wcet, task.period)]
+        for index in range(position, len(self.entries)):
+            wcet, period, lower_deadline, previous = self.entries[index]
+            lower_response = response_time(wcet, lower_deadline, interfering, start=previous + task.wcet)
+            if lower_response is None:
+                if not force:
+                    return False
+                lower_response = float("inf")
+            updated.append(lower_response)
+            interfering.append((wcet, period))
+
+        # The pending jobs may delay the new task and every task below it
+        entries = self.entries[:position] + [[task.wcet, task.period, deadline, response]]
+        entries += [[wcet, period, lower_deadline, lower_response] for (wcet, period, lower_deadline, _), lower_response in zip(self.entries[position:], updated)]
+        if not force and not (self.fits_jobs(entries, position, self.outstanding) and self.fits_pending(task.period, 0, entries)):
+            return False
+
+        # Every test passed, commit
+        for index, lower_response in zip(range(position, len(self.entries)), updated):
+            self.entries[index][3] = lower_response
+        self.keys.insert(position, key)
+        self.entries.insert(position, [task.wcet, task.period, deadline, response])
+        self.utilization += task.wcet / task.period
+        if self.algorithm == "rm":
+            self.horizon = max(self.horizon, deadline)
+        return True
+
+
+    def admit_job(self, task: Task, time: int, force: bool = False) -> bool:
+        """ Tests a one-shot job (its WCET within its relative deadline from the given time) and adds it if it passes """
+        deadline = max(time, task.act_time) + task.daedline
+        if not force:
+            if self.algorithm == "rm":
+                if not self.fits_rate_monotonic(task, time, deadline):
+                    return False
+            else:
+                density = self.utilization if self.fixed_priority else self.density
+                blocking = 0 if self.preemptive else self.longest
+                if not self.fits_demand(time, density, blocking, [(deadline, task.wcet)]):
+                    return False
+                # Once started, a job runs to completion under non-preemptive EDF and blocks the periodic tasks
+                if not self.preemptive and density + task.wcet / self.shortest > 1:
+                    return False
+
+        # Under RM the job delays the pending jobs ranked below it, and is delayed by all of them so far
+        if self.algorithm == "rm":
+            for job in self.pending:
+                if job[1] > task.period:
+                    job[4] += task.wcet
+            insort(self.pending, [deadline, task.period, task.wcet, time, self.outstanding])
+        insort(self.jobs, (deadline, task.wcet))
+        self.outstanding += task.wcet
+        self.longest = max(self.longest, task.wcet)
+        return True
+
+
+    def fits_rate_monotonic(self, task: Task, time: int, deadline: int) -> bool:
+        """ RM test of a one-shot job at the priority of its period, against the periodic tasks above and below it """
+        # Periodic tasks of shorter or equal period go first (ties go to the earlier task), the pending jobs may too
+        position = bisect_right(self.keys, task.period)
+        higher = [(wcet, period) for wcet, period, _, _ in self.entries[:position]]
+        carried = sum(wcet for wcet, _ in higher)
+        if response_time(task.wcet + self.outstanding + carried, deadline - time, higher) is None:
+            return False
+
+        # The job delays the pending jobs ranked below it, and together with all of them the periodic tasks below it
+        return self.fits_pending(task.period, task.wcet, self.entries) and self.fits_jobs(self.entries, position, self.outstanding + task.wcet)
+
+
+    def fits_pending(self, period: float, work: float, entries: List[list]) -> bool:
+        """
+            Returns True if the pending RM jobs ranked below a new task or job of the given period (a larger period, as
+            ties go to the earlier one) still meet their deadlines with 'work' more ahead of them and 'entries' as the
+            periodic tasks, each tested over its window from its admission to its deadline
+        """
+        periods = [entry[1] for entry in entries]
+        for deadline, job_period, wcet, admitted, ahead in self.pending:
+            if job_period > period:
+                higher = [(c, t) for c, t, _, _ in entries[:bisect_right(periods, job_period)]]
+                if response_time(wcet + ahead + work + sum(c for c, _ in higher), deadline - admitted, higher) is None:
+                    return False
+        return True
+
+
+    def fits_jobs(self, entries: List[list], position: int, work: float) -> bool:
+        """ Returns True if the periodic tasks of 'entries' from 'position' on meet their deadlines with 'work' of one-shot jobs ahead of them """
+        if work == 0:
+            return True
+        higher = [(wcet, period) for wcet, period, _, _ in entries[:position]]
+        for wcet, period, deadline, response in entries[position:]:
+            if response_time(wcet + work, deadline, higher, start=response + work) is None:
+                return False
+            higher.append((wcet, period))
+        return True
+
+
+    def fits_demand(self, time: int, density: float, blocking: float, extra: List[Tuple[float, float]]) -> bool:
+        """ EDF demand test: up to every job deadline, the periodic demand (density times the window) plus blocking and the jobs due fit in the window """
+        if density > 1:
+            return False
+        work = blocking
+        for deadline, wcet in merge(self.jobs, sorted(extra)):
+            work += wcet
+            if density * (deadline - time) + work > deadline - time:
+                return False
+        return True
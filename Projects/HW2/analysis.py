@@ -0,0 +1,139 @@
+"""
+    Schedulability analysis over whole task sets at once.
+
+    Every function takes NumPy arrays shaped (task sets, tasks), one row per task set, so thousands of
+    task sets are analysed in a single call (a 1D array is a single task set). Rows with fewer tasks are
+    padded with tasks of zero WCET, which are ignored. All tests assume a synchronous release, which is
+    the worst case for both fixed-priority and EDF scheduling, so offsets never make a feasible set infeasible.
+"""
+
+# Standard imports
+from fractions import Fraction
+from math import gcd, lcm
+
+# Third-party imports
+import numpy as np
+
+
+MAX_ITERATIONS = 1000   # Upper bound on fixed-point iterations of the response-time analysis
+
+
+def utilization(wcet: np.ndarray, period: np.ndarray) -> np.ndarray:
+    """ Returns the total utilization of every task set """
+    wcet, period = np.atleast_2d(wcet, period)
+    return np.sum(np.divide(wcet, period, out=np.zeros(wcet.shape), where=wcet > 0), axis=-1)
+
+
+def liu_layland_bound(n: np.ndarray) -> np.ndarray:
+    """ Returns the Liu-Layland utilization bound n(2^(1/n) - 1) for task sets of n tasks """
+    n = np.maximum(np.asarray(n, dtype=float), 1)
+    return n * (np.power(2, 1 / n) - 1)
+
+
+def rm_liu_layland(wcet: np.ndarray, period: np.ndarray) -> np.ndarray:
+    """ Returns True for task sets that pass the (sufficient) Liu-Layland bound under RM """
+    wcet, period = np.atleast_2d(wcet, period)
+    return utilization(wcet, period) <= liu_layland_bound(np.count_nonzero(wcet > 0, axis=-1))
+
+
+def rm_hyperbolic(wcet: np.ndarray, period: np.ndarray) -> np.ndarray:
+    """ Returns True for task sets that pass the (sufficient) hyperbolic bound prod(U_i + 1) <= 2 under RM """
+    wcet, period = np.atleast_2d(wcet, period)
+    utilizations = np.divide(wcet, period, out=np.zeros(wcet.shape), where=wcet > 0)
+    return np.prod(utilizations + 1, axis=-1) <= 2
+
+
+def response_times(wcet: np.ndarray, period: np.ndarray, deadline: np.ndarray, priority: np.ndarray = None) -> np.ndarray:
+    """
+        Returns the worst-case response time of every task under fixed-priority scheduling (inf if it exceeds the deadline,
+        is unbounded or does not converge within MAX_ITERATIONS).
+        Priorities are given by 'priority' (smaller goes first), deadlines by default (DM); pass the periods for RM.
+    """
+    wcet, period, deadline = np.atleast_2d(wcet, period, deadline)
+    wcet, period, deadline = (np.asarray(array, dtype=float) for array in (wcet, period, deadline))
+    priority = deadline if priority is None else np.atleast_2d(priority)
+    period = np.where(wcet > 0, period, 1)     # Padding tasks never interfere
+
+    # Sort tasks of every set by priority (ties keep the task order)
+    order = np.argsort(priority, axis=-1, kind="stable")
+    wcet, period, deadline = (np.take_along_axis(array, order, axis=-1) for array in (wcet, period, deadline))
+
+    # higher[..., i, j] is True if task j has higher priority than task i
+    n = wcet.shape[-1]
+    higher = np.tril(np.ones((n, n), dtype=bool), k=-1) & (wcet[..., None, :] > 0)
+
+    # A task whose own and higher priority utilization exceeds 1 has an unbounded busy period, the iteration would only creep up
+    overloaded = np.cumsum(wcet / period, axis=-1) > 1
+
+    response = wcet.copy()
+    active = ~overloaded
+    for _ in range(MAX_ITERATIONS):
+        interference = np.sum(np.where(higher, np.ceil(response[..., :, None] / period[..., None, :]) * wcet[..., None, :], 0), axis=-1)
+        updated = np.where(active, wcet + interference, response)
+
+        # Stop iterating for tasks that converged or already missed their deadlines
+        active &= (updated != response) & (updated <= deadline)
+        response = updated
+        if not active.any():
+            break
+
+    # Tasks that have not converged within the iteration bound only have a lower bound, they count as unschedulable
+    response[((response > deadline) | active | overloaded) & (wcet > 0)] = np.inf
+
+    # Back to the original task order
+    result = np.empty_like(response)
+    np.put_along_axis(result, order, response, axis=-1)
+    return result
+
+
+def rta_feasible(wcet: np.ndarray, period: np.ndarray, deadline: np.ndarray, priority: np.ndarray = None) -> np.ndarray:
+    """ Returns True for task sets whose tasks all meet their deadlines under fixed-priority scheduling (exact test) """
+    return np.all(np.isfinite(response_times(wcet, period, deadline, priority)), axis=-1)
+
+
+def hyperperiod(period: np.ndarray) -> Fraction:
+    """ Returns the LCM of the periods of a single task set, exact for non-integer periods (LCM of the numerators over the GCD of the denominators) """
+    periods = [Fraction(float(value)).limit_denominator() for value in period]
+    return Fraction(lcm(*(value.numerator for value in periods)), gcd(*(value.denominator for value in periods)))
+
+
+def demand_bound(time: np.ndarray, wcet: np.ndarray, period: np.ndarray, deadline: np.ndarray) -> np.ndarray:
+    """ Returns the processor demand of a single task set within [0, t] for every t in 'time' """
+    jobs = np.floor((time[:, None] - deadline[None, :]) / period[None, :]) + 1
+    return np.sum(np.maximum(jobs, 0) * wcet[None, :], axis=-1)
+
+
+def edf_demand_feasible(wcet: np.ndarray, period: np.ndarray, deadline: np.ndarray) -> np.ndarray:
+    """ Returns True for task sets that pass the processor-demand criterion under preemptive EDF (exact test) """
+    wcet, period, deadline = np.atleast_2d(wcet, period, deadline)
+    wcet, period, deadline = (np.asarray(array, dtype=float) for array in (wcet, period, deadline))
+    total = utilization(wcet, period)
+
+    # Utilization decides on its own when no deadline is shorter than its period
+    feasible = total <= 1
+    constrained = feasible & np.any((deadline < period) & (wcet > 0), axis=-1)
+
+    for index in np.flatnonzero(constrained):
+        mask = wcet[index] > 0
+        c, t, d = wcet[index][mask], period[index][mask], deadline[index][mask]
+
+        # Only deadlines up to one hyperperiod (or the tighter L* bound when U < 1) need checking
+        bound = float(hyperperiod(t)) + d.max()
+        if total[index] < 1:
+            bound = min(bound, max(d.max(), np.sum((t - d) * c / t) / (1 - total[index])))
+
+        # Every absolute deadline up to the bound is a test point
+        points = np.unique(np.concatenate([np.arange(di, bound + 1, ti) for ti, di in zip(t, d)]))
+        feasible[index] = np.all(demand_bound(points, c, t, d) <= points)
+
+    return feasible
+
+
+def feasible(algorithm: str, wcet: np.ndarray, period: np.ndarray, deadline: np.ndarray) -> np.ndarray:
+    """ Returns True for task sets that are schedulable with the given scheduler algorithm (necessary only for non-preemptive EDF) """
+    return {
+        "rm": lambda: rta_feasible(wcet, period, deadline, priority=np.atleast_2d(period)),
+        "dm": lambda: rta_feasible(wcet, period, deadline),
+        "edf_preemptive": lambda: edf_demand_feasible(wcet, period, deadline),
+        "edf_non_preemptive": lambda: edf_demand_feasible(wcet, period, deadline),
+    }[algorithm]()
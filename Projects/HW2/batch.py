@@ -0,0 +1,59 @@
+# Standard imports
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import List, Tuple
+
+# Third-party imports
+from loader import load_tasks
+from task import TaskState
+from taskset import TaskSet
+from scheduler import Scheduler
+from utils import ALGORITHMS, DURATION, print_table
+
+
+COLUMNS = ["taskset", "algorithm", "busy", "utilization", "dispatches", "completed"]
+
+
+def simulate(config: Tuple[str, str, int]) -> dict:
+    """ Runs a single (task set file, algorithm, duration) configuration and returns its summary row """
+    path, algorithm, duration = config
+
+    taskset = TaskSet(load_tasks(path))
+    scheduler = Scheduler(taskset, algorithm)
+    scheduler.run(duration)
+
+    busy = dispatches = completed = 0
+    for task in taskset.get_all_tasks():
+        for start, end, state in task.history.segments():
+            if state == TaskState.RUNNING:
+                busy += end - start
+                dispatches += 1
+        completed += task.is_complete
+
+    return {
+        "taskset": path,
+        "algorithm": algorithm,
+        "busy": busy,
+        "utilization": round(busy / duration, 4),
+        "dispatches": dispatches,
+        "completed": completed,
+    }
+
+
+def run_batch(paths: List[str], algorithms: List[str], duration: int, workers: int = None) -> List[dict]:
+    """ Runs every (task set file, algorithm) combination on a process pool, results are in the order of the combinations """
+    configs = [(path, algorithm, duration) for path, algorithm in product(paths, algorithms)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(simulate, configs, chunksize=max(1, len(configs) // 64)))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Runs task sets against scheduling algorithms in parallel")
+    parser.add_argument("tasksets", nargs="+", help="task set CSV files")
+    parser.add_argument("-a", "--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("-d", "--duration", type=int, default=DURATION)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes (all cores by default)")
+    args = parser.parse_args()
+
+    print_table(run_batch(args.tasksets, args.algorithms, args.duration, args.workers), COLUMNS)
@@ -0,0 +1,197 @@
+# Standard imports
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from itertools import product
+from typing import Dict, List
+
+# Third-party imports
+from task import Task, TaskType
+from taskset import TaskSet
+from scheduler import Scheduler
+from utils import ALGORITHMS
+
+
+STARTUP_BUDGET = 0.15                       # Seconds a quiet run of main.py may take on top of a bare interpreter
+HEAVY_MODULES = ["pandas", "numpy", "colorama", "asyncio", "concurrent.futures"]     # Must not be imported on the startup path of a quiet run
+KEYS = ["algorithm", "tasks", "utilization", "duration"]    # Identify a suite case across result files
+
+
+def random_tasks(count: int, seed: int = 0) -> List[Task]:
+    """ Builds random periodic tasks """
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        period = rng.randint(10 * count, 100 * count)
+        tasks.append(Task(
+            name=f"Task{index + 1}",
+            type=TaskType.PERIODIC,
+            act_time=rng.randint(0, period),
+            period=period,
+            wcet=rng.randint(1, max(1, period // (2 * count))),
+            deadline=period
+        ))
+    return tasks
+
+
+def wall_time(command: List[str], runs: int) -> float:
+    """ Returns the best wall time in seconds of a command over several runs """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def startup_overhead(runs: int) -> float:
+    """ Returns the time in seconds a quiet run of main.py takes on top of starting a bare interpreter """
+    return wall_time([sys.executable, "main.py", "--quiet"], runs) - wall_time([sys.executable, "-c", "pass"], runs)
+
+
+def startup_imports() -> List[str]:
+    """ Returns the heavy modules that importing main.py and loading a task set pulls in """
+    code = f"import sys, main, loader; loader.load_tasks('data/tasks1.csv'); print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+
+
+def memory_per_task(count: int) -> float:
+    """ Returns the memory in bytes taken by a task """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = random_tasks(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(tasks)
+
+
+def ticks_per_second(count: int, duration: int, algorithm: str) -> float:
+    """ Returns the number of ticks per second when scheduling every tick """
+    scheduler = Scheduler(TaskSet(random_tasks(count)), algorithm)
+    start = time.perf_counter()
+    for time_unit in range(duration):
+        scheduler.schedule(time_unit)
+    scheduler.flush(duration)
+    return duration / (time.perf_counter() - start)
+
+
+def generated_tasks(count: int, utilization: float, seed: int) -> List[Task]:
+    """ Builds periodic tasks of the given total utilization with the task set generator """
+    from generator import generate
+    arrays = generate(count, utilization, seed=seed, period_range=(10, 1000))
+    return [
+        Task(name=f"Task{index + 1}", type=TaskType.PERIODIC, act_time=int(offset), period=int(period), wcet=int(wcet), deadline=int(deadline))
+        for index, (period, wcet, deadline, offset) in enumerate(zip(*(arrays[key][0] for key in ("period", "wcet", "deadline", "offset"))))
+    ]
+
+
+def run_case(algorithm: str, count: int, utilization: float, duration: int, repeat: int = 3, seed: int = 0) -> dict:
+    """
+        Runs a single suite case with the event-driven scheduler and returns its result row: ticks and events
+        (recorded state changes) per second, best of 'repeat' runs, and the peak memory of a separate traced run
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        taskset = TaskSet(generated_tasks(count, utilization, seed))
+        scheduler = Scheduler(taskset, algorithm)
+        start = time.perf_counter()
+        scheduler.run(duration)
+        best = min(best, time.perf_counter() - start)
+    events = sum(len(task.history.starts) for task in taskset.get_all_tasks())
+
+    # Tracing slows everything down, so memory is measured on a run of its own
+    tracemalloc.start()
+    taskset = TaskSet(generated_tasks(count, utilization, seed))
+    Scheduler(taskset, algorithm).run(duration)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "tasks": count,
+        "utilization": utilization,
+        "duration": duration,
+        "seconds": best,
+        "ticks_per_second": duration / best,
+        "events_per_second": events / best,
+        "peak_memory": peak,
+    }
+
+
+def run_suite(algorithms: List[str], counts: List[int], utilizations: List[float], durations: List[int], repeat: int = 3) -> dict:
+    """ Runs every combination of the suite parameters, returns the results with the version and platform they were measured on """
+    results = []
+    for algorithm, count, utilization, duration in product(algorithms, counts, utilizations, durations):
+        results.append(run_case(algorithm, count, utilization, duration, repeat))
+        print(" ".join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}" for key, value in results[-1].items()), flush=True)
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    return {
+        "project": "HW2",
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[Dict]:
+    """ Returns the cases whose throughput dropped (or peak memory grew) by more than 'tolerance' from the baseline """
+    previous = {tuple(row[key] for key in KEYS): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(tuple(row[key] for key in KEYS))
+        if old is None:
+            continue
+        throughput = row["ticks_per_second"] / old["ticks_per_second"]
+        memory = row["peak_memory"] / max(old["peak_memory"], 1)
+        if throughput < 1 - tolerance or memory > 1 + tolerance:
+            regressions.append({**{key: row[key] for key in KEYS}, "throughput": throughput, "memory": memory})
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Measures startup time, memory per task and scheduler dispatch throughput, or runs the benchmark suite")
+    parser.add_argument("-t", "--tasks", type=int, default=1000)
+    parser.add_argument("-d", "--duration", type=int, default=100000)
+    parser.add_argument("-s", "--startup-runs", type=int, default=10, help="runs of main.py to time the startup over")
+    parser.add_argument("--suite", default=None, metavar="RESULTS", help="run the suite and write its results to this JSON file")
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000], help="task counts of the suite")
+    parser.add_argument("--utilizations", type=float, nargs="+", default=[0.5, 0.9], help="total utilizations of the suite")
+    parser.add_argument("--durations", type=int, nargs="+", default=[10000, 100000], help="durations of the suite")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per suite case, the best one counts")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="report regressions of the suite against an earlier results file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative change tolerated before a case counts as a regression")
+    args = parser.parse_args()
+
+    if args.suite is not None:
+        report = run_suite(args.algorithms, args.counts, args.utilizations, args.durations, args.repeat)
+        with open(args.suite, "w") as file:
+            json.dump(report, file, indent=4)
+
+        if args.compare is not None:
+            with open(args.compare) as file:
+                regressions = compare(json.load(file), report, args.tolerance)
+            for regression in regressions:
+                print("REGRESSION " + " ".join(f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}" for key, value in regression.items()))
+            sys.exit(1 if regressions else 0)
+        sys.exit(0)
+
+    overhead = startup_overhead(args.startup_runs)
+    heavy = startup_imports()
+    print(f"startup overhead: {overhead * 1000:.0f} ms (budget {STARTUP_BUDGET * 1000:.0f} ms){'' if overhead <= STARTUP_BUDGET else ' OVER BUDGET'}")
+    print(f"heavy imports on startup: {', '.join(heavy) if heavy else 'none'}")
+
+    print(f"memory per task: {memory_per_task(args.tasks * 10):.1f} bytes")
+    for algorithm in ALGORITHMS:
+        print(f"{algorithm} ticks per second: {ticks_per_second(args.tasks, args.duration, algorithm):.0f}")
+
+    # The startup check fails the run, after the other measurements are printed
+    sys.exit(1 if overhead > STARTUP_BUDGET or heavy else 0)
@@ -0,0 +1,110 @@
+"""
+    Regression checks of the simulator and the analysis, run against the task sets in data/ and a few generated ones.
+
+    Every check raises AssertionError naming what went wrong. Run them all with 'python checks.py' (exits non-zero
+    on the first failure), or pass task set files to check those instead of data/*.csv.
+"""
+
+# Standard imports
+import random
+import sys
+from glob import glob
+from itertools import product
+from typing import List
+
+# Third-party imports
+from admission import AdmissionController
+from loader import load_tasks
+from metrics import MetricsCollector
+from overhead import Overheads
+from scheduler import Scheduler
+from server import create_server
+from task import Task, TaskType
+from taskset import TaskSet
+from utils import ALGORITHMS
+
+
+def check_rta_overload(paths: List[str]) -> None:
+    """ The response-time analysis never calls a task set with a utilization above 1 feasible """
+    import analysis
+    from generator import generate
+
+    for path in paths:
+        taskset = TaskSet(load_tasks(path))
+        arrays = taskset.to_arrays()
+        if analysis.utilization(arrays["wcet"], arrays["period"])[0] > 1:
+            for algorithm in ("rm", "dm"):
+                assert not analysis.feasible(algorithm, arrays["wcet"], arrays["period"], arrays["deadline"])[0], f"{path}: {algorithm} RTA feasible with U > 1"
+
+    # Barely overloaded sets converge slowly, the iteration bound must not leave them looking feasible
+    assert not analysis.rta_feasible([499, 499, 1e6], [1000, 1001, 3.8e8], [1000, 1001, 3.8e8])[0], "RTA feasible with U = 1.0001"
+    arrays = generate(8, 1.02, sets=200, seed=1)
+    overloaded = analysis.utilization(arrays["wcet"], arrays["period"]) > 1     # Rounded WCETs bring some sets back below 1
+    feasible = analysis.rta_feasible(arrays["wcet"], arrays["period"], arrays["deadline"], arrays["period"])
+    assert not (feasible & overloaded).any(), "RTA feasible for generated sets with U > 1"
+
+
+def check_reset_tick(paths: List[str]) -> None:
+    """ A job completing on the tick its next job is released met its deadline, and is counted once """
+    for algorithm in ALGORITHMS:
+        # Arrives on a period boundary, so its first job completes on 37, the tick the next one is released
+        task = Task(name="P", type=TaskType.PERIODIC, act_time=36, period=12, wcet=1, deadline=12)
+        scheduler = Scheduler(TaskSet([task]), algorithm)
+        scheduler.run(80)
+        assert scheduler.statistics() == (5, 0), f"{algorithm}: {scheduler.statistics()} deadlines (met, missed) instead of (5, 0)"
+
+
+def check_admission(paths: List[str], sets: int = 40, duration: int = 1500) -> None:
+    """ Every sporadic job the admission controller lets into a random periodic set meets its deadline, as do the periodic tasks """
+    for algorithm in ALGORITHMS:
+        for seed in range(sets):
+            rng = random.Random(seed)
+            periods = [rng.choice([10, 20, 25, 40, 50, 100]) for _ in range(rng.randint(2, 5))]
+            tasks = [Task(name=f"T{index}", type=TaskType.PERIODIC, period=period, wcet=rng.randint(1, max(1, period // 5)), deadline=period) for index, period in enumerate(periods)]
+
+            # Only sets the periodic tests accept guarantee anything about the jobs added to them
+            controller = AdmissionController(algorithm)
+            if not all(controller.admit(task, 0) for task in tasks):
+                continue
+            controller = AdmissionController(algorithm)
+            scheduler = Scheduler(TaskSet(tasks), algorithm, admission=controller)
+
+            jobs, time = [], 0
+            while time < duration:
+                time += rng.randint(1, 30)
+                scheduler.run_until(time)
+                job = Task(name=f"J{time}", type=TaskType.SPORADIC, act_time=time, period=rng.choice([0, 0, 5, 15, 30, 60, 200]), wcet=rng.randint(1, 8), deadline=rng.randint(5, 60))
+                if scheduler.submit(job, time):
+                    jobs.append(job)
+            scheduler.run(duration + 200)
+
+            # Late jobs are counted as missed when they complete
+            unfinished = [job.name for job in jobs if not job.is_complete]
+            assert not unfinished and scheduler.statistics()[1] == 0, f"{algorithm}, seed {seed}: admitted jobs {unfinished} unfinished, {scheduler.statistics()[1]} deadlines missed"
+
+
+def check_metrics_counters(paths: List[str]) -> None:
+    """ The jobs the metrics record as met and missed are the deadlines the scheduler counts, with and without overload """
+    overloaded = [Task(name=f"T{index}", type=TaskType.PERIODIC, act_time=index, period=period, wcet=wcet, deadline=period) for index, (period, wcet) in enumerate([(10, 4), (15, 6), (30, 12)])]
+    tasksets = [(path, lambda path=path: load_tasks(path)) for path in paths]
+    tasksets.append(("overloaded", lambda: [Task(task.name, type=task.type, act_time=task.act_time, period=task.period, wcet=task.wcet, deadline=task.daedline) for task in overloaded]))
+
+    for (name, load), algorithm, overheads, server in product(tasksets, ALGORITHMS, [None, Overheads(1, 1)], [None, "deferrable"]):
+        metrics = MetricsCollector()
+        servers = [create_server(server, 2, 10)] if server is not None else None
+        scheduler = Scheduler(TaskSet(load()), algorithm, overheads=overheads, servers=servers, metrics=metrics)
+        scheduler.run(300)
+        recorded = sum(metrics.met.values()), sum(metrics.missed.values())
+        assert recorded == scheduler.statistics(), f"{name}, {algorithm}, {overheads}, {server} server: metrics {recorded} (met, missed), scheduler {scheduler.statistics()}"
+        late = [task for task, summary in metrics.summary().items() if summary["missed"] == 0 and (summary["lateness"]["max"] or 0) > 0]
+        assert not late, f"{name}, {algorithm}: positive lateness without a miss for {late}"
+
+
+CHECKS = [check_rta_overload, check_reset_tick, check_admission, check_metrics_counters]
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or sorted(glob("data/*.csv"))
+    for check in CHECKS:
+        check(paths)
+        print(f"{check.__name__}: ok")
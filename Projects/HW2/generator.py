@@ -0,0 +1,165 @@
+"""
+    Synthetic periodic task sets for benchmarks.
+
+    Utilizations are drawn with UUniFast (Bini & Buttazzo) or Randfixedsum (Stafford, as used by Emberson et al.),
+    both uniform over the task sets of the target total utilization; UUniFast-discard is used when the total
+    exceeds 1, so that no single task is over 1. Periods are drawn uniformly or log-uniformly, WCETs follow
+    as utilization * period rounded to whole ticks (at least one). Everything is seeded, so a corpus is
+    reproducible file by file.
+"""
+
+# Standard imports
+import csv
+import os
+from argparse import ArgumentParser
+from typing import Iterator, Tuple
+
+# Third-party imports
+import numpy as np
+
+
+COLUMNS = ["priority", "name", "state", "type", "act_time", "period", "wcet", "deadline"]    # Same as the data/*.csv files
+MAX_DISCARDS = 1000     # Attempts of UUniFast-discard per task set
+
+
+def uunifast(count: int, utilization: float, sets: int, rng: np.random.Generator) -> np.ndarray:
+    """ Returns (sets, count) task utilizations summing to 'utilization', with UUniFast (discarding sets with a task over 1) """
+    result = np.empty((sets, count))
+    pending = np.arange(sets)
+    for _ in range(MAX_DISCARDS):
+        # Remaining sums shrink by r^(1 / (tasks left)) at every step
+        exponents = 1 / np.arange(count - 1, 0, -1)
+        sums = utilization * np.cumprod(rng.random((len(pending), count - 1)) ** exponents, axis=-1)
+        sums = np.concatenate([np.full((len(pending), 1), utilization), sums], axis=-1)
+        utilizations = np.concatenate([sums[:, :-1] - sums[:, 1:], sums[:, -1:]], axis=-1)
+
+        valid = np.all(utilizations <= 1, axis=-1)
+        result[pending[valid]] = utilizations[valid]
+        pending = pending[~valid]
+        if len(pending) == 0:
+            return result
+    raise ValueError(f"UUniFast-discard found no {count} tasks of total utilization {utilization} with every task at most 1, use randfixedsum")
+
+
+def randfixedsum(count: int, utilization: float, sets: int, rng: np.random.Generator) -> np.ndarray:
+    """ Returns (sets, count) task utilizations in [0, 1] summing to 'utilization', uniformly distributed (Stafford's algorithm) """
+    if not 0 <= utilization <= count:
+        raise ValueError(f"no {count} tasks of utilization at most 1 can add up to {utilization}")
+    if count == 1:
+        return np.full((sets, 1), float(utilization))
+
+    # Probabilities of moving between the simplices that tile the hypercube
+    k = min(int(utilization), count - 1)
+    s1 = utilization - np.arange(k, k - count, -1.0)
+    s2 = np.arange(k + count, k, -1.0) - utilization
+    w = np.zeros((count, count + 1))
+    w[0, 1] = np.finfo(float).max
+    t = np.zeros((count - 1, count))
+    for i in range(2, count + 1):
+        tmp1 = w[i - 2, 1:i + 1] * s1[:i] / i
+        tmp2 = w[i - 2, :i] * s2[count - i:] / i
+        w[i - 1, 1:i + 1] = tmp1 + tmp2
+        tmp3 = w[i - 1, 1:i + 1] + np.finfo(float).tiny
+        larger = s2[count - i:] > s1[:i]
+        t[i - 2, :i] = np.where(larger, tmp2 / tmp3, 1 - tmp1 / tmp3)
+
+    # Walk down the dimensions, for all the sets at once
+    x = np.zeros((count, sets))
+    rt = rng.random((count - 1, sets))
+    rs = rng.random((count - 1, sets))
+    s = np.full(sets, float(utilization))
+    j = np.full(sets, k + 1)
+    sm = np.zeros(sets)
+    pr = np.ones(sets)
+    for i in range(count - 1, 0, -1):
+        e = rt[count - i - 1] <= t[i - 1, j - 1]
+        sx = rs[count - i - 1] ** (1 / i)
+        sm = sm + (1 - sx) * pr * s / (i + 1)
+        pr = sx * pr
+        x[count - i - 1] = sm + pr * e
+        s = s - e
+        j = j - e
+    x[count - 1] = sm + pr * s
+
+    # The dimensions were filled in a fixed order, shuffle the tasks of every set
+    return np.take_along_axis(x.T, rng.random((sets, count)).argsort(axis=-1), axis=-1)
+
+
+def periods(count: int, sets: int, low: int, high: int, distribution: str, rng: np.random.Generator) -> np.ndarray:
+    """ Returns (sets, count) integer periods in [low, high], drawn uniformly or log-uniformly """
+    if distribution == "uniform":
+        return rng.integers(low, high + 1, size=(sets, count))
+    if distribution == "loguniform":
+        return np.floor(np.exp(rng.uniform(np.log(low), np.log(high + 1), size=(sets, count)))).astype(int)
+    raise ValueError(f"unknown period distribution '{distribution}'")
+
+
+def generate(
+    count: int,
+    utilization: float,
+    sets: int = 1,
+    seed=0,
+    method: str = "uunifast",
+    period_range: Tuple[int, int] = (10, 1000),
+    distribution: str = "loguniform",
+    deadline_range: Tuple[float, float] = (1.0, 1.0),
+    offsets: bool = False,
+) -> dict:
+    """
+        Returns (sets, count) arrays of periods, WCETs, deadlines and offsets (the layout of 'TaskSet.to_arrays').
+        Deadlines are drawn as a fraction of the period within 'deadline_range', but never below the WCET.
+        'seed' is anything NumPy accepts as a seed (an integer or a sequence of integers).
+    """
+    rng = np.random.default_rng(seed)
+    draw = {"uunifast": uunifast, "randfixedsum": randfixedsum}[method]
+    utilizations = draw(count, utilization, sets, rng)
+
+    period = periods(count, sets, period_range[0], period_range[1], distribution, rng)
+    wcet = np.clip(np.rint(utilizations * period), 1, period).astype(int)
+    deadline = np.clip(np.rint(period * rng.uniform(*deadline_range, size=(sets, count))), wcet, period).astype(int)
+    offset = rng.integers(0, period) if offsets else np.zeros((sets, count), dtype=int)
+    return {"period": period, "wcet": wcet, "deadline": deadline, "offset": offset}
+
+
+def write_csv(path: str, period: np.ndarray, wcet: np.ndarray, deadline: np.ndarray, offset: np.ndarray) -> None:
+    """ Writes a single task set (1D arrays) as a CSV file of periodic tasks, priorities are rate monotonic """
+    priority = np.argsort(np.argsort(period, kind="stable"), kind="stable") + 1
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for index in range(len(period)):
+            writer.writerow([priority[index], f"Task{index + 1}", 1, 1, offset[index], period[index], wcet[index], deadline[index]])
+
+
+def write_corpus(directory: str, sets: int, count: int, utilization: float, seed: int = 0, **options) -> Iterator[str]:
+    """
+        Writes one CSV file per task set, yielding the paths as they are written, so a corpus of any size never has to
+        be in memory at once. Set i is seeded with (seed, i), so it can be regenerated alone. Options are passed on to 'generate'.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for index in range(sets):
+        arrays = generate(count, utilization, seed=(seed, index), **options)
+        path = os.path.join(directory, f"taskset_{index:06d}.csv")
+        write_csv(path, *(arrays[key][0] for key in ("period", "wcet", "deadline", "offset")))
+        yield path
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Writes a corpus of random periodic task sets as CSV files")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("-s", "--sets", type=int, default=100, help="number of task sets")
+    parser.add_argument("-n", "--tasks", type=int, default=10, help="number of tasks per set")
+    parser.add_argument("-u", "--utilization", type=float, default=0.7, help="total utilization of every set")
+    parser.add_argument("-m", "--method", default="uunifast", choices=["uunifast", "randfixedsum"])
+    parser.add_argument("-p", "--periods", type=int, nargs=2, default=[10, 1000], metavar=("MIN", "MAX"))
+    parser.add_argument("--distribution", default="loguniform", choices=["uniform", "loguniform"])
+    parser.add_argument("--deadlines", type=float, nargs=2, default=[1.0, 1.0], metavar=("MIN", "MAX"), help="deadlines as fractions of the periods")
+    parser.add_argument("--offsets", action="store_true", help="draw random offsets within the first period")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_corpus(
+        args.directory, args.sets, args.tasks, args.utilization, seed=args.seed, method=args.method, period_range=tuple(args.periods),
+        distribution=args.distribution, deadline_range=tuple(args.deadlines), offsets=args.offsets,
+    )
+    print(f"wrote {sum(1 for _ in paths)} task sets to {args.directory}")
@@ -0,0 +1,63 @@
+# Standard imports
+from array import array
+from bisect import bisect_right
+from enum import Enum
+from typing import Iterator, Tuple, Type
+
+
+class History(object):
+    """ Run-length encoded history of states, stored as array-backed (start, end, state) segments """
+
+    def __init__(self, kind: Type[Enum]) -> 'History':
+        self.kind = kind            # Enum of the recorded states
+        self.starts = array('q')    # Start time of every segment
+        self.ends = array('q')      # End time (exclusive) of every segment
+        self.values = array('b')    # Enum value of every segment
+
+
+    def extend(self, state: Enum, time: int) -> None:
+        """ Records the given state from the end of the history up to the given time """
+        end = len(self)
+        if time <= end:
+            return
+
+        # Merge with the latest segment if the state did not change
+        if self.values and self.values[-1] == state.value:
+            self.ends[-1] = time
+        else:
+            self.starts.append(end)
+            self.ends.append(time)
+            self.values.append(state.value)
+
+
+    def segments(self, start: int = 0, end: int = None) -> Iterator[Tuple[int, int, Enum]]:
+        """ Yields (start, end, state) segments clipped to the given time range """
+        end = len(self) if end is None else end
+        for index in range(bisect_right(self.ends, start), len(self.values)):
+            if self.starts[index] >= end:
+                break
+            yield max(self.starts[index], start), min(self.ends[index], end), self.kind(self.values[index])
+
+
+    def states(self, start: int = 0, end: int = None) -> Iterator[Enum]:
+        """ Yields the state of every time unit in the given time range """
+        for segment_start, segment_end, state in self.segments(start, end):
+            for _ in range(segment_end - segment_start):
+                yield state
+
+
+    def state_at(self, time: int) -> Enum:
+        """ Returns the state at the given time """
+        index = bisect_right(self.ends, time)
+        if index == len(self.values) or time < 0:
+            raise IndexError(f"no state recorded at time {time}")
+        return self.kind(self.values[index])
+
+
+    def __len__(self) -> int:
+        """ Returns the time covered by the history """
+        return self.ends[-1] if self.ends else 0
+
+
+    def __iter__(self) -> Iterator[Enum]:
+        return self.states()
@@ -1,55 +1,126 @@
 # Standard imports
-from pandas import DataFrame, read_csv
-from typing import List
+from argparse import ArgumentParser
 
 # Third-party imports
-from task import Task, TaskState, TaskType
+from loader import read_taskset, validate, build_tasks
+from metrics import MetricsCollector
+from multiprocessor import GlobalScheduler, HEURISTICS, run_partitioned
+from overhead import Overheads
+from profiler import Profiler
 from taskset import TaskSet
 from scheduler import Scheduler
+from server import SERVERS, create_server
+from utils import ALGORITHMS, DURATION
 
 
-def read_taskset(path: str) -> DataFrame:
-    """ Reads a task set from a csv file and returns a pandas DataFrame """
-    return read_csv(path)
+EVENT_DRIVEN = True     # Jump from event to event instead of stepping through every tick
 
 
-def build_tasks(df: DataFrame) -> List[Task]:
-    """ Builds a list of tasks from a pandas DataFrame """
-    tasks = []
-    for _, task in df.iterrows():
-        tasks.append(
-            Task(
-                name=task['name'],
-                state=TaskState.NOT_ARRIVED,
-                type=TaskType(task['type']),
-                act_time=task['act_time'],
-                period=task['period'],
-                wcet=task['wcet'],
-                deadline=task['deadline']
-            )
-        )
-    return tasks
+# Only the standard library, the loader and the simulator are imported up front. NumPy ('--analyse'), colorama
+# (terminal plots), asyncio ('--realtime') and process pools ('--partition') are imported by the code that needs
+# them, so short runs start quickly.
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Schedules a task set with every algorithm and plots the task histories")
+    parser.add_argument("taskset", nargs="?", default="data/tasks1.csv", help="task set CSV file")
+    parser.add_argument("-a", "--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("-d", "--duration", type=int, default=DURATION)
+    parser.add_argument("-w", "--width", type=int, default=None, help="downsample the plots to this many columns")
+    parser.add_argument("--html", default=None, help="write HTML Gantt charts instead, '{algorithm}' in the path is replaced")
+    parser.add_argument("--analyse", action="store_true", help="print the utilization and feasibility of the periodic tasks")
+    parser.add_argument("--profile", action="store_true", help="print the scheduling overhead and the context switch, preemption and inversion counts")
+    parser.add_argument("-o", "--overheads", type=int, nargs=2, default=None, metavar=("DISPATCH", "PREEMPTION"), help="charge context switch and preemption overheads and print the deadlines met and missed")
+    parser.add_argument("-m", "--cores", type=int, default=1, help="number of identical cores, scheduled globally unless '--partition' is given")
+    parser.add_argument("-p", "--partition", default=None, choices=HEURISTICS, help="partition the tasks (by decreasing utilization) and simulate the cores in parallel")
+    parser.add_argument("--metrics", nargs="?", const="", default=None, metavar="PATH", help="print the response time, lateness, jitter, preemption and blocking percentiles and miss ratio of every task, and write them to PATH ('{algorithm}' is replaced, JSON or CSV by extension)")
+    parser.add_argument("-s", "--server", default=None, choices=list(SERVERS), help="serve the aperiodic and sporadic tasks with a server and print their response times")
+    parser.add_argument("--budget", type=int, nargs=2, default=(2, 10), metavar=("BUDGET", "PERIOD"), help="budget and period of the server")
+    parser.add_argument("--realtime", type=float, default=None, metavar="SCALE", help="pace the simulation against the wall clock, SCALE seconds per time unit, and print the decisions as they are made")
+    parser.add_argument("--listen", type=int, default=None, metavar="PORT", help="with '--realtime', accept JSON arrival lines from TCP clients on this port and stream the decisions to them")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only run the schedules, without plotting")
+    args = parser.parse_args()
+    if args.cores < 1:
+        parser.error("--cores must be at least 1")
+    if args.partition is not None and args.cores == 1:
+        parser.error("--partition needs more than one core ('--cores')")
+    if args.cores > 1 and args.profile:
+        parser.error("--profile only works on a single core")
+    if args.cores > 1 and args.server is not None:
+        parser.error("--server only works on a single core")
+    if args.cores > 1 and args.partition is not None and (args.metrics is not None or args.realtime is not None):
+        parser.error("--metrics and --realtime do not work with --partition")
+    if args.realtime is not None and args.realtime <= 0:
+        parser.error("--realtime needs a positive SCALE")
+    if args.listen is not None and args.realtime is None:
+        parser.error("--listen needs --realtime")
 
+    # Read CSV
+    columns = validate(read_taskset(args.taskset), args.taskset)
+    overheads = Overheads(*args.overheads) if args.overheads is not None else None
 
-DURATION = 100
+    # Partitioned cores are independent uniprocessor schedules
+    if args.cores > 1 and args.partition is not None:
+        for algorithm in args.algorithms:
+            tasksets, statistics, unassigned = run_partitioned(build_tasks(columns), args.cores, algorithm, args.duration, args.partition, overheads=overheads)
+            met, missed = map(sum, zip(*statistics))
+            print(f"{algorithm} on {args.cores} cores ({args.partition}): {met} deadlines met, {missed} missed, unassigned: {[task.name for task in unassigned]}")
+            for core, taskset in enumerate(tasksets):
+                if args.html is not None:
+                    taskset.save_history(args.html.replace("{algorithm}", f"{algorithm}_core{core}"))
+                elif not args.quiet:
+                    taskset.plot_history(args.width)
 
+    else:
+        # Initialize scheduler
+        for algorithm in args.algorithms:
+            tasks = build_tasks(columns)
+            taskset = TaskSet(tasks)
+            profiler = Profiler() if args.profile else None
+            metrics = MetricsCollector() if args.metrics is not None or args.server is not None else None
+            servers = [create_server(args.server, *args.budget)] if args.server is not None else None
+            if servers is not None and servers[0].dynamic and not algorithm.startswith("edf"):
+                print(f"{algorithm}: skipped, the {args.server} server needs EDF")
+                continue
+            if args.cores > 1:
+                scheduler = GlobalScheduler(taskset, algorithm, args.cores, overheads, metrics)
+            else:
+                scheduler = Scheduler(taskset, algorithm, profiler, overheads, servers=servers, metrics=metrics)
 
-if __name__ == '__main__':
+            # Run RTOS
+            if args.realtime is not None:
+                import asyncio
+                from realtime import RealTimeRunner, run_realtime
+                asyncio.run(run_realtime(RealTimeRunner(scheduler, args.realtime), args.duration, args.listen, echo=not args.quiet))
+            elif EVENT_DRIVEN:
+                scheduler.run(args.duration)
+            else:
+                for time in range(args.duration):
+                    next_task = scheduler.schedule(time)
+                scheduler.flush(args.duration)
 
-    # Read CSV
-    tasks_df = read_taskset("data/tasks1.csv")
-    # tasks_df = read_taskset("data/tasks2.csv")
-    # tasks_df = read_taskset("data/tasks_interrupts.csv")
-
-    # Initialize scheduler
-    for algorithm in ["dm", "rm", "edf_preemptive", "edf_non_preemptive"]:
-        tasks = build_tasks(tasks_df)
-        taskset = TaskSet(tasks)
-        scheduler = Scheduler(taskset, algorithm)
-
-        # Run RTOS
-        for time in range(DURATION):
-            next_task = scheduler.schedule(time)
-
-        # Plot task history
-        taskset.plot_history()
+            if args.analyse:
+                taskset.analyse()
+                print(f"{algorithm}: utilization {taskset.utility:.3f}, {'feasible' if taskset.feaible else 'not feasible'}")
+
+            if overheads is not None:
+                met, missed = scheduler.statistics()
+                print(f"{algorithm}: {met} deadlines met, {missed} missed with {overheads}")
+
+            if servers is not None:
+                served = [task.name for task in scheduler.served]
+                print(f"{algorithm}: aperiodic response times {metrics.overall('response', served).summary()}, {servers[0].name} {servers[0].summary()}")
+
+            if args.metrics is not None:
+                print(f"{algorithm}: miss ratio {metrics.miss_ratio():.3f}")
+                metrics.print_summary()
+                if args.metrics:
+                    metrics.write(args.metrics.replace("{algorithm}", algorithm))
+
+            if profiler is not None:
+                print(f"{algorithm}: ", end="")
+                profiler.print_summary()
+
+            # Plot task history
+            if args.html is not None:
+                taskset.save_history(args.html.replace("{algorithm}", algorithm))
+            elif not args.quiet:
+                taskset.plot_history(args.width)
@@ -0,0 +1,244 @@
+"""
+    Latency and deadline statistics of the completed jobs of a run, in streaming histograms of constant memory.
+
+    Per task: response time (completion minus release), lateness (completion minus the deadline of the job, from
+    'Task.job_deadline', negative if early), jitter (difference between the response times of consecutive jobs),
+    preemptions per job and blocking per job (time spent ready while a task of lower priority ran, e.g. under
+    non-preemptive EDF). Jobs are met or missed as the deadline counters of the scheduler decide. A periodic job
+    still running when the next one is released is missed and dropped, with its remaining time as its lateness
+    (a lower bound) and no response time.
+"""
+
+# Standard imports
+import csv
+import json
+from math import ceil
+from typing import Dict, Iterable, List, Optional
+
+# Third-party imports
+from task import Task
+
+
+FIELDS = ["task", "metric", "miss_ratio", "count", "mean", "min", "p50", "p90", "p99", "max"]
+
+
+class Histogram(object):
+    """ Streaming histogram of times in log-linear buckets: exact below 32, then 16 buckets per power of two (within 1 / 16) """
+
+    SUB_BUCKETS = 16
+
+    def __init__(self) -> 'Histogram':
+        self.buckets = {}       # Bucket index (negative for negative values) -> count
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+
+    def record(self, value: float) -> None:
+        """ Counts a value (fractional values in the bucket of their magnitude rounded up) """
+        index = self.bucket(ceil(abs(value)))
+        index = -index - 1 if value < 0 else index
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+    def merge(self, other: 'Histogram') -> None:
+        """ Adds the counts of another histogram """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+    def bucket(self, value: int) -> int:
+        """ Returns the index of the bucket of a non-negative value """
+        if value < 2 * self.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 5
+        return (shift + 1) * self.SUB_BUCKETS + (value >> shift) - self.SUB_BUCKETS
+
+
+    def value(self, index: int) -> int:
+        """ Returns the value reported for a bucket: its highest value, or the one closest to zero for negative values """
+        magnitude = -index - 1 if index < 0 else index
+        if magnitude < 2 * self.SUB_BUCKETS:
+            lowest = highest = magnitude
+        else:
+            shift = magnitude // self.SUB_BUCKETS - 1
+            lowest = (magnitude % self.SUB_BUCKETS + self.SUB_BUCKETS) << shift
+            highest = lowest + (1 << shift) - 1
+        return -lowest if index < 0 else highest
+
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """ Returns the nearest-rank percentile, rounded up to its bucket and clipped to the recorded range (None if empty) """
+        if self.count == 0:
+            return None
+        rank = max(ceil(percent * self.count / 100), 1)
+        seen = 0
+        for index in sorted(self.buckets, key=self.value):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self.value(index), self.minimum), self.maximum)
+        return self.maximum
+
+
+    def summary(self) -> dict:
+        """ Returns the count, mean, minimum, median, 90th and 99th percentiles and maximum """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.minimum,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.maximum,
+        }
+
+
+class MetricsCollector(object):
+    """ Per-task histograms of the completed jobs, only the jobs in progress are tracked individually """
+
+    METRICS = ["response", "lateness", "jitter", "preemptions", "blocking"]
+
+    def __init__(self) -> 'MetricsCollector':
+        self.histograms = {}    # Task name -> metric name -> Histogram
+        self.met = {}           # Task name -> jobs that met their deadline
+        self.missed = {}        # Task name -> jobs that missed their deadline
+        self.responses = {}     # Task name -> response time of its latest completed job
+
+        self.releases = {}      # Task -> release time of its current job
+        self.deadlines = {}     # Task -> deadline of its current job
+        self.jobs = {}          # Task -> [preemptions, blocking] of its current job
+        self.waiting = []       # Ready tasks kept waiting by a task of lower priority since the latest decision
+        self.since = 0          # Time of the latest decision
+
+
+    def released(self, task: Task, time: int) -> None:
+        """ Starts tracking a new job of a task """
+        self.releases[task] = time
+        self.deadlines[task] = task.job_deadline(time)
+        self.jobs[task] = [0, 0]
+
+
+    def preempted(self, task: Task) -> None:
+        """ Counts a preemption of the current job of a task """
+        self.jobs.setdefault(task, [0, 0])[0] += 1
+
+
+    def elapse(self, time: int) -> None:
+        """ Charges the time since the latest decision to the blocking of the tasks kept waiting """
+        for task in self.waiting:
+            self.jobs.setdefault(task, [0, 0])[1] += time - self.since
+        self.since = time
+
+
+    def decided(self, waiting: List[Task], time: int) -> None:
+        """ Records the ready tasks a decision keeps waiting behind a task of lower priority """
+        self.waiting = waiting
+        self.since = time
+
+
+    def completed(self, task: Task, time: int, missed: bool) -> None:
+        """ Records the statistics of the current job of a task, completed at the given time, and whether the scheduler counted it missed """
+        histograms = self.task_histograms(task)
+        response = time - self.releases.pop(task, task.act_time)
+        histograms["response"].record(response)
+        histograms["lateness"].record(time - self.deadlines.pop(task, task.job_deadline(task.act_time)))
+        if task.name in self.responses:
+            histograms["jitter"].record(abs(response - self.responses[task.name]))
+        self.responses[task.name] = response
+
+        preemptions, blocking = self.jobs.pop(task, (0, 0))
+        histograms["preemptions"].record(preemptions)
+        histograms["blocking"].record(blocking)
+
+        if missed:
+            self.missed[task.name] += 1
+        else:
+            self.met[task.name] += 1
+
+
+    def overran(self, task: Task, time: int) -> None:
+        """ Records the current job of a task as missed, still running with 'remaining_time' left when its next job is released """
+        self.task_histograms(task)["lateness"].record(task.remaining_time)
+        self.releases.pop(task, None)
+        self.deadlines.pop(task, None)
+        self.jobs.pop(task, None)
+        self.missed[task.name] += 1
+
+
+    def task_histograms(self, task: Task) -> Dict[str, Histogram]:
+        """ Returns the histograms of a task, created on its first recorded job """
+        if task.name not in self.histograms:
+            self.histograms[task.name] = {metric: Histogram() for metric in self.METRICS}
+            self.met[task.name] = self.missed[task.name] = 0
+        return self.histograms[task.name]
+
+
+    def overall(self, metric: str, names: Iterable[str] = None) -> Histogram:
+        """ Returns a metric over the jobs of the given tasks (all of them if None) """
+        merged = Histogram()
+        for name, histograms in self.histograms.items():
+            if names is None or name in names:
+                merged.merge(histograms[metric])
+        return merged
+
+
+    def miss_ratio(self) -> float:
+        """ Returns the fraction of the recorded jobs that missed their deadline """
+        missed = sum(self.missed.values())
+        return missed / max(missed + sum(self.met.values()), 1)
+
+
+    def summary(self) -> Dict[str, dict]:
+        """ Returns the jobs met and missed, the miss ratio and the summary of every metric of every task """
+        return {
+            name: {
+                "met": self.met[name],
+                "missed": self.missed[name],
+                "miss_ratio": self.missed[name] / (self.met[name] + self.missed[name]),
+                **{metric: histogram.summary() for metric, histogram in histograms.items()},
+            }
+            for name, histograms in sorted(self.histograms.items())
+        }
+
+
+    def rows(self) -> List[dict]:
+        """ Returns one flat row per (task, metric), for tables and CSV files """
+        return [
+            {"task": name, "metric": metric, "miss_ratio": summary["miss_ratio"], **summary[metric]}
+            for name, summary in self.summary().items() for metric in self.METRICS
+        ]
+
+
+    def write(self, path: str) -> None:
+        """ Writes the summary as JSON, or the rows as CSV if the path ends with '.csv' """
+        with open(path, "w", newline="") as file:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(file, fieldnames=FIELDS)
+                writer.writeheader()
+                writer.writerows(self.rows())
+            else:
+                json.dump(self.summary(), file, indent=4)
+
+
+    def print_summary(self) -> None:
+        """ Prints the miss ratio and the response time, lateness and blocking percentiles of every task """
+        for name, summary in self.summary().items():
+            response, lateness, blocking = summary["response"], summary["lateness"], summary["blocking"]
+            print(
+                f"{name}: {summary['missed']}/{summary['met'] + summary['missed']} missed, "
+                f"response p50 {response['p50']} p99 {response['p99']} max {response['max']}, "
+                f"lateness p99 {lateness['p99']} max {lateness['max']}, "
+                f"blocking p99 {blocking['p99']} max {blocking['max']}, "
+                f"preemptions max {summary['preemptions']['max']}"
+            )
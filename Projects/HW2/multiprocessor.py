@@ -0,0 +1,187 @@
+"""
+    Multiprocessor scheduling of a task set on identical cores.
+
+    Global scheduling runs the m highest priority ready tasks of a single queue, letting tasks migrate between
+    cores. Partitioned scheduling assigns every task to one core with a bin-packing heuristic (tasks sorted by
+    decreasing utilization) and runs a uniprocessor scheduler per core; the cores never interact, so they are
+    simulated independently on a process pool.
+"""
+
+# Standard imports
+from heapq import heappush, heappop
+from typing import List, Optional, Tuple
+
+# Third-party imports
+from metrics import MetricsCollector
+from overhead import Overheads
+from scheduler import Scheduler
+from task import Task, TaskState
+from taskset import TaskSet
+
+
+HEURISTICS = ["first_fit", "best_fit", "worst_fit"]
+
+
+def utilization(task: Task) -> float:
+    """ Returns the utilization of a periodic task, the density (WCET over relative deadline) of any other task """
+    return task.wcet / (task.period if task.is_periodic else task.daedline)
+
+
+def capacity(algorithm: str, count: int) -> float:
+    """ Returns the utilization a core may take with the given number of tasks (EDF bound, or the Liu & Layland bound for RM/DM) """
+    if algorithm.startswith("edf"):
+        return 1.0
+    return count * (2 ** (1 / count) - 1)
+
+
+def pick_core(loads: List[float], counts: List[int], task_utilization: float, algorithm: str, heuristic: str) -> Optional[int]:
+    """ Returns the core a task of the given utilization is assigned to, None if it fits on none of them """
+    fitting = [core for core in range(len(loads)) if loads[core] + task_utilization <= capacity(algorithm, counts[core] + 1)]
+    if not fitting:
+        return None
+    if heuristic == "first_fit":
+        return fitting[0]
+    if heuristic == "best_fit":
+        return max(fitting, key=lambda core: loads[core])
+    if heuristic == "worst_fit":
+        return min(fitting, key=lambda core: loads[core])
+    raise ValueError(f"unknown partitioning heuristic '{heuristic}'")
+
+
+def partition(tasks: List[Task], cores: int, algorithm: str, heuristic: str = "worst_fit") -> Tuple[List[List[Task]], List[Task]]:
+    """ Assigns the tasks to cores in order of decreasing utilization, returns the tasks of every core and those that fit nowhere """
+    assigned = [[] for _ in range(cores)]
+    loads = [0.0] * cores
+    unassigned = []
+    for task in sorted(tasks, key=utilization, reverse=True):
+        core = pick_core(loads, [len(core_tasks) for core_tasks in assigned], utilization(task), algorithm, heuristic)
+        if core is None:
+            unassigned.append(task)
+        else:
+            assigned[core].append(task)
+            loads[core] += utilization(task)
+    return assigned, unassigned
+
+
+def simulate_core(config: Tuple[List[Task], str, int, Optional[Overheads]]) -> Tuple[List[Task], Tuple[int, int]]:
+    """ Runs the uniprocessor schedule of a single core, returns its tasks (with their histories) and deadline statistics """
+    tasks, algorithm, duration, overheads = config
+    scheduler = Scheduler(TaskSet(tasks), algorithm, overheads=overheads)
+    scheduler.run(duration)
+    return tasks, scheduler.statistics()
+
+
+def run_partitioned(
+    tasks: List[Task],
+    cores: int,
+    algorithm: str,
+    duration: int,
+    heuristic: str = "worst_fit",
+    workers: int = None,
+    overheads: Overheads = None,
+) -> Tuple[List[TaskSet], List[Tuple[int, int]], List[Task]]:
+    """
+        Partitions the tasks and simulates every core on its own process (in this process if 'workers' is 1).
+        Returns the task set of every core with the simulated histories, the (met, missed) deadlines of every core
+        and the tasks that could not be assigned (they are not simulated).
+    """
+    assigned, unassigned = partition(tasks, cores, algorithm, heuristic)
+    configs = [(core_tasks, algorithm, duration, overheads) for core_tasks in assigned]
+    if workers == 1:
+        results = list(map(simulate_core, configs))
+    else:
+        # Imported here, process pools take longer to import than a short global or uniprocessor run
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_core, configs))
+
+    tasksets = []
+    for core, (core_tasks, _) in enumerate(results):
+        taskset = TaskSet(core_tasks)
+        taskset.algorithm = f"{algorithm} (core {core})"
+        tasksets.append(taskset)
+    return tasksets, [statistics for _, statistics in results], unassigned
+
+
+class GlobalScheduler(Scheduler):
+    """ Global scheduling on identical cores: the highest priority ready tasks run, one per core, and may migrate between cores """
+
+    def __init__(self, taskset: TaskSet, algorithm: str, cores: int, overheads: Overheads = None, metrics: MetricsCollector = None) -> 'GlobalScheduler':
+        super().__init__(taskset, algorithm, overheads=overheads, metrics=metrics)
+        # Metrics leave out blocking, a ready task only waits when all cores run tasks of higher priority
+        self.taskset.algorithm = f"global {algorithm} on {cores} cores"
+        self.cores = cores
+        self.running = [None] * cores       # Task that is running on every core
+
+
+    def next_completion(self, time: int) -> Optional[int]:
+        """ Returns the earliest time at which a running task completes if none is preempted, None if all cores are idle """
+        completions = [time + task.remaining_time for task in self.running if task is not None]
+        return min(completions) if completions else None
+
+
+    def advance(self, time: int) -> None:
+        """ Consumes the execution time of the running tasks since the latest scheduling decision """
+        for task in self.running:
+            if task is not None:
+                task.remaining_time -= time - self.time
+        self.time = time
+
+
+    def complete(self, time: int) -> None:
+        """ Completes the running tasks that have no remaining execution time """
+        for core, task in enumerate(self.running):
+            if task is not None and not task.has_remaining_time:
+                missed = task.next_deadline(time) < time
+                if missed:
+                    self.deadlines_missed += 1
+                else:
+                    self.deadlines_met += 1
+                task.set_state(TaskState.COMPLETED, time)
+                self.finish(task, time, missed)
+                self.running[core] = None
+
+
+    def highest(self, count: int) -> List[Task]:
+        """ Returns up to 'count' ready tasks in priority order, dropping stale queue entries on the way """
+        picked, entries = [], []
+        while self.ready and len(picked) < count:
+            entry = heappop(self.ready)
+            _, index, stamp = entry
+            if stamp == self.stamps[index] and not self.tasks[index].is_complete:
+                picked.append(self.tasks[index])
+                entries.append(entry)
+        for entry in entries:
+            heappush(self.ready, entry)
+        return picked
+
+
+    def dispatch(self, time: int) -> List[Optional[Task]]:
+        """ Picks the tasks to run, keeping tasks that go on running on their core, and returns the task of every core """
+        running = [task for task in self.running if task is not None]
+        if self.preemptive:
+            chosen = self.highest(self.cores)
+        else:
+            # Non-preemptive scheduling only fills the idle cores
+            waiting = [task for task in self.highest(self.cores + len(running)) if task not in running]
+            chosen = running + waiting[:self.cores - len(running)]
+
+        for task in running:
+            if task not in chosen:
+                if self.metrics is not None:
+                    self.metrics.preempted(task)
+                task.set_state(TaskState.READY, time)
+                if self.overheads is not None:
+                    task.remaining_time += self.overheads.preemption
+
+        starting = iter([task for task in chosen if task not in running])
+        for core, task in enumerate(self.running):
+            if task is None or task not in chosen:
+                task = self.running[core] = next(starting, None)
+                if task is not None and self.overheads is not None:
+                    task.remaining_time += self.overheads.dispatch
+
+            # Releases put running tasks back to READY, as in 'Scheduler.dispatch'
+            if task is not None:
+                task.set_state(TaskState.RUNNING, time)
+        return list(self.running)
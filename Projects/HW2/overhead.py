@@ -0,0 +1,15 @@
+class Overheads(object):
+    """
+        Scheduler overheads charged to the timeline, in time units. They are added to the remaining execution time
+        of the task that pays them, so they delay its completion (and show up as running time in its history).
+    """
+
+    def __init__(self, dispatch: int = 0, preemption: int = 0) -> 'Overheads':
+        if min(dispatch, preemption) < 0:
+            raise ValueError("overheads cannot be negative")
+        self.dispatch = dispatch        # Context switch, paid by a task every time it starts running after another task or idle time
+        self.preemption = preemption    # Paid by a preempted task once it resumes (cache and pipeline reload)
+
+
+    def __repr__(self):
+        return f"Overheads(dispatch={self.dispatch}, preemption={self.preemption})"
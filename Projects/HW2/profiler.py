@@ -0,0 +1,69 @@
+# Standard imports
+from collections import namedtuple
+from typing import Callable, List
+
+
+# What a scheduler did at one decision, passed to the hooks (times in seconds of wall time)
+Decision = namedtuple("Decision", ["time", "previous", "task", "preflight", "selection", "bookkeeping", "inversion"])
+
+
+class Profiler(object):
+    """ Overhead timers and counters of the scheduling decisions of a scheduler, and hooks called after every decision """
+
+    def __init__(self, hooks: List[Callable[[Decision], None]] = None) -> 'Profiler':
+        self.hooks = list(hooks or [])
+
+        self.decisions = 0
+        self.context_switches = 0       # Decisions that put a different task on the processor
+        self.preemptions = 0            # Context switches away from a task that had not completed
+        self.priority_inversions = 0    # Times a task started running ahead of a waiting task of higher priority
+        self.ceiling_raises = 0         # Priority raises of tasks entering critical sections (none without resources)
+
+        self.preflight_time = 0.0       # Releases, arrivals and preflight checks
+        self.selection_time = 0.0       # Picking the task to run
+        self.bookkeeping_time = 0.0     # Consuming execution time, completions and state recording
+
+        self.inverting = None           # Task currently running ahead of a task of higher priority
+
+
+    def record(self, decision: Decision) -> None:
+        """ Accounts for a scheduling decision and passes it on to the hooks """
+        self.decisions += 1
+        self.preflight_time += decision.preflight
+        self.selection_time += decision.selection
+        self.bookkeeping_time += decision.bookkeeping
+
+        if decision.task is not None and decision.task is not decision.previous:
+            self.context_switches += 1
+            if decision.previous is not None and not decision.previous.is_complete:
+                self.preemptions += 1
+
+        # An inversion lasts as long as the same task keeps a task of higher priority waiting
+        if decision.inversion and self.inverting is not decision.task:
+            self.priority_inversions += 1
+        self.inverting = decision.task if decision.inversion else None
+
+        for hook in self.hooks:
+            hook(decision)
+
+
+    def summary(self) -> dict:
+        """ Returns the counters and total times """
+        total = self.preflight_time + self.selection_time + self.bookkeeping_time
+        return {
+            "decisions": self.decisions,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "priority_inversions": self.priority_inversions,
+            "ceiling_raises": self.ceiling_raises,
+            "preflight_time": self.preflight_time,
+            "selection_time": self.selection_time,
+            "bookkeeping_time": self.bookkeeping_time,
+            "time_per_decision": total / max(self.decisions, 1),
+        }
+
+
+    def print_summary(self) -> None:
+        """ Print the counters and the overhead per decision """
+        summary = self.summary()
+        print(", ".join(f"{key}: {value * 1e6:.2f} us" if key.endswith("_time") or key == "time_per_decision" else f"{key}: {value}" for key, value in summary.items()))
@@ -0,0 +1,212 @@
+"""
+    Real-time simulation: a scheduler advanced in step with the wall clock (scaled, 'scale' seconds per time unit) on
+    an asyncio loop, so that external sources can inject interrupt, sporadic and aperiodic arrivals while it runs.
+
+    Arrivals come from 'inject' (or 'loop.call_soon_threadsafe(runner.inject, task)' from another thread) or from
+    TCP clients sending one JSON object per line, e.g. {"name": "ISR2", "type": "INTERRUPT", "wcet": 2, "deadline": 8}.
+    An arrival is released at the current time and goes through the admission controller of the scheduler, if any.
+    Every arrival and every change of the running task is published to the subscribers, and to the TCP clients as
+    JSON lines, which lets a stand-in for the hardware side drive the schedule and follow it.
+"""
+
+# Standard imports
+import asyncio
+import json
+from collections import namedtuple
+from typing import Iterable, List, Optional, Union
+
+# Third-party imports
+from scheduler import Scheduler
+from task import Task, TaskState, TaskType
+
+
+# What happened at a point of the simulated time: "arrival", "rejected", "dispatch" or "end". The task is the name of
+# the arriving task, the name of the running task (None when idle, a list with one entry per core for global
+# scheduling) or None at the end.
+Event = namedtuple("Event", ["time", "kind", "task"])
+
+
+def parse_arrival(line: str) -> Task:
+    """ Builds the task of a JSON arrival line (name, type as a 'TaskType' name or value, wcet, deadline and optional period) """
+    fields = json.loads(line)
+    kind = fields.get("type", "SPORADIC")
+    return Task(
+        name=fields["name"],
+        state=TaskState.NOT_ARRIVED,
+        type=TaskType[kind] if isinstance(kind, str) else TaskType(kind),
+        period=fields.get("period", 0),
+        wcet=fields["wcet"],
+        deadline=fields["deadline"],
+    )
+
+
+def describe(decision) -> Union[Optional[str], List[Optional[str]]]:
+    """ Returns the name of the task of a decision, or the names of the tasks of every core """
+    if isinstance(decision, list):
+        return [task.name if task is not None else None for task in decision]
+    return decision.name if decision is not None else None
+
+
+class RealTimeRunner(object):
+    """ Paces a scheduler against the wall clock, accepts external arrivals and streams the decisions """
+
+    def __init__(self, scheduler: Scheduler, scale: float = 0.01) -> 'RealTimeRunner':
+        if scale <= 0:
+            raise ValueError("the time scale must be positive")
+        self.scheduler = scheduler
+        self.scale = scale                  # Wall-clock seconds per simulated time unit
+        self.arrivals = asyncio.Queue()     # Injected tasks that are not submitted yet
+        self.subscribers = []               # Queues the events are published to
+        self.start = None                   # Loop time at simulated time 0, set once running
+        self.overruns = 0                   # Decisions made later than their wall-clock time by more than a time unit
+
+
+    def now(self) -> int:
+        """ Returns the simulated time the wall clock is at """
+        return int((asyncio.get_running_loop().time() - self.start) / self.scale)
+
+
+    def inject(self, task: Task) -> None:
+        """ Queues an external arrival, released at the time the runner picks it up """
+        self.arrivals.put_nowait(task)
+
+
+    def subscribe(self) -> asyncio.Queue:
+        """ Returns a queue that receives every event from now on """
+        queue = asyncio.Queue()
+        self.subscribers.append(queue)
+        return queue
+
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """ Stops publishing to a queue of 'subscribe' """
+        self.subscribers.remove(queue)
+
+
+    def publish(self, event: Event) -> None:
+        """ Sends an event to every subscriber """
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+    def accept(self, task: Task) -> None:
+        """ Submits an injected task arriving at the current time """
+        time = max(self.now(), self.scheduler.time)
+        task.act_time = time
+        admitted = self.scheduler.submit(task, time)
+        self.publish(Event(time, "arrival" if admitted else "rejected", task.name))
+
+
+    async def run(self, duration: int) -> None:
+        """ Runs the scheduler up to the given simulated time, making every decision once the wall clock reaches it """
+        loop = asyncio.get_running_loop()
+        self.start = loop.time()
+        scheduler = self.scheduler
+        running = None
+
+        while scheduler.next_time < duration:
+            # Sleep until the next decision, an arrival wakes the runner up earlier and may bring the decision forward
+            delay = self.start + scheduler.next_time * self.scale - loop.time()
+            if delay > 0:
+                try:
+                    task = await asyncio.wait_for(self.arrivals.get(), delay)
+                except asyncio.TimeoutError:
+                    task = None
+                if task is not None:
+                    self.accept(task)
+                    continue
+            elif delay < -self.scale:
+                self.overruns += 1
+            while not self.arrivals.empty():
+                self.accept(self.arrivals.get_nowait())
+
+            time = scheduler.next_time
+            decision = describe(scheduler.step(duration))
+            if decision != running:
+                running = decision
+                self.publish(Event(time, "dispatch", decision))
+
+            # Let the producers and subscribers run even when decisions are overdue
+            await asyncio.sleep(0)
+
+        scheduler.flush(duration)
+        self.publish(Event(duration, "end", None))
+
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """ Starts a TCP server whose clients send arrivals and receive the events, as JSON lines """
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Forwards the events to a client until the end of the run (or until it disconnects) while injecting the arrivals it sends """
+        events = self.subscribe()
+        receiver = asyncio.ensure_future(self.receive(reader, writer))
+        try:
+            await self.forward(events, writer)
+        except ConnectionError:
+            pass
+        finally:
+            receiver.cancel()
+            self.unsubscribe(events)
+            writer.close()
+
+
+    async def receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Injects the arrivals of a client, answering malformed lines with an error line """
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                self.inject(parse_arrival(line.decode()))
+            except (ValueError, KeyError) as error:
+                writer.write((json.dumps({"error": str(error)}) + "\n").encode())
+
+
+    async def forward(self, events: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """ Writes the events of a subscription as JSON lines until the end of the run """
+        while True:
+            event = await events.get()
+            writer.write((json.dumps(event._asdict()) + "\n").encode())
+            await writer.drain()
+            if event.kind == "end":
+                return
+
+
+async def send_arrivals(host: str, port: int, arrivals: Iterable[dict], interval: float = 0.0) -> List[dict]:
+    """ Client side (e.g. a stand-in for the hardware): sends arrivals as JSON lines and returns the events received until the end of the run """
+    reader, writer = await asyncio.open_connection(host, port)
+    for arrival in arrivals:
+        writer.write((json.dumps(arrival) + "\n").encode())
+        await writer.drain()
+        await asyncio.sleep(interval)
+
+    events = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        events.append(json.loads(line))
+        if events[-1].get("kind") == "end":
+            break
+    writer.close()
+    return events
+
+
+async def run_realtime(runner: RealTimeRunner, duration: int, port: int = None, host: str = "127.0.0.1", echo: bool = True) -> None:
+    """ Runs a real-time simulation, serving TCP clients on the given port if any and printing the events if 'echo' """
+    server = await runner.serve(host, port) if port is not None else None
+    events = runner.subscribe() if echo else None
+    simulation = asyncio.ensure_future(runner.run(duration))
+    try:
+        while echo:
+            event = await events.get()
+            print(f"{event.time}: {event.kind} {event.task if event.task is not None else ''}".rstrip())
+            if event.kind == "end":
+                break
+        await simulation
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
@@ -0,0 +1,133 @@
+"""
+    Gantt charts of task histories, for the terminal or as standalone HTML/SVG.
+
+    Rows are built from the run-length encoded histories, one coloured run per segment instead of one
+    print per tick. Histories longer than the requested width are downsampled: every column shows the
+    state that lasts longest within the time it covers.
+"""
+
+# Standard imports
+from html import escape
+from typing import Iterable, Iterator, List, Tuple
+
+
+CELL = "▉"
+LABEL_WIDTH = 120   # Width of the task name column of SVG charts
+ROW_HEIGHT = 24     # Height of a task row of SVG charts
+
+# Colour of every task state (by name): colorama terminal colour, SVG colour
+COLOURS = {
+    "RUNNING": ("BLUE", "#1f5fd6"),
+    "READY": ("WHITE", "#d9d9d9"),
+    "BLOCKED": ("RED", "#d62728"),
+    "SUSPENDED": ("YELLOW", "#e6b800"),
+    "COMPLETED": ("GREEN", "#2ca02c"),
+    "NOT_ARRIVED": ("BLACK", "#303030"),
+}
+
+
+def columns(segments: Iterable[Tuple[int, int, object]], end: int, width: int = None) -> Iterator[Tuple[int, int, object]]:
+    """
+        Yields (first column, end column, state) runs of a history drawn over 'width' columns (one column per tick if None
+        or if the history is short enough). Adjacent columns of the same state are merged, missing time has state None.
+    """
+    if width is None or end <= width:
+        time = 0
+        for start, stop, state in segments:
+            if start > time:
+                yield time, start, None
+            yield start, stop, state
+            time = stop
+        return
+
+    segments = list(segments)
+    scale = end / width
+    run = None      # [first column, end column, state] being merged
+    index = 0
+    for column in range(width):
+        low, high = column * scale, (column + 1) * scale
+        while index < len(segments) and segments[index][1] <= low:
+            index += 1
+
+        # State that lasts longest within the column
+        occupancy = {}
+        for start, stop, state in (segments[i] for i in range(index, len(segments))):
+            if start >= high:
+                break
+            occupancy[state] = occupancy.get(state, 0) + min(stop, high) - max(start, low)
+        state = max(occupancy, key=occupancy.get) if occupancy else None
+
+        if run is not None and run[2] == state:
+            run[1] = column + 1
+        else:
+            if run is not None:
+                yield tuple(run)
+            run = [column, column + 1, state]
+
+    if run is not None:
+        yield tuple(run)
+
+
+def terminal_row(segments: Iterable[Tuple[int, int, object]], end: int, width: int = None) -> str:
+    """ Returns a history as a single string of coloured cells, one escape sequence per run """
+    from colorama import Fore   # Only terminal output needs it
+
+    codes = {None: ""}  # State -> escape sequence, looked up once per state
+    cells = []
+    for start, stop, state in columns(segments, end, width):
+        if state not in codes:
+            codes[state] = getattr(Fore, COLOURS[state.name][0])
+        if state is None:
+            cells.append(" " * (stop - start))
+        else:
+            cells.append(codes[state] + CELL * (stop - start) + Fore.RESET)
+    return "".join(cells)
+
+
+def render_terminal(tasks: List, width: int = None) -> str:
+    """ Returns the histories of the given tasks as terminal rows, downsampled to 'width' columns if given """
+    end = max((len(task.history) for task in tasks), default=0)
+    return "\n".join(f"{task.name}:\t{terminal_row(task.history.segments(), end, width)}" for task in tasks)
+
+
+def render_svg(tasks: List, width: int = 1000, title: str = "") -> str:
+    """ Returns the histories of the given tasks as an SVG Gantt chart 'width' pixels wide (plus the name column) """
+    end = max((len(task.history) for task in tasks), default=0)
+    count = max(1, min(end, width))     # Number of columns drawn
+    cell = width / count
+    scale = end / count
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{LABEL_WIDTH + width}" height="{ROW_HEIGHT * (len(tasks) + 1)}" font-family="monospace" font-size="12">',
+        f'<title>{escape(title)}</title>',
+    ]
+    for row, task in enumerate(tasks):
+        y = row * ROW_HEIGHT
+        parts.append(f'<text x="4" y="{y + ROW_HEIGHT * 0.7:.1f}">{escape(str(task.name))}</text>')
+        for start, stop, state in columns(task.history.segments(), end, count):
+            if state is None:
+                continue
+            parts.append(
+                f'<rect x="{LABEL_WIDTH + start * cell:.2f}" y="{y + 2}" width="{(stop - start) * cell:.2f}" height="{ROW_HEIGHT - 4}" fill="{COLOURS[state.name][1]}">'
+                f'<title>{state.name} {start * scale:g}-{stop * scale:g}</title></rect>'
+            )
+
+    # Time axis
+    y = len(tasks) * ROW_HEIGHT
+    for tick in range(0, 11):
+        x = LABEL_WIDTH + tick * width / 10
+        parts.append(f'<line x1="{x:.1f}" y1="0" x2="{x:.1f}" y2="{y}" stroke="#999" stroke-width="0.5"/>')
+        parts.append(f'<text x="{x:.1f}" y="{y + ROW_HEIGHT * 0.7:.1f}" text-anchor="middle">{end * tick / 10:g}</text>')
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def write_html(tasks: List, path: str, width: int = 1000, title: str = "Schedule") -> None:
+    """ Writes the histories of the given tasks as a standalone HTML page with an SVG Gantt chart and a legend """
+    legend = " ".join(f'<span style="color:{colour}">{CELL}</span> {name}' for name, (_, colour) in COLOURS.items())
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(
+            f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{escape(title)}</title></head>\n'
+            f'<body>\n<h3>{escape(title)}</h3>\n{render_svg(tasks, width, title)}\n<p>{legend}</p>\n</body>\n</html>\n'
+        )
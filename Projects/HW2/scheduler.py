@@ -1,149 +1,338 @@
 # Standard imports
-from typing import Optional
+from heapq import heappush, heappop
+from time import perf_counter
+from typing import List, Optional
 
 # Third-party imports
+from admission import AdmissionController
+from metrics import MetricsCollector
+from overhead import Overheads
+from profiler import Decision, Profiler
+from server import Server
 from task import Task, TaskState
 from taskset import TaskSet
 
 
 class Scheduler(object):
 
-    def __init__(self, taskset: TaskSet, algorithm: str) -> 'Scheduler':
+    def __init__(
+        self,
+        taskset: TaskSet,
+        algorithm: str,
+        profiler: Profiler = None,
+        overheads: Overheads = None,
+        admission: AdmissionController = None,
+        servers: List[Server] = None,
+        metrics: MetricsCollector = None,
+    ) -> 'Scheduler':
         self.taskset = taskset
         self.taskset.algorithm = algorithm
-        self.scheduler = {
+        self.algorithm = algorithm
+        self.priority = {
             "edf_preemptive": self.edf_preemptive,
             "edf_non_preemptive": self.edf_non_preemptive,
             "rm": self.rm,
             "dm": self.dm
         }[algorithm]
+        self.preemptive = algorithm != "edf_non_preemptive"
+
+        self.time = 0                               # Time of the latest scheduling decision
+        self.next_time = 0                          # Time of the next scheduling decision
+        self.current_task = None                    # Task that is running on the processor
+        self.tasks = self.taskset.get_all_tasks()
+        self.stamps = [0] * len(self.tasks)         # Latest ready queue entry of every task (older entries are stale)
+        self.ready = []                             # Heap of (priority, task index, stamp) for ready tasks
+        self.events = [(0, index) for index in range(len(self.tasks))]    # Heap of (time, task index) for arrivals and periodic releases, (time, ~server number) for server refills
+
+        self.overheads = overheads                  # Context switch and preemption costs, dispatch is free if None
+        self.deadlines_met = 0
+        self.deadlines_missed = 0
+        self.metrics = metrics                      # Response time, lateness, jitter, preemptions and blocking of the completed jobs
+
+        # Aperiodic and sporadic tasks are queued in the first server that serves them, instead of the ready queue
+        self.servers = list(servers or [])
+        self.served = {}                            # Served task -> number of its server
+        for number, server in enumerate(self.servers):
+            if server.dynamic and not algorithm.startswith("edf"):
+                raise ValueError(f"{server.name} needs an EDF scheduler, not '{algorithm}'")
+            server.start(0)
+            self.update_server(number, 0)
+        for task in self.tasks:
+            self.assign_server(task)
+
+        # Tasks submitted while the simulation runs are tested against the admitted work, the initial task set is admitted as is
+        self.admission = admission
+        if admission is not None:
+            for task in self.tasks:
+                admission.register(task)
+
+        # Profiling swaps in a timed copy of 'schedule', so an unprofiled run does not pay for a single check
+        self.profiler = profiler
+        if profiler is not None:
+            self.schedule = self.profiled_schedule
 
 
     def schedule(self, time: int) -> Optional[Task]:
         """ Schedules tasks and returns the task that that is to be ran at the given time. If None, then no task is to be ran. """
-        self.scheduler(time)
-
-
-    def edf_preemptive(self, time: int):
-        """ Preemptive Earliest Deadline First (EDF) scheduler """
-
-        all_tasks = self.taskset.get_all_tasks()    # Get ready tasks
-        all_tasks_by_deadlines = sorted(all_tasks, key=lambda x: x.next_deadline(time))  # Sort tasks by deadlines
-
-        current_task = None
-        for task in all_tasks_by_deadlines:
-            task.preflight(time)
-
-            # Interrupt (very hard deadline)
-            if task.is_ready and current_task is None and task.is_type_interrupt:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
-
-            # EDF doesn't really care about the type of the task
-            if (task.is_ready or task.is_running) and current_task is None:
-                task.set_state(TaskState.RUNNING)
-                current_task = task
-
-            task.save_state()   # Save the state of the task
-
-        return current_task
-
-
-    def edf_non_preemptive(self, time: int):
-        """ None Preemptive Earliest Deadline First (EDF) scheduler """
-
-        all_tasks = self.taskset.get_all_tasks()    # Get ready tasks
-        all_tasks_by_deadlines = sorted(all_tasks, key=lambda x: x.next_deadline(time))  # Sort tasks by deadlines
-
-        # Continue current running task
-        current_task = None
-        for task in all_tasks_by_deadlines:
-            task.preflight(time)
-            if task.is_running:
-                task.set_state(TaskState.RUNNING)   # Manually decrement ramaining_time
+        self.advance(time)
+        self.complete(time)     # Before the releases, a job ending on the tick its next one is released still met its deadline
+        self.release_due(time)
+        return self.dispatch(time)
+
+
+    def profiled_schedule(self, time: int) -> Optional[Task]:
+        """ Same as 'schedule', timing the preflight, selection and bookkeeping phases and reporting the decision to the profiler """
+        previous = self.current_task
+
+        start = perf_counter()
+        self.advance(time)
+        self.complete(time)
+        completed = perf_counter()
+        self.release_due(time)
+        released = perf_counter()
+        task = self.dispatch(time)
+        dispatched = perf_counter()
+
+        # Only a task that is not preempted can keep a ready task of higher priority waiting
+        inversion = task is not None and self.peek() is not task and self.ready[0][0] < self.queued_priority(task)
+        self.profiler.record(Decision(time, previous, task, released - completed, dispatched - released, completed - start, inversion))
+        return task
+
+
+    def run(self, duration: int) -> None:
+        """
+            Event-driven simulation: schedules only at arrivals, periodic releases and completions
+            and skips the time in between, so the cost depends on the number of events rather than the duration
+        """
+        self.run_until(duration)
+        self.flush(duration)
+
+
+    def run_until(self, end: int) -> None:
+        """ Runs the event-driven simulation up to the given time, and can be resumed from there (e.g. after submitting tasks) """
+        while self.next_time < end:
+            self.step(end)
+
+
+    def step(self, end: int):
+        """ Makes the scheduling decision due at 'next_time', moves 'next_time' to the next one (at most 'end') and returns the decision """
+        time = self.next_time
+        decision = self.schedule(time)
+
+        # Find the next time at which the schedule may change
+        next_time = self.events[0][0] if self.events else end
+        completion = self.next_completion(time)
+        if completion is not None:
+            next_time = min(next_time, completion)
+        self.next_time = min(next_time, end)
+        return decision
+
+
+    def next_completion(self, time: int) -> Optional[int]:
+        """ Returns the time at which the running task completes if it is not preempted, None if the processor is idle """
+        if self.current_task is None:
+            return None
+        if self.current_task in self.served:
+            return time + min(self.current_task.remaining_time, self.servers[self.served[self.current_task]].capacity)
+        return time + self.current_task.remaining_time
+
+
+    def submit(self, task: Task, time: int = None) -> bool:
+        """
+            Adds a task to the running simulation at its next scheduling decision, or at the given time if it is not before
+            the latest decision, returns False if the admission controller rejects it. The task must not arrive before it
+            is submitted, and the next decision is brought forward to its arrival if needed.
+        """
+        time = self.next_time if time is None else time
+        if time < self.time:
+            raise ValueError(f"cannot submit a task at {time}, the simulation is already at {self.time}")
+        if task.act_time < time:
+            raise ValueError(f"task '{task.name}' arrives at {task.act_time}, before it is submitted at {time}")
+        if self.admission is not None and not self.admission.admit(task, time):
+            return False
+
+        self.taskset.add_task(task)
+        self.tasks.append(task)
+        self.stamps.append(0)
+        self.assign_server(task)
+        heappush(self.events, (task.act_time, len(self.tasks) - 1))
+        self.next_time = min(self.next_time, task.act_time)
+        return True
+
+
+    def statistics(self) -> tuple:
+        """ Returns the (deadlines met, deadlines missed) counters so far """
+        return self.deadlines_met, self.deadlines_missed
+
+
+    def flush(self, time: int) -> None:
+        """ Records the states of all tasks up to the given time """
+        self.advance(time)
+        for task in self.tasks:
+            task.save_state(time)
+
+
+    def advance(self, time: int) -> None:
+        """ Consumes the execution time of the running task since the latest scheduling decision """
+        if self.metrics is not None:
+            self.metrics.elapse(time)
+        if self.current_task is not None:
+            self.current_task.remaining_time -= time - self.time
+            if self.current_task in self.served and time > self.time:
+                number = self.served[self.current_task]
+                self.servers[number].consume(time - self.time, time)
+                self.update_server(number, time)
+        self.time = time
+
+
+    def release_due(self, time: int) -> None:
+        """ Releases the tasks with arrivals and periodic releases that are due """
+        while self.events and self.events[0][0] <= time:
+            _, index = heappop(self.events)
+            if index < 0:
+                self.servers[~index].replenish(time)
+                self.update_server(~index, time)
+            else:
+                self.release(index, time)
+
+
+    def complete(self, time: int) -> None:
+        """ Completes the running task once it has no remaining execution time """
+        if self.current_task is not None and not self.current_task.has_remaining_time:
+            missed = self.current_task.next_deadline(time) < time
+            if missed:
+                self.deadlines_missed += 1
+            else:
+                self.deadlines_met += 1
+            self.current_task.set_state(TaskState.COMPLETED, time)
+            self.finish(self.current_task, time, missed)
+            self.current_task = None
+
+
+    def release(self, index: int, time: int) -> None:
+        """ Runs the preflight checks of a task at one of its events and (re)queues it with its new priority """
+        task = self.tasks[index]
+
+        # A job that has not completed by the time the next one is released missed its deadline
+        if task.is_active and not task.is_complete and task.is_reset_at(time):
+            self.deadlines_missed += 1
+            if self.metrics is not None:
+                self.metrics.overran(task, time)
+        task.preflight(time)
+        if self.metrics is not None and task.is_ready and (time == task.act_time or task.is_reset_at(time)):
+            self.metrics.released(task, time)
+
+        if task.is_ready and task in self.served:
+            number = self.served[task]
+            self.servers[number].arrive(index, task, time)
+            self.update_server(number, time)
+        elif task.is_ready:
+            self.stamps[index] += 1
+            heappush(self.ready, (self.priority(task, time), index, self.stamps[index]))
+
+        event = task.next_event(time)
+        if event is not None:
+            heappush(self.events, (event, index))
+
+
+    def assign_server(self, task: Task) -> None:
+        """ Hands a task to the first server that serves it, if any """
+        for number, server in enumerate(self.servers):
+            if server.serves(task):
+                self.served[task] = number
+                return
+
+
+    def update_server(self, number: int, time: int) -> None:
+        """ Schedules the refills a server asked for and requeues the task it serves with its current priority (dequeued while out of budget) """
+        server = self.servers[number]
+        for wakeup in server.wakeups:
+            heappush(self.events, (wakeup, ~number))
+        server.wakeups.clear()
+
+        index = server.head
+        if index is not None:
+            self.stamps[index] += 1
+            if server.eligible:
+                heappush(self.ready, (server.priority(self.algorithm, time), index, self.stamps[index]))
+
+
+    def finish(self, task: Task, time: int, missed: bool) -> None:
+        """ Reports a completed task to the metrics and moves its server on to the next task """
+        if self.metrics is not None:
+            self.metrics.completed(task, time, missed)
+        if task in self.served:
+            number = self.served[task]
+            self.servers[number].finish(time)
+            self.update_server(number, time)
+
+
+    def peek(self) -> Optional[Task]:
+        """ Returns the ready task with the highest priority, dropping stale queue entries on the way """
+        while self.ready:
+            _, index, stamp = self.ready[0]
+            task = self.tasks[index]
+            if stamp == self.stamps[index] and not task.is_complete:
                 return task
-
-        for task in all_tasks_by_deadlines:
-            task.preflight(time)
-
-            # Interrupt (very hard deadline)
-            if task.is_ready and current_task is None and task.is_type_interrupt:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
-
-            # EDF doesn't really care about the type of the task
-            if (task.is_ready or task.is_running) and current_task is None:
-                task.set_state(TaskState.RUNNING)
-                current_task = task
-
-            task.save_state()   # Save the state of the task
-
-        return current_task
+            heappop(self.ready)
+        return None
 
 
-    def rm(self, time: int):
-        """ Rate Monotonic (RM) scheduler """
-        
-        all_tasks = self.taskset.get_all_tasks()    # Get ready tasks
-        all_tasks_by_periods = sorted(all_tasks, key=lambda x: x.period)  # Sort tasks by their periods
+    def queued_priority(self, task: Task):
+        """ Returns the priority a ready task was queued with (searches the whole queue, only used when profiling or measuring) """
+        index = self.tasks.index(task)
+        return next(priority for priority, entry, stamp in self.ready if entry == index and stamp == self.stamps[index])
 
-        current_task = None
-        for task in all_tasks_by_periods: 
-            task.preflight(time)
 
-            # Interrupt (very hard deadline)
-            if task.is_ready and current_task is None and task.is_type_interrupt:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
+    def dispatch(self, time: int) -> Optional[Task]:
+        """ Picks the task to run from the ready queue and preempts the running one if needed """
+        task = self.current_task
 
-            # Sporadic (harder deadline)
-            if task.is_ready and current_task is None and task.is_type_sporadic:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
+        # Non-preemptive scheduling lets the running task finish first, unless its server ran out of budget
+        if self.preemptive or task is None or (task in self.served and not self.servers[self.served[task]].eligible):
+            task = self.peek()
 
-            # Periodic or aperiodic tasks (no clear indication which has higher priority!)
-            if (task.is_ready or task.is_running) and current_task is None:
-                task.set_state(TaskState.RUNNING)
-                current_task = task
+        if self.current_task is not None and self.current_task is not task:
+            if self.metrics is not None:
+                self.metrics.preempted(self.current_task)
+            self.current_task.set_state(TaskState.READY, time)
+            if self.overheads is not None:
+                self.current_task.remaining_time += self.overheads.preemption
+        if task is not None:
+            task.set_state(TaskState.RUNNING, time)
+            if self.overheads is not None and task is not self.current_task:
+                task.remaining_time += self.overheads.dispatch
 
-            task.save_state()   # Save the state of the task
+        self.current_task = task
+        if self.metrics is not None:
+            self.metrics.decided(self.waiting_ahead(task), time)
+        return task
 
-        return current_task
 
+    def waiting_ahead(self, task: Optional[Task]) -> List[Task]:
+        """ Returns the ready tasks queued with a higher priority than the running task (searches the whole queue, only used for metrics) """
+        if task is None:
+            return []
+        priority = self.queued_priority(task)
+        return [self.tasks[index] for entry, index, stamp in self.ready
+                if entry < priority and stamp == self.stamps[index] and not self.tasks[index].is_complete and self.tasks[index] is not task]
 
-    def dm(self, time: int):
-        """ Deadline Monotonic (DM) scheduler """
 
-        all_tasks = self.taskset.get_all_tasks()    # Get ready tasks
-        all_tasks_by_deadlines = sorted(all_tasks, key=lambda x: x.next_deadline(time))  # Sort tasks by deadlines
+    def edf_preemptive(self, task: Task, time: int) -> int:
+        """ Preemptive Earliest Deadline First (EDF) priority: tasks with earlier deadlines go first """
+        return task.next_deadline(time)
 
-        current_task = None
-        for task in all_tasks_by_deadlines:
-            if time >= 21:
-                print(end="")
-            task.preflight(time)
 
-            # Interrupt (very hard deadline)
-            if task.is_ready and current_task is None and task.is_type_interrupt:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
+    def edf_non_preemptive(self, task: Task, time: int) -> int:
+        """ None Preemptive Earliest Deadline First (EDF) priority: same as preemptive EDF, but only picked once the running task completes """
+        return task.next_deadline(time)
 
-            # Sporadic (harder deadline)
-            if task.is_ready and current_task is None and task.is_type_sporadic:
-                task.set_state(TaskState.RUNNING, save=True)
-                current_task = task
-                continue
 
-            # Sporadic, aperiodic or periodic (EDF doesn't really care about the type of the task)
-            if (task.is_ready or task.is_running) and current_task is None:
-                task.set_state(TaskState.RUNNING)
-                current_task = task
+    def rm(self, task: Task, time: int) -> int:
+        """ Rate Monotonic (RM) priority: tasks with shorter periods go first """
+        return task.period
 
-            task.save_state()   # Save the state of the task
 
-        return current_task
+    def dm(self, task: Task, time: int) -> int:
+        """ Deadline Monotonic (DM) priority: tasks with earlier deadlines go first """
+        return task.next_deadline(time)
@@ -0,0 +1,254 @@
+"""
+    Aperiodic servers: bandwidth reserved for aperiodic and sporadic tasks, so that they get short response times
+    without jeopardising the deadlines of the periodic tasks.
+
+    A server queues the tasks it serves in arrival order and the scheduler runs the task at the head of the queue
+    with the priority of the server, as long as the server has budget left. Running the task consumes the budget.
+
+    - Polling: the budget is refilled every period, and lost as soon as no task is waiting
+    - Deferrable: the budget is refilled every period and kept while no task is waiting
+    - Sporadic: consumed budget is given back one period after the server became active
+    - Total bandwidth (EDF only): every task gets the deadline max(arrival, previous deadline) + C / Us, no budget
+    - Constant bandwidth (EDF only): once the budget is exhausted it is refilled and the deadline postponed by a period
+
+    The fixed servers run at the priority of a periodic task with the server's period under RM, and with the end of
+    the current server period as deadline under DM and EDF.
+"""
+
+# Standard imports
+from collections import deque
+from heapq import heappush, heappop
+from math import ceil
+from typing import Optional
+
+# Third-party imports
+from task import Task
+
+
+class Server(object):
+    """ Budget of an aperiodic server and the queue of tasks waiting for it """
+
+    dynamic = False     # Needs an EDF scheduler (deadline driven servers)
+
+    def __init__(self, budget: int, period: int, name: str = None) -> 'Server':
+        if budget <= 0 or period <= 0 or budget > period:
+            raise ValueError("a server needs 0 < budget <= period")
+        self.name = name or type(self).__name__
+        self.budget = budget
+        self.period = period
+
+        self.capacity = 0           # Budget left
+        self.deadline = 0           # Deadline of the served task (end of the current period for the fixed servers)
+        self.queue = deque()        # Task indices waiting to be served, in arrival order
+        self.wakeups = []           # Times at which the server needs 'replenish' to be called, collected by the scheduler
+
+        self.consumed = 0           # Budget spent by the served tasks
+        self.exhausted = 0          # Times a task was stopped by an empty budget
+        self.served = 0             # Completed tasks
+
+
+    def serves(self, task: Task) -> bool:
+        """ Returns True if the task is handled by servers (aperiodic and sporadic tasks) """
+        return task.is_type_aperiodic or task.is_type_sporadic
+
+
+    def start(self, time: int) -> None:
+        """ Starts the server at the beginning of the simulation """
+        self.replenish(time)
+
+
+    @property
+    def head(self) -> Optional[int]:
+        """ Returns the index of the task served next, None if no task is waiting """
+        return self.queue[0] if self.queue else None
+
+
+    @property
+    def eligible(self) -> bool:
+        """ Returns True if the task at the head of the queue may run """
+        return bool(self.queue) and self.capacity > 0
+
+
+    def priority(self, algorithm: str, time: int) -> int:
+        """ Returns the priority of the served task: the server period under RM, the server deadline otherwise """
+        return self.period if algorithm == "rm" else self.deadline
+
+
+    def arrive(self, index: int, task: Task, time: int) -> None:
+        """ Queues a task that arrived at the given time """
+        self.queue.append(index)
+
+
+    def consume(self, amount: int, time: int) -> None:
+        """ Charges the execution of the head task over the 'amount' time units up to the given time """
+        self.capacity -= amount
+        self.consumed += amount
+        if self.capacity <= 0 and self.queue:
+            self.exhausted += 1
+
+
+    def finish(self, time: int) -> None:
+        """ Removes the head task once it has completed """
+        self.queue.popleft()
+        self.served += 1
+
+
+    def replenish(self, time: int) -> None:
+        """ Refills the budget at a time requested through 'wakeups' """
+        self.capacity = self.budget
+        self.deadline = time + self.period
+        self.wakeups.append(time + self.period)
+
+
+    def summary(self) -> dict:
+        """ Returns the budget accounting of the server """
+        return {"served": self.served, "consumed": self.consumed, "exhausted": self.exhausted, "waiting": len(self.queue)}
+
+
+class PollingServer(Server):
+    """ Polling server: serves the tasks waiting at the start of its period, the budget is lost once none is waiting """
+
+    def replenish(self, time: int) -> None:
+        super().replenish(time)
+        if not self.queue:
+            self.capacity = 0
+
+
+    def finish(self, time: int) -> None:
+        super().finish(time)
+        if not self.queue:
+            self.capacity = 0
+
+
+class DeferrableServer(Server):
+    """ Deferrable server: the budget is refilled every period and kept until a task arrives """
+
+
+class SporadicServer(Server):
+    """
+        Sporadic server: the budget is only given back what was consumed, one period after the server became active
+        (started serving with budget left), which keeps its interference on the periodic tasks that of a periodic task
+    """
+
+    def __init__(self, budget: int, period: int, name: str = None) -> 'SporadicServer':
+        super().__init__(budget, period, name)
+        self.activation = None      # Time the server became active, None while idle
+        self.pending = 0            # Budget consumed since the activation
+        self.replenishments = []    # Heap of (time, amount) of the scheduled refills
+
+
+    def start(self, time: int) -> None:
+        self.capacity = self.budget
+
+
+    def arrive(self, index: int, task: Task, time: int) -> None:
+        super().arrive(index, task, time)
+        self.activate(time)
+
+
+    def consume(self, amount: int, time: int) -> None:
+        super().consume(amount, time)
+        self.pending += amount
+        if self.capacity <= 0:
+            self.deactivate()
+
+
+    def finish(self, time: int) -> None:
+        super().finish(time)
+        if not self.queue:
+            self.deactivate()
+
+
+    def replenish(self, time: int) -> None:
+        while self.replenishments and self.replenishments[0][0] <= time:
+            self.capacity += heappop(self.replenishments)[1]
+        if self.queue:
+            self.activate(time)
+
+
+    def activate(self, time: int) -> None:
+        """ Becomes active if tasks are waiting and budget is left """
+        if self.activation is None and self.capacity > 0:
+            self.activation = time
+            self.deadline = time + self.period
+
+
+    def deactivate(self) -> None:
+        """ Schedules the refill of the budget consumed since the activation """
+        if self.activation is not None and self.pending > 0:
+            refill = self.activation + self.period
+            heappush(self.replenishments, (refill, self.pending))
+            self.wakeups.append(refill)
+        self.activation = None
+        self.pending = 0
+
+
+class TotalBandwidthServer(Server):
+    """ Total bandwidth server (EDF): every task gets a deadline that keeps the server within its utilization, it never runs out of budget """
+
+    dynamic = True
+
+    def __init__(self, budget: int, period: int, name: str = None) -> 'TotalBandwidthServer':
+        super().__init__(budget, period, name)
+        self.capacity = float("inf")
+        self.deadlines = deque()    # Deadline of every queued task
+
+
+    def start(self, time: int) -> None:
+        pass
+
+
+    def priority(self, algorithm: str, time: int) -> int:
+        return self.deadlines[0]
+
+
+    def arrive(self, index: int, task: Task, time: int) -> None:
+        super().arrive(index, task, time)
+        self.deadline = max(time, self.deadline) + ceil(task.wcet * self.period / self.budget)
+        self.deadlines.append(self.deadline)
+
+
+    def finish(self, time: int) -> None:
+        super().finish(time)
+        self.deadlines.popleft()
+
+
+class ConstantBandwidthServer(Server):
+    """ Constant bandwidth server (EDF): an exhausted budget is refilled at once with the deadline postponed by a period """
+
+    dynamic = True
+
+    def start(self, time: int) -> None:
+        pass
+
+
+    def arrive(self, index: int, task: Task, time: int) -> None:
+        # An idle server only keeps its deadline if the budget left would not exceed its bandwidth until then
+        if not self.queue and self.capacity * self.period >= (self.deadline - time) * self.budget:
+            self.capacity = self.budget
+            self.deadline = time + self.period
+        super().arrive(index, task, time)
+
+
+    def consume(self, amount: int, time: int) -> None:
+        super().consume(amount, time)
+        if self.capacity <= 0:
+            self.capacity += self.budget
+            self.deadline += self.period
+
+
+SERVERS = {
+    "polling": PollingServer,
+    "deferrable": DeferrableServer,
+    "sporadic": SporadicServer,
+    "tbs": TotalBandwidthServer,
+    "cbs": ConstantBandwidthServer,
+}
+
+
+def create_server(kind: str, budget: int, period: int) -> Server:
+    """ Returns a server of the given kind (a key of 'SERVERS') """
+    if kind not in SERVERS:
+        raise ValueError(f"unknown server '{kind}'")
+    return SERVERS[kind](budget, period)
+
@@ -3,7 +3,8 @@ from typing import Optional
 from enum import Enum
 
 # Third-party imports
-from utils import *
+from history import History
+from render import terminal_row
 
 
 class TaskState(Enum):
@@ -24,6 +25,9 @@ class TaskType(Enum):
 
 class Task(object):
 
+    # Fixed attribute layout (no per-instance dict) keeps tasks small and attribute lookups fast
+    __slots__ = ("name", "state", "type", "act_time", "period", "wcet", "daedline", "remaining_time", "history")
+
     def __init__(self,
                  name: str,
                  state: TaskState = TaskState.NOT_ARRIVED,
@@ -42,41 +46,23 @@ class Task(object):
         self.daedline = deadline
 
         self.remaining_time = wcet      # Remaining execution time
-        self.history = []               # Store 'TaskState' per time unit
+        self.history = History(TaskState)   # Store 'TaskState' segments over time
 
 
-    def set_state(self, state: TaskState, save: bool = False, decrement: bool = True) -> None:
-        """ Set the state of the task """
+    def set_state(self, state: TaskState, time: int) -> None:
+        """ Set the state of the task from the given time on """
+        self.save_state(time)
         self.state = state
-        if save: self.save_state()
-
-        # Decrement remaining execution time if task is running
-        if decrement and state == TaskState.RUNNING:
-            self.remaining_time -= 1
 
 
-    def save_state(self) -> None:
-        """ Save the current state of the task """
-        self.history.append(self.state)
+    def save_state(self, time: int) -> None:
+        """ Save the current state of the task up to the given time (states are only recorded on change) """
+        self.history.extend(self.state, time)
 
 
-    def plot_history(self):
-        """ Print the history of the task states """
-        print(f"{self.name}:", end = '\t')
-        for state in self.history:
-            if state == TaskState.RUNNING:
-                blue("▉")
-            elif state == TaskState.READY:
-                white("▉")
-            elif state == TaskState.COMPLETED:
-                green("▉")
-            elif state == TaskState.BLOCKED:
-                red("▉")
-            elif state == TaskState.SUSPENDED:
-                yellow("▉")
-            elif state == TaskState.NOT_ARRIVED:
-                black("▉")
-        print("")
+    def plot_history(self, width: int = None):
+        """ Print the history of the task states (downsampled to 'width' columns if given) """
+        print(f"{self.name}:\t{terminal_row(self.history.segments(), len(self.history), width)}")
 
 
     def next_deadline(self, time: int) -> Optional[int]:
@@ -95,16 +81,40 @@ class Task(object):
         """ Perform preflight checks on the task """
 
         # Reset WCET if task is periodic
-        if self.is_periodic and time >= self.period and time % self.period == 1:
+        if self.is_reset_at(time):
             self.remaining_time = self.wcet
 
         # Set state as ready if task has arrived (should be before other state checks)
         if time >= self.act_time:
-            self.set_state(TaskState.READY)
+            self.set_state(TaskState.READY, time)
 
         # Set state as completed if task has no remaining execution time
         if self.remaining_time == 0:
-            self.set_state(TaskState.COMPLETED)
+            self.set_state(TaskState.COMPLETED, time)
+
+
+    def next_event(self, time: int) -> Optional[int]:
+        """ Returns the first time after the given time at which preflight may change the state or deadline of the task (None if it never does) """
+        if time < self.act_time:
+            return self.act_time    # Arrival
+
+        # Periodic tasks are reset (and move to their next deadline) one tick after every period boundary
+        if self.is_periodic:
+            return time + 1 + (-time) % self.period
+        return None
+
+
+    def is_reset_at(self, time: int) -> bool:
+        """ Returns True if the periodic task starts its next job at the given time (its remaining time is reset to the WCET) """
+        return self.is_periodic and time >= self.period and time % self.period == 1
+
+
+    def job_deadline(self, release: int) -> int:
+        """ Returns the time by which the job released at the given time must complete: the next reset of a periodic task, the deadline of any other """
+        if self.is_periodic:
+            reset = release + 1 + (-release) % self.period
+            return reset if reset >= self.period else reset + self.period
+        return self.act_time + self.daedline
 
 
     def has_missed_deadline(self, time: int) -> bool:
@@ -114,47 +124,47 @@ class Task(object):
     @property
     def is_running(self) -> bool:
         """ Returns True if the task is currently running on the processor """
-        return self.state == TaskState.RUNNING
+        return self.state is TaskState.RUNNING
 
     @property
     def is_complete(self) -> bool:
         """ Returns True if the task has completed execution """
-        return self.state == TaskState.COMPLETED
+        return self.state is TaskState.COMPLETED
 
     @property
     def is_ready(self) -> bool:
         """ Returns True if the task is ready to run """
-        return self.state == TaskState.READY
+        return self.state is TaskState.READY
 
     @property
     def is_periodic(self) -> bool:
         """ Returns True if the task is periodic """
-        return self.type == TaskType.PERIODIC
+        return self.type is TaskType.PERIODIC
 
     @property
     def is_active(self) -> bool:
         """ Returns True if the task has arrived """
-        return self.state != TaskState.NOT_ARRIVED
+        return self.state is not TaskState.NOT_ARRIVED
 
     @property
     def is_type_interrupt(self) -> bool:
         """ Returns True if task is of type interrupt """
-        return self.type == TaskType.INTERRUPT
+        return self.type is TaskType.INTERRUPT
 
     @property
     def is_type_sporadic(self) -> bool:
         """ Return Truew if task is of type sporadic """
-        return self.type == TaskType.SPORADIC
+        return self.type is TaskType.SPORADIC
 
     @property
     def is_type_aperiodic(self) -> bool:
         """ Return True if task is of type aperiodic """
-        return self.type == TaskType.APERIODIC
+        return self.type is TaskType.APERIODIC
 
     @property
     def is_type_periodic(self) -> bool:
         """ Return True if task is of type periodic """
-        return self.type == TaskType.PERIODIC
+        return self.type is TaskType.PERIODIC
 
     @property
     def has_remaining_time(self) -> bool:
@@ -3,6 +3,7 @@ from typing import List
 
 # Third-party imports
 from task import Task
+from render import render_terminal, write_html
 
 
 class TaskSet(object):
@@ -19,15 +20,38 @@ class TaskSet(object):
         self.tasks.append(task)
 
 
+    def to_arrays(self) -> dict:
+        """ Returns the periodic tasks as NumPy arrays of periods, WCETs, deadlines and offsets (the input of 'analysis') """
+        import numpy as np
+        periodic = [task for task in self.tasks if task.is_periodic]
+        return {
+            "period": np.array([task.period for task in periodic], dtype=float),
+            "wcet": np.array([task.wcet for task in periodic], dtype=float),
+            "deadline": np.array([task.daedline for task in periodic], dtype=float),
+            "offset": np.array([task.act_time for task in periodic], dtype=float),
+        }
+
+
+    def analyse(self) -> bool:
+        """ Computes the utilization of the periodic tasks and whether they are feasible with the algorithm of the task set """
+        import analysis
+        arrays = self.to_arrays()
+        self.utility = float(analysis.utilization(arrays["wcet"], arrays["period"])[0])
+        self.feaible = bool(analysis.feasible(self.algorithm, arrays["wcet"], arrays["period"], arrays["deadline"])[0])
+        return self.feaible
+
+
     def get_all_tasks(self) -> List[Task]:
         """ Returns all tasks in the taskset """
         return [task for task in self.tasks]
 
 
-    def plot_history(self):
-        """ Print the history of the task states """
+    def plot_history(self, width: int = None):
+        """ Print the history of the task states (downsampled to 'width' columns if given) """
         # print("Plotting task history... (RED is for BLOCKED, GREEN is for COMPLETED, BLUE is for RUNNING, WHITE is for READY, BLACK for NOT_ARRIVED))")
-        print(f"Scheduling with {self.algorithm}:")
-        for task in self.tasks:
-            task.plot_history()
-        print()
\ No newline at end of file
+        print(f"Scheduling with {self.algorithm}:\n{render_terminal(self.tasks, width)}\n")
+
+
+    def save_history(self, path: str, width: int = 1000):
+        """ Write the history of the task states as a standalone HTML Gantt chart """
+        write_html(self.tasks, path, width, title=f"Scheduling with {self.algorithm}")
\ No newline at end of file
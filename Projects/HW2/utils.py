@@ -1,26 +1,44 @@
 # Standard imports
-from colorama import Fore
+from typing import List
+
+
+ALGORITHMS = ["dm", "rm", "edf_preemptive", "edf_non_preemptive"]
+DURATION = 100      # Default simulated duration of the command line tools
+
+
+def print_table(rows: List[dict], columns: List[str]) -> None:
+    """ Prints rows as a table with the given columns, each as wide as its longest value """
+    widths = [max([len(column)] + [len(str(row[column])) for row in rows]) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def colour(name: str, text: str):
+    """ Prints text in the given colorama colour, colorama is only imported once something is printed """
+    from colorama import Fore
+    print(getattr(Fore, name) + text + Fore.RESET, end = "")
 
 
 def red(text: str):
-    print(Fore.RED + text + Fore.RESET, end = "")
+    colour("RED", text)
 
 
 def green(text: str):
-    print(Fore.GREEN + text + Fore.RESET, end = "")
+    colour("GREEN", text)
 
 
 def blue(text: str):
-    print(Fore.BLUE + text + Fore.RESET, end = "")
+    colour("BLUE", text)
 
 
 def white(text: str):
-    print(Fore.WHITE + text + Fore.RESET, end = "")
+    colour("WHITE", text)
 
 
 def yellow(text: str):
-    print(Fore.YELLOW + text + Fore.RESET, end = "")
+    colour("YELLOW", text)
 
 
 def black(text: str):
-    print(Fore.BLACK + text + Fore.RESET, end = "")
+    colour("BLACK", text)